@@ -1,5 +1,19 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
+try:
+    from flask_sock import Sock
+except ImportError:  # optional: the WebSocket interview channel is off without it
+    Sock = None
+from database.db_handler import init_app as init_db, get_pool_stats, get_replica_pool_stats
+from database.query_stats import get_statement_stats
+from utils.match_cache import get_match_cache_stats
+from utils.llm_client import get_llm_stats
+from utils.llm_cache import get_llm_cache_stats
+from utils.tts import get_tts_stats
+from utils.stt import get_stt_stats
+from utils.session_store import get_session_store_stats
+from utils import session_sweeper
+from utils.answer_scorer import get_answer_scorer_stats
 from controllers.JobServices.get_jobs import match_jobs
 from controllers.ProfileMicroservices.cv_upload import upload_cv
 from controllers.RecruiterMicroservices.Jobsearch import job_search
@@ -8,12 +22,13 @@ from controllers.JobServices.get_job_dropdowns import get_job_dropdowns
 from controllers.AssessmentMicroservices.evaluate_mcq import evaluate_mcq
 from controllers.JobServices.update_status import update_assessment_status
 from controllers.AssessmentMicroservices.GetAIMCQByJob import GetAIMCQByJob
-from controllers.AssessmentMicroservices.end_interview import end_interview
+from controllers.AssessmentMicroservices.end_interview import end_interview, score_sessions, get_interview_score
 from controllers.ProfileMicroservices.login_candidate import login_candidate
 from controllers.RecruiterMicroservices.login_recruiter import login_recruiter
 from controllers.ProfileMicroservices.candidate_details import candidate_details
 from controllers.JobServices.get_interview_schedule import get_interview_schedule
 from controllers.AssessmentMicroservices.start_assessment import start_assessment
+from controllers.AssessmentMicroservices.interview_socket import interview_channel
 from controllers.InterviewMicroservices.get_interview_info import get_interview_info
 from controllers.JobServices.applied_job_by_candidate import applied_job_by_candidate
 from controllers.RecruiterMicroservices.Recruiter_cv_upload import recruiter_upload_cv
@@ -37,6 +52,9 @@ from controllers.AssessmentMicroservices.call_update_profile_journey_status impo
 
 app = Flask(__name__)
 CORS(app)
+init_db(app)
+# Closes expired interview sessions; SESSION_SWEEP_SCORE=true also queues their scoring
+session_sweeper.start(on_expired=score_sessions)
 
 JOB_SERVICES_URL = '/JobServices'
 SMART_MICROSERVICES_URL = '/SmartMicroservices'
@@ -48,6 +66,23 @@ INTERVIEW_MICROSERVICES_URL = '/InterviewtMicroservices'
 @app.route('/', methods=['GET'])
 def health():
     return "Hello World ! it's working perfectly "
+
+# Runtime metrics
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        "dbPool": get_pool_stats(),
+        "dbReplicas": get_replica_pool_stats(),
+        "sqlStatements": get_statement_stats(),
+        "matchCache": get_match_cache_stats(),
+        "llm": get_llm_stats(),
+        "llmCache": get_llm_cache_stats(),
+        "tts": get_tts_stats(),
+        "stt": get_stt_stats(),
+        "sessionStore": get_session_store_stats(),
+        "sessionSweeper": session_sweeper.get_sweeper_stats(),
+        "answerScorer": get_answer_scorer_stats()
+    })
     
 
 
@@ -140,11 +175,24 @@ def route_get_candidate_by_job_and_hiring_manager(jobId, hiringManagerId):
 def route_end_interview():
     return end_interview()
 
+# AI screening score (computed in the background after end_interview)
+@app.route(ASSESSMENT_MICROSERVICES_URL + "/end_interview/score/<int:jobId>/<int:candidateId>/<string:sessionId>", methods=["GET"])
+def route_get_interview_score(jobId, candidateId, sessionId):
+    return get_interview_score(jobId, candidateId, sessionId)
+
 # Start Ai Screening
 @app.route(ASSESSMENT_MICROSERVICES_URL + "/assessment/start", methods=["POST"])
 def start_assessment_route():
     return start_assessment() 
 
+# Ai Screening over one WebSocket per session (needs flask-sock)
+if Sock is not None:
+    sock = Sock(app)
+
+    @sock.route(ASSESSMENT_MICROSERVICES_URL + "/assessment/ws")
+    def assessment_socket_route(ws):
+        interview_channel(ws)
+
 # Evaluate MCQ
 @app.route(ASSESSMENT_MICROSERVICES_URL + '/EvaluateMCQ', methods=['POST'])
 def route_evaluate_mcq():
@@ -11,5 +11,37 @@ MYSQL_CONFIG = {
     'database': os.getenv('MYSQL_DATABASE', '')
 }
 
+# Read replicas used by get_read_connection(): MYSQL_REPLICA_HOSTS="host1[:port],host2[:port]"
+# Credentials and database are shared with the primary.
+MYSQL_REPLICA_CONFIGS = []
+for _replica in filter(None, (h.strip() for h in os.getenv('MYSQL_REPLICA_HOSTS', '').split(','))):
+    _host, _, _port = _replica.partition(':')
+    MYSQL_REPLICA_CONFIGS.append(dict(MYSQL_CONFIG, host=_host, port=int(_port or MYSQL_CONFIG['port'])))
 
+# After a write, reads for the same candidate/job go to the primary for this many seconds
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 5))
 
+# Connection pool behind get_db_connection()
+DB_POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    # Idle connections above min_size are closed after this many seconds
+    'idle_timeout': float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300)),
+    # Connections idle longer than this are pinged before being handed out
+    'health_check_interval': float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+    # How long a request waits for a free connection before failing
+    'checkout_timeout': float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 10)),
+}
+
+# SQL instrumentation (database/query_stats.py)
+DB_INSTRUMENTATION_CONFIG = {
+    # Statements slower than this go to the slow-query log
+    'slow_query_ms': float(os.getenv('DB_SLOW_QUERY_MS', 200)),
+    # Optional file for the slow-query log; stderr when unset
+    'slow_query_log': os.getenv('DB_SLOW_QUERY_LOG', ''),
+    # Warn when one request runs the same statement this many times (N+1)
+    'repeated_query_warn': int(os.getenv('DB_REPEATED_QUERY_WARN', 10)),
+}
+
+# Length of an AI screening interview (start_assessment, utils/session_store.py)
+SESSION_DURATION_MINUTES = int(os.getenv('SESSION_DURATION_MINUTES', 3))
@@ -1,25 +1,45 @@
 import os
 import json
-import random
-import requests
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from flask import request, jsonify
 from database.db_handler import get_db_connection
+from utils.llm_client import mistral_chat
+from utils import session_turns, session_store, answer_scorer
 from dotenv import load_dotenv
 
 load_dotenv()
 
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-MISTRAL_API_URL = os.getenv("MISTRAL_API_URL")
-MISTRAL_MODEL = os.getenv("MISTRAL_MODEL")
+# Interview scores are computed off the request path by this many workers
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", 2))
+# A score still pending this long after the interview ended, or claimed by a
+# worker this long ago (e.g. the process restarted), is queued again when its
+# status is polled, and another worker may take over the claim
+SCORE_RECOVER_AFTER_SECONDS = int(os.getenv("SCORE_RECOVER_AFTER_SECONDS", 120))
+
+_score_pool = ThreadPoolExecutor(max_workers=SCORE_WORKERS, thread_name_prefix="interview-score")
+_queued_lock = threading.Lock()
+_queued = set()  # session log ids queued or being scored in this process
+
+
+def get_ai_score(question_answer, skills=""):
+    """
+    Interview score 1-100 (0 without answers). The local answer scorer
+    decides when it is confident enough (ANSWER_SCORER_MODE=tiered); the
+    LLM scores the rest, and its failures fall back to the local score.
+    """
+    #  Handle empty or missing data — return 0
+    if not question_answer or len(question_answer) == 0:
+        return 0
+
+    local, confidence = answer_scorer.local_score(question_answer, skills)
+    mode = answer_scorer.ANSWER_SCORER_CONFIG['mode']
+    if mode == "local" or (mode == "tiered" and confidence >= answer_scorer.ANSWER_SCORER_CONFIG['min_confidence']):
+        answer_scorer.record("local")
+        return local
 
-
-def get_ai_score(question_answer):
     try:
-        #  Handle empty or missing data — return 0
-        if not question_answer or len(question_answer) == 0:
-            return 0
-
         #  Detect meaningful (non-empty) answers
         non_empty_answers = []
         if isinstance(question_answer, list):
@@ -40,10 +60,6 @@ def get_ai_score(question_answer):
         if len(non_empty_answers) == 0:
             return 0
 
-        #  Ensure Mistral environment vars exist
-        if not MISTRAL_API_URL or not MISTRAL_API_KEY or not MISTRAL_MODEL:
-            raise ValueError("Mistral API configuration missing in environment variables.")
-
         #  Create intelligent prompt for AI evaluation
         prompt = f"""
             You are an AI evaluation model integrated into an interview system.
@@ -69,43 +85,135 @@ def get_ai_score(question_answer):
             Return ONLY the final score as a single integer (1–100). Do not include text or explanation.
             """
 
-        headers = {
-            "Authorization": f"Bearer {MISTRAL_API_KEY}",
-            "Content-Type": "application/json",
-        }
+        ai_output = mistral_chat([
+            {"role": "system", "content": "You are an intelligent evaluation model."},
+            {"role": "user", "content": prompt}
+        ], temperature=0.2, max_tokens=10)
 
-        payload = {
-            "model": MISTRAL_MODEL,
-            "messages": [
-                {"role": "system", "content": "You are an intelligent evaluation model."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.2,
-            "max_tokens": 10
-        }
-
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload, timeout=30)
+        #  Extract and sanitize numeric score from AI output
+        digits = ''.join(filter(str.isdigit, ai_output))
+        score = int(digits) if digits else 0
+        if 1 <= score <= 100:
+            answer_scorer.record("llm")
+            return score
+        print(f"[Mistral Score Error] Unusable score output: {ai_output!r}")
 
-        if response.status_code != 200:
-            raise Exception(f"Mistral API error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"[Mistral Score Error] {str(e)}")
 
-        result = response.json()
-        ai_output = result.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+    #  Fallback in case of API or parsing error: the deterministic local score
+    answer_scorer.record("fallback")
+    return local
+
+
+# -----------------------------
+# Scoring worker
+# -----------------------------
+def score_session(session_log_id):
+    """
+    Compute and store the score of an ended session whose score_status is
+    pending, or whose 'scoring' claim is older than SCORE_RECOVER_AFTER_SECONDS.
+    The claim is stamped with score_started_at; the score is only stored while
+    that stamp is still this worker's.
+    """
+    # DATETIME has whole seconds; the stamp must compare equal once stored
+    claimed_at = datetime.now().replace(microsecond=0)
+    stale_before = claimed_at - timedelta(seconds=SCORE_RECOVER_AFTER_SECONDS)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            UPDATE assessment_session_log SET score_status = %s, score_started_at = %s
+            WHERE id = %s AND (score_status = %s
+                OR (score_status = %s AND (score_started_at IS NULL OR score_started_at < %s)))
+        """, ("scoring", claimed_at, session_log_id, "pending", "scoring", stale_before))
+        conn.commit()
+        if cursor.rowcount == 0:
+            return  # scored, or another worker's claim is still fresh
 
-        #  Extract and sanitize numeric score from AI output
-        try:
-            score = int(''.join(filter(str.isdigit, ai_output)))
-            if score < 1 or score > 100:
-                score = random.randint(40, 60) 
-        except:
-            score = random.randint(40, 60)  
+        cursor.execute("""
+            SELECT l.id, l.question_answer, c.skills
+            FROM assessment_session_log l
+            LEFT JOIN candidateprofile c ON c.id = l.candidate_id
+            WHERE l.id = %s
+        """, (session_log_id,))
+        session_row = cursor.fetchone()
+        question_answer = session_turns.load_turns(cursor, session_row)
+        cursor.close()
+        # The LLM call can take seconds; don't hold a pooled connection through it
+        conn.close()
 
-        return score
+        score = get_ai_score(question_answer, session_row.get("skills") or "")
 
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE assessment_session_log SET score = %s, score_status = %s
+            WHERE id = %s AND score_status = %s AND score_started_at = %s
+        """, (score, "done", session_log_id, "scoring", claimed_at))
+        conn.commit()
+        if cursor.rowcount == 0:
+            print(f"[Score Worker] Session {session_log_id} was taken over by another worker; score dropped")
     except Exception as e:
-        print(f"[Mistral Score Error] {str(e)}")
-        #  Fallback score in case of API or parsing error
-        return random.randint(40, 60)
+        print(f"[Score Worker] Session {session_log_id} could not be scored: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+        with _queued_lock:
+            _queued.discard(session_log_id)
+
+
+def enqueue_scoring(session_log_id):
+    with _queued_lock:
+        if session_log_id in _queued:
+            return
+        _queued.add(session_log_id)
+    _score_pool.submit(score_session, session_log_id)
+
+
+def score_sessions(session_log_ids):
+    """End sessions closed by the expiry sweeper (status "completed") and queue their scoring."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(session_log_ids))
+        # Sessions end_interview got to first are left alone
+        cursor.execute(f"""
+            UPDATE assessment_session_log
+            SET status = %s, ended_at = %s, score_status = %s
+            WHERE status = %s AND id IN ({placeholders})
+        """, ["ended", datetime.now(), "pending", "completed", *session_log_ids])
+        conn.commit()
+        cursor.execute(f"""
+            SELECT id FROM assessment_session_log
+            WHERE score_status = %s AND id IN ({placeholders})
+        """, ["pending", *session_log_ids])
+        pending = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+    for session_log_id in pending:
+        enqueue_scoring(session_log_id)
+
+
+def score_state(session_row):
+    """(scoreStatus, score) for a session log row: "scoring" until the worker has stored the score."""
+    status = session_row.get("score_status")
+    if status in ("pending", "scoring"):
+        return "scoring", None
+    if session_row.get("score") is None:
+        return "notScored", None
+    return "ready", session_row["score"]
+
+
+def score_is_stuck(session_row):
+    """A pending score nobody picked up, or a scoring claim older than SCORE_RECOVER_AFTER_SECONDS."""
+    stale_before = datetime.now() - timedelta(seconds=SCORE_RECOVER_AFTER_SECONDS)
+    if session_row.get("score_status") == "scoring":
+        started_at = session_row.get("score_started_at")
+        return started_at is None or started_at < stale_before
+    ended_at = session_row.get("ended_at")
+    return ended_at is not None and ended_at < stale_before
 
 
 def end_interview():
@@ -130,13 +238,19 @@ def end_interview():
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        #  Fetch the most recent session log
-        cursor.execute("""
-            SELECT * FROM assessment_session_log
-            WHERE candidate_id = %s AND job_id = %s AND session_id = %s
-            ORDER BY created_at DESC LIMIT 1
-        """, (candidate_id, job_id, session_id))
-        session_row = cursor.fetchone()
+        stored = session_store.get(session_id, candidate_id, job_id)
+        if stored is not None:
+            #  Session held in memory: write it out now and use it instead of a lookup
+            session_store.close(session_id)
+            session_row = {"id": stored.log_id, "status": stored.status, "score": None}
+        else:
+            #  Fetch the most recent session log
+            cursor.execute("""
+                SELECT * FROM assessment_session_log
+                WHERE candidate_id = %s AND job_id = %s AND session_id = %s
+                ORDER BY created_at DESC LIMIT 1
+            """, (candidate_id, job_id, session_id))
+            session_row = cursor.fetchone()
 
         if not session_row:
             return jsonify({
@@ -148,8 +262,9 @@ def end_interview():
 
         current_status = session_row["status"]
 
-        #  If already ended, return existing score
+        #  If already ended, return the score (or that it is still being computed)
         if current_status == "ended":
+            score_status, score = score_state(session_row)
             return jsonify({
                 "status": "success",
                 "statusCode": 200,
@@ -160,35 +275,22 @@ def end_interview():
                     "jobId": job_id,
                     "sessionId": session_id,
                     "interviewStatus": "ended",
-                    "score": session_row.get("score", 0)
+                    "scoreStatus": score_status,
+                    "score": score
                 }
             }), 200
 
-        #  If active, evaluate and end
-        if current_status == "active":
-            answers_data = session_row.get("question_answer")
-
-            # Convert JSON string from DB
-            if isinstance(answers_data, str):
-                try:
-                    question_answer = json.loads(answers_data)
-                except json.JSONDecodeError:
-                    question_answer = []
-            else:
-                question_answer = answers_data or []
-
-            #  Generate score dynamically
-            score = get_ai_score(question_answer)
-
-            #  Update DB with final score
+        #  If active (or closed by the expiry sweeper and not scored yet), end it and score in the background
+        if current_status in ("active", "completed"):
             cursor.execute("""
                 UPDATE assessment_session_log
-                SET status = %s, ended_at = %s, score = %s
+                SET status = %s, ended_at = %s, score_status = %s
                 WHERE id = %s
-            """, ("ended", datetime.now(), score, session_row["id"]))
+            """, ("ended", datetime.now(), "pending", session_row["id"]))
             conn.commit()
+            enqueue_scoring(session_row["id"])
 
-            #  Respond with success
+            #  Respond right away; poll the score endpoint for the result
             return jsonify({
                 "status": "success",
                 "statusCode": 200,
@@ -199,7 +301,8 @@ def end_interview():
                     "jobId": job_id,
                     "sessionId": session_id,
                     "interviewStatus": "ended",
-                    "score": score
+                    "scoreStatus": "scoring",
+                    "score": None
                 }
             }), 200
 
@@ -219,3 +322,51 @@ def end_interview():
             "isSuccess": False
         }), 500
 
+
+def get_interview_score(job_id, candidate_id, session_id):
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT id, status, score, score_status, ended_at, score_started_at FROM assessment_session_log
+            WHERE candidate_id = %s AND job_id = %s AND session_id = %s
+            ORDER BY created_at DESC LIMIT 1
+        """, (candidate_id, job_id, session_id))
+        session_row = cursor.fetchone()
+        cursor.close()
+
+        if not session_row:
+            return jsonify({
+                "status": "failed",
+                "statusCode": 404,
+                "message": "Session not found.",
+                "isSuccess": False
+            }), 404
+
+        score_status, score = score_state(session_row)
+        if score_status == "scoring" and score_is_stuck(session_row):
+            # Its worker is gone (restart or crash); queue it again
+            enqueue_scoring(session_row["id"])
+
+        return jsonify({
+            "status": "success",
+            "statusCode": 200,
+            "message": "Interview score is ready." if score_status == "ready" else "Interview score is not ready yet.",
+            "isSuccess": True,
+            "result": {
+                "candidateId": candidate_id,
+                "jobId": job_id,
+                "sessionId": session_id,
+                "interviewStatus": session_row["status"],
+                "scoreStatus": score_status,
+                "score": score
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "failed",
+            "statusCode": 500,
+            "message": str(e),
+            "isSuccess": False
+        }), 500
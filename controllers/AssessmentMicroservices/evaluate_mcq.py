@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, transaction, mark_write
 from datetime import datetime
 def evaluate_mcq():
     try:
@@ -25,7 +25,7 @@ def evaluate_mcq():
 
         # Fetch MCQ data for this job
         cursor.execute("""
-            SELECT *
+            SELECT id, correctOption
             FROM jdbasedaimcq
             WHERE JobId = %s
         """, (jobId,))
@@ -45,8 +45,12 @@ def evaluate_mcq():
         # print('total_questions:',total_questions)
         correct_answers = 0
 
+        # Index questions by id once instead of scanning db_mcqs for every answer
+        mcq_by_id = {mcq["id"]: mcq for mcq in db_mcqs}
+
         for item in mcq_data:
-            question = next((mcq for mcq in db_mcqs if mcq["id"] == item["id"]), None)
+            question = mcq_by_id.get(item["id"])
+            item["score"] = 0
             if question:
                 item_score = 5 if question["correctOption"].strip().lower() == item["selectedOption"].strip().lower() else 0
                 item["score"] = item_score
@@ -95,57 +99,39 @@ def evaluate_mcq():
         # Prepare insert data for assessmentinfo table
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        # Check if ANY record exists for this jobId + candidateId + assessmentId
-        cursor.execute("""
-            SELECT 1 FROM assessmentinfo
-            WHERE jobId = %s AND candidateId = %s AND assessmentId = %s
-            LIMIT 1
-        """, (jobId, candidateId, assessmentId))
-
-        record_exists = cursor.fetchone()
-
-        if record_exists:
-            #  UPDATE each question's record individually
-            for item in mcq_data:
-                question_id = item["id"]
-                selected_option = item["selectedOption"]
-
-                cursor.execute("""
-                    UPDATE assessmentinfo
-                    SET selectedOption = %s, score = %s, updatedAt = %s
-                    WHERE jobId = %s AND candidateId = %s AND assessmentId = %s AND questionNo = %s
-                """, (
-                    selected_option, item["score"], now,
-                    jobId, candidateId, assessmentId, question_id
-                ))
-
-        else:
-            #  INSERT all rows
-            insert_query = """
-                INSERT INTO assessmentinfo (jobId, candidateId, assessmentId, questionNo, selectedOption, score, createdAt, updatedAt)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            insert_values = [
-                (jobId, candidateId, assessmentId, item["id"], item["selectedOption"], item["score"], now, now)
-                for item in mcq_data
-            ]
-
-            cursor.executemany(insert_query, insert_values)
-
-        conn.commit()
-        # print('status:',status)
-        # print('score:',score)
-
-        #  Call stored procedure (added AssessmentId as 5th parameter)
-        cursor.callproc("UpdateProfileJourneyStatus", [
-            jobId,
-            candidateId,
-            "ASSESSMENT",
-            status,
-            v_score,
-            assessmentId
-        ])
-        conn.commit()
+        # Answer rows and journey status are written as one unit of work
+        with transaction():
+            # Insert or update every answer in a single statement
+            # (relies on uq_assessmentinfo_job_candidate_assessment_q, migration 002)
+            if mcq_data:
+                row_placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(mcq_data))
+                upsert_query = f"""
+                    INSERT INTO assessmentinfo (jobId, candidateId, assessmentId, questionNo, selectedOption, score, createdAt, updatedAt)
+                    VALUES {row_placeholders}
+                    ON DUPLICATE KEY UPDATE
+                        selectedOption = VALUES(selectedOption),
+                        score = VALUES(score),
+                        updatedAt = VALUES(updatedAt)
+                """
+                upsert_values = []
+                for item in mcq_data:
+                    upsert_values.extend((jobId, candidateId, assessmentId, item["id"], item["selectedOption"], item["score"], now, now))
+
+                cursor.execute(upsert_query, upsert_values)
+
+            # print('status:',status)
+            # print('score:',score)
+
+            #  Call stored procedure (added AssessmentId as 5th parameter)
+            cursor.callproc("UpdateProfileJourneyStatus", [
+                jobId,
+                candidateId,
+                "ASSESSMENT",
+                status,
+                v_score,
+                assessmentId
+            ])
+        mark_write(f"job:{jobId}", f"candidate:{candidateId}")
 
         #  Success response
         return jsonify({
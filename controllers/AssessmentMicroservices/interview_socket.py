@@ -0,0 +1,264 @@
+import os
+import json
+import numpy as np
+import speech_recognition as sr
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from flask import current_app
+from database.db_handler import release_db_connection
+from utils import stt, audio_preprocess
+from controllers.AssessmentMicroservices.start_assessment import open_turn, plan_turn, turn_events
+
+load_dotenv()
+
+try:
+    from simple_websocket import ConnectionClosed
+except ImportError:  # flask-sock not installed; the route is not registered then
+    ConnectionClosed = OSError
+
+# Seconds between checks for finished partial transcripts while waiting for frames
+WS_POLL_SECONDS = float(os.getenv("WS_POLL_SECONDS", 0.25))
+# Live audio is cut at a pause once this many seconds have built up...
+WS_PARTIAL_MIN_SECONDS = float(os.getenv("WS_PARTIAL_MIN_SECONDS", 3))
+# ...or anywhere once this many seconds have built up without a pause
+WS_PARTIAL_MAX_SECONDS = float(os.getenv("WS_PARTIAL_MAX_SECONDS", 12))
+WS_STT_WORKERS = int(os.getenv("WS_STT_WORKERS", 4))
+# Accepted microphone sample rates for audio_start
+WS_MIN_SAMPLE_RATE = int(os.getenv("WS_MIN_SAMPLE_RATE", 8000))
+WS_MAX_SAMPLE_RATE = int(os.getenv("WS_MAX_SAMPLE_RATE", 96000))
+# Push each question segment's MP3 as a binary frame after its audio event
+WS_SEND_AUDIO = os.getenv("WS_SEND_AUDIO", "true").lower() not in ("0", "false", "no")
+
+_stt_pool = ThreadPoolExecutor(max_workers=WS_STT_WORKERS, thread_name_prefix="ws-stt")
+
+
+def _transcribe_piece(samples, rate, backend):
+    try:
+        return stt.transcribe_samples(samples, rate, backend)
+    except sr.UnknownValueError:
+        return ""
+
+
+class AnswerStream:
+    """
+    One spoken answer arriving as 16-bit mono PCM frames. Audio is cut at
+    pauses while the candidate is still speaking and each piece is
+    transcribed in the background, so partial transcripts can be pushed and
+    only the last piece is left to recognize when the answer ends.
+    Pieces are resampled whole, so the filter never sees frame boundaries.
+    """
+
+    def __init__(self, sample_rate, backend=None):
+        self.sample_rate = sample_rate
+        self.rate = audio_preprocess.AUDIO_CONFIG['target_rate']
+        self.backend = backend
+        self.pending = np.zeros(0, dtype=np.int16)  # at sample_rate
+        self.carry = b""  # odd byte of a sample split across frames
+        self.futures = []
+        self.reported = 0
+
+    def feed(self, pcm):
+        data = self.carry + bytes(pcm)
+        usable = len(data) - len(data) % 2
+        self.carry = data[usable:]
+        self.pending = np.concatenate([self.pending, np.frombuffer(data[:usable], dtype=np.int16)])
+        if len(self.pending) < WS_PARTIAL_MIN_SECONDS * self.sample_rate:
+            return
+        cut = audio_preprocess.last_pause(self.pending, self.sample_rate)
+        if cut is None and len(self.pending) >= WS_PARTIAL_MAX_SECONDS * self.sample_rate:
+            cut = len(self.pending)
+        if cut:
+            self._submit(self.pending[:cut])
+            self.pending = self.pending[cut:]
+
+    def _submit(self, samples):
+        samples = audio_preprocess.resample(samples, self.sample_rate, self.rate)
+        trimmed = audio_preprocess.trim_silence(samples, self.rate)
+        if len(trimmed):
+            self.futures.append(_stt_pool.submit(_transcribe_piece, trimmed, self.rate, self.backend))
+
+    def new_partials(self):
+        """Texts of the pieces transcribed since the last call, in order."""
+        texts = []
+        while self.reported < len(self.futures) and self.futures[self.reported].done():
+            future = self.futures[self.reported]
+            self.reported += 1
+            # A failed piece is reported once, by finish()
+            text = future.result() if future.exception() is None else ""
+            if text:
+                texts.append(text)
+        return texts
+
+    def finish(self):
+        """The whole answer's transcript; raises sr.UnknownValueError if nothing was recognized."""
+        self._submit(self.pending)
+        self.pending = self.pending[:0]
+        text = " ".join(t.strip() for t in (f.result() for f in self.futures) if t and t.strip())
+        if not text:
+            raise sr.UnknownValueError("No speech recognized in the audio answer.")
+        return text
+
+
+def _send(ws, message_type, data=None):
+    ws.send(json.dumps(dict(data or {}, type=message_type)))
+
+
+def _audio_bytes(static_dir, audio_url):
+    path = os.path.join(static_dir, "audio", os.path.basename(audio_url or ""))
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def run_turn(ws, state, last_answer):
+    """
+    One interview turn over the socket; returns False when the session is over.
+    The connection keeps the last recorded turn, so only the first turn reads
+    the candidate and the session from MySQL.
+    """
+    ids = state["ids"]
+    try:
+        turn, error = open_turn(ids["candidateId"], ids["jobId"], ids["sessionId"], last_answer, state["turn"])
+        if error:
+            status_code, message = error
+            _send(ws, "error", {"statusCode": status_code, "message": message})
+            return status_code != 440
+
+        question_text, prompt = plan_turn(turn)
+        for event, data in turn_events(turn, prompt, question_text, state["static_dir"]):
+            _send(ws, event, data)
+            if event == "audio" and WS_SEND_AUDIO:
+                ws.send(_audio_bytes(state["static_dir"], data["audioUrl"]))
+            elif event == "done":
+                state["turn"] = turn
+        ids["sessionId"] = turn["session_id"]
+        return True
+    except ConnectionClosed:
+        raise
+    except Exception as e:
+        print(f"[WS] Interview turn failed: {e}")
+        _send(ws, "error", {"statusCode": 500, "message": f"Internal server error: {e}"})
+        return True
+    finally:
+        # Give the pooled connection back between turns instead of holding it for the whole socket
+        release_db_connection()
+
+
+def parse_sample_rate(value):
+    """sampleRate of an audio_start message (default: the STT target rate), or None if unusable."""
+    if value is None:
+        return audio_preprocess.AUDIO_CONFIG['target_rate']
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    try:
+        rate = float(value)
+    except ValueError:
+        return None
+    if not WS_MIN_SAMPLE_RATE <= rate <= WS_MAX_SAMPLE_RATE or rate != int(rate):
+        return None
+    return int(rate)
+
+
+def handle_message(ws, state, message):
+    """Act on one client frame; returns False when the session is over and the socket should close."""
+    if isinstance(message, (bytes, bytearray)):
+        if state["answer"] is None:
+            _send(ws, "error", {"statusCode": 400, "message": "Send audio_start before audio frames."})
+        else:
+            state["answer"].feed(message)
+        return True
+
+    try:
+        data = json.loads(message)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        _send(ws, "error", {"statusCode": 400, "message": "Messages must be JSON objects."})
+        return True
+    message_type = data.get("type")
+
+    if message_type == "start":
+        if not data.get("candidateId") or not data.get("jobId"):
+            _send(ws, "error", {"statusCode": 400, "message": "Invalid input. Required: candidateId, jobId."})
+            return True
+        state["ids"] = {"candidateId": data["candidateId"], "jobId": data["jobId"], "sessionId": data.get("sessionId")}
+        state["turn"] = None
+        return run_turn(ws, state, "")
+
+    if state["ids"] is None:
+        _send(ws, "error", {"statusCode": 400, "message": "Send start first."})
+        return True
+
+    if message_type == "audio_start":
+        sample_rate = parse_sample_rate(data.get("sampleRate"))
+        if sample_rate is None:
+            _send(ws, "error", {"statusCode": 400, "message": f"sampleRate must be an integer between "
+                                                              f"{WS_MIN_SAMPLE_RATE} and {WS_MAX_SAMPLE_RATE}."})
+            return True
+        state["answer"] = AnswerStream(sample_rate, data.get("sttBackend"))
+        return True
+
+    if message_type == "answer":
+        text = data.get("text")
+        last_answer = text.strip() if isinstance(text, str) else ""
+    elif message_type == "audio_end":
+        answer, state["answer"] = state["answer"], None
+        if answer is None:
+            _send(ws, "error", {"statusCode": 400, "message": "No answer in progress."})
+            return True
+        try:
+            last_answer = answer.finish()
+        except sr.UnknownValueError:
+            _send(ws, "error", {"statusCode": 422, "message": "Could not understand the audio. Please speak clearly."})
+            return True
+        except (sr.RequestError, stt.STTUnavailable) as e:
+            _send(ws, "error", {"statusCode": 503, "message": f"Speech recognition service error: {e}"})
+            return True
+        _send(ws, "transcript", {"text": last_answer})
+    else:
+        _send(ws, "error", {"statusCode": 400, "message": f"Unknown message type: {message_type}"})
+        return True
+
+    return run_turn(ws, state, last_answer)
+
+
+def interview_channel(ws):
+    """
+    Duplex interview channel for one session.
+
+    Client -> server (JSON text frames unless noted):
+      {"type": "start", "candidateId", "jobId", "sessionId"?}   first question (or resume)
+      {"type": "audio_start", "sampleRate"?, "sttBackend"?}     an answer begins
+      binary frames                                              16-bit mono PCM of the answer
+      {"type": "audio_end"}                                      answer finished -> next question
+      {"type": "answer", "text"}                                 typed answer -> next question
+    Server -> client:
+      partial {text}, transcript {text}, then the turn events of start_assessment
+      (session, audio, done, error); with WS_SEND_AUDIO each audio event is
+      followed by the segment's MP3 as a binary frame. A bad message gets an
+      error {statusCode, message} and the socket stays open.
+    """
+    static_dir = os.path.join(current_app.root_path, "static")
+    os.makedirs(os.path.join(static_dir, "audio"), exist_ok=True)
+    # The session lives in this process for the life of the connection: turn
+    # is the last recorded one (candidate snapshot, session row, plan)
+    state = {"ids": None, "turn": None, "answer": None, "static_dir": static_dir}
+
+    try:
+        while True:
+            message = ws.receive(timeout=WS_POLL_SECONDS)
+            if state["answer"] is not None:
+                for text in state["answer"].new_partials():
+                    _send(ws, "partial", {"text": text})
+            if message is None:
+                continue
+            try:
+                if not handle_message(ws, state, message):
+                    break
+            except ConnectionClosed:
+                raise
+            except Exception as e:
+                print(f"[WS] Message could not be handled: {e}")
+                _send(ws, "error", {"statusCode": 500, "message": f"Internal server error: {e}"})
+
+    except ConnectionClosed:
+        pass
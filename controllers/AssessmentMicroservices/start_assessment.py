@@ -1,227 +1,112 @@
 import os
+import re
 import json
 import uuid
 import base64
-import asyncio
-import requests
-import tempfile
-import edge_tts  
-import subprocess
 from dotenv import load_dotenv
 import speech_recognition as sr
-from pymediainfo import MediaInfo
 from datetime import datetime, timedelta
-from flask import request, jsonify, current_app
-from database.db_handler import get_db_connection
+from concurrent.futures import ThreadPoolExecutor
+from flask import request, jsonify, current_app, Response, stream_with_context
+from config import SESSION_DURATION_MINUTES
+from database.db_handler import get_db_connection, release_db_connection
+from utils.llm_client import mistral_chat
+from utils import tts, stt, audio_preprocess, lipsync, interview_plan, session_turns, session_store
 
 load_dotenv()
 
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-MISTRAL_API_URL = os.getenv("MISTRAL_API_URL")
-MISTRAL_MODEL = os.getenv("MISTRAL_MODEL")
-
 BASE_URL = os.getenv("BASE_URL")
 
-# -----------------------------
-# Dynamic Executable Paths
-# -----------------------------
-# BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# Project root is two levels up
-# PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
-
-# APPS_DIR = os.path.join(PROJECT_ROOT, "apps")
-
-# FFMPEG_PATH = os.path.join(APPS_DIR, "ffmpeg.exe")
-# FFPROBE_PATH = os.path.join(APPS_DIR, "ffprobe.exe")
-# RHUBARB_PATH = os.path.join(APPS_DIR, "rhubarb.exe")
-
-# Generate Edge-tts-audio
-async def generate_neural_audio(text, output_path):
-    """Generate high-quality neural TTS using en-US-JennyNeural voice."""
-    voice = "en-IN-PrabhatNeural"
-    communicate = edge_tts.Communicate(text, voice)
-    await communicate.save(output_path)
-
-# Generate Rhubarb-json
-# def generate_lipsync_json(audio_filename, text, session_id, unique_id):
-#     try:
-#         # Define paths
-#         static_lipsync_dir = os.path.join("static", "lipsync")
-#         os.makedirs(static_lipsync_dir, exist_ok=True)
-
-#         json_output = os.path.join(static_lipsync_dir, f"response_{session_id}_{unique_id}_lipsync.json")
-
-#         # Create dialog text file
-#         dialog_file = f"static/audio/dialog_{session_id}_{unique_id}.txt"
-#         with open(dialog_file, "w", encoding="utf-8") as f:
-#             f.write(text)
-
-#         # Use absolute path (safe for all environments)
-#         rhubarb_path = os.path.abspath(RHUBARB_PATH)
-
-#         #print(f"Running Rhubarb from: {rhubarb_path}")  
-
-#         if not os.path.exists(rhubarb_path):
-#             raise FileNotFoundError(f"Rhubarb executable not found at {rhubarb_path}")
-
-#         # Convert mp3 to ogg (Rhubarb prefers wav/ogg)
-#         ogg_filename = audio_filename.replace(".mp3", ".ogg")
-#         subprocess.run(
-#             [FFMPEG_PATH, "-y", "-i", audio_filename, ogg_filename],
-#             stdout=subprocess.DEVNULL,
-#             stderr=subprocess.DEVNULL,
-#             check=True
-#         )
-
-
-#         # Run Rhubarb
-#         result = subprocess.run([
-#             rhubarb_path,
-#             ogg_filename,
-#             "-o", json_output,
-#             "-d", dialog_file,
-#             "-f", "json"
-#         ], capture_output=True, text=True)
-
-#         if result.returncode != 0:
-#             #print(" Rhubarb Error:", result.stderr)
-#             raise RuntimeError(f"Rhubarb failed: {result.stderr}")
-
-#         # Get audio duration
-#         info = MediaInfo.parse(ogg_filename)
-#         duration = float(info.tracks[0].duration) / 1000 if info.tracks[0].duration else 0.0
-
-#         # Append metadata
-#         with open(json_output, "r+", encoding="utf-8") as f:
-#             data = json.load(f)
-#             data["metadata"] = {
-#                 "soundFile": ogg_filename,
-#                 "duration": round(duration, 2)
-#             }
-#             f.seek(0)
-#             json.dump(data, f, indent=2)
-#             f.truncate()
-
-#         os.remove(dialog_file)
-#         return json_output, data  
-
-#     except Exception as e:
-#         #print("Rhubarb generation failed:", e)
-#         return None, {}
+# Streaming turns: sentences shorter than this are merged with the next one before TTS
+STREAM_MIN_SEGMENT_CHARS = int(os.getenv("STREAM_MIN_SEGMENT_CHARS", 12))
+STREAM_TTS_WORKERS = int(os.getenv("STREAM_TTS_WORKERS", 4))
 
-# AI Screening
-def start_assessment():
-    conn = None
-    cursor = None
-    SESSION_DURATION_MINUTES = 3
-    remaining_time_str = f"{SESSION_DURATION_MINUTES:02d}:00"
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_tts_pool = ThreadPoolExecutor(max_workers=STREAM_TTS_WORKERS, thread_name_prefix="tts-segment")
 
-    try:
-        # -----------------------------
-        # Parse request
-        # -----------------------------
-        if request.content_type and request.content_type.startswith("multipart/form-data"):
-            candidate_id = request.form.get("candidateId")
-            job_id = request.form.get("jobId")
-            session_id = request.form.get("sessionId")  
-            last_answer = ""
-
-            if "audio" in request.files:
-                audio_file = request.files["audio"]
-                recognizer = sr.Recognizer()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-                    audio_file.save(temp_audio.name)
-                    with sr.AudioFile(temp_audio.name) as source:
-                        audio_data = recognizer.record(source)
-                        last_answer = recognizer.recognize_google(audio_data)
-        else:
-            data = request.get_json()
-            candidate_id = data.get("candidateId")
-            job_id = data.get("jobId")
-            session_id = data.get("sessionId")
-            last_answer = data.get("answer", "").strip()
-
-        if not candidate_id or not job_id:
-            return jsonify({
-                "status": "failed",
-                "statusCode": 400,
-                "message": "Invalid input. Required: candidateId, jobId.",
-                "isSuccess": False
-            }), 400
 
-        # -----------------------------
-        # Fetch candidate info
-        # -----------------------------
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM candidateprofile WHERE id = %s", (candidate_id,))
-        candidate = cursor.fetchone()
-
-        if not candidate:
-            return jsonify({
-                "status": "failed",
-                "statusCode": 404,
-                "message": "Candidate not found.",
-                "isSuccess": False
-            }), 404
-
-        # candidate_name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip()
-        candidate_name = candidate.get('first_name')
-        skills = candidate.get('skills', '')
-        education = candidate.get('education', '')
-        experience = candidate.get('experience', '')
-        latestrole = candidate.get('latestrole','')
-        address =  candidate.get('address','')
-        # -----------------------------
-        # Handle Session
-        # -----------------------------
-        now = datetime.now()
-        session_valid = False
-        if session_id:
-            cursor.execute("""
-                SELECT * FROM assessment_session_log
-                WHERE session_id = %s AND candidate_id = %s AND job_id = %s
-                ORDER BY created_at DESC LIMIT 1
-            """, (session_id, candidate_id, job_id))
-            session_row = cursor.fetchone()
-            # if session_row:
-            #     created_at = session_row["created_at"]
-            #     if now - created_at <= timedelta(minutes=10):
-            #         session_valid = True  
-            #     else:
-            #         session_valid = False
-            if session_row:
-                created_at = session_row["created_at"]
-                elapsed = now - created_at
-                total_duration = timedelta(minutes=SESSION_DURATION_MINUTES)
-                remaining = total_duration - elapsed
-                remaining_seconds = max(0, int(remaining.total_seconds()))
-                minutes, seconds = divmod(remaining_seconds, 60)
-                remaining_time_str = f"{minutes:02d}:{seconds:02d}"
-
-                if elapsed <= total_duration:
-                    session_valid = True
-                else:
-                    session_valid = False
-            else:
-                remaining_time_str = f"{SESSION_DURATION_MINUTES:02d}:00"
-
-        if session_id and not session_valid:
-            # Session expired
-            return jsonify({
-                "status": "failed",
-                "statusCode": 440,
-                "message": f"Hi {candidate_name}, your interview has ended. Thank you for taking the time to speak with us. Wishing you all the best for your future!",
-                "isSuccess": False
-            }), 440
-
-
-        # -----------------------------
-        # Build dynamic prompt
-        # -----------------------------
-        if last_answer == "":
-            prompt = f"""
+# -----------------------------
+# Turn stages (shared by the JSON and streaming responses)
+# -----------------------------
+def _failure(status_code, message):
+    return jsonify({
+        "status": "failed",
+        "statusCode": status_code,
+        "message": message,
+        "isSuccess": False
+    }), status_code
+
+
+def parse_turn_request():
+    """candidateId, jobId, sessionId, the transcribed/typed answer and whether to stream."""
+    if request.content_type and request.content_type.startswith("multipart/form-data"):
+        candidate_id = request.form.get("candidateId")
+        job_id = request.form.get("jobId")
+        session_id = request.form.get("sessionId")
+        stream = request.form.get("stream", "")
+        last_answer = ""
+
+        if "audio" in request.files:
+            # Decoded, resampled and silence-trimmed in memory
+            samples, rate = audio_preprocess.preprocess_samples(request.files["audio"])
+            if len(samples) == 0:
+                raise sr.UnknownValueError("No speech detected in the audio answer.")
+            # Long answers are split on pauses and transcribed in parallel;
+            # sttBackend picks google or sphinx for this request (default STT_BACKEND)
+            last_answer = stt.transcribe_samples(samples, rate, request.form.get("sttBackend"))
+    else:
+        data = request.get_json()
+        candidate_id = data.get("candidateId")
+        job_id = data.get("jobId")
+        session_id = data.get("sessionId")
+        stream = data.get("stream", "")
+        last_answer = data.get("answer", "").strip()
+
+    wants_stream = str(stream).lower() in ("1", "true", "yes") or \
+        "text/event-stream" in (request.headers.get("Accept") or "")
+    return candidate_id, job_id, session_id, last_answer, wants_stream
+
+
+def load_session(cursor, candidate_id, job_id, session_id):
+    """Latest log row for the session, whether it is still running, and the time left."""
+    remaining_time_str = f"{SESSION_DURATION_MINUTES:02d}:00"
+    if not session_id:
+        return None, False, remaining_time_str
+
+    now = datetime.now()
+    cursor.execute("""
+        SELECT l.*,
+               (SELECT COUNT(*) FROM assessment_session_turn t WHERE t.session_log_id = l.id) AS turn_count
+        FROM assessment_session_log l
+        WHERE l.session_id = %s AND l.candidate_id = %s AND l.job_id = %s
+        ORDER BY l.created_at DESC LIMIT 1
+    """, (session_id, candidate_id, job_id))
+    session_row = cursor.fetchone()
+    if not session_row:
+        return None, False, remaining_time_str
+    return (session_row,) + session_time(session_row, now)
+
+
+def session_time(session_row, now=None):
+    """(still running, "MM:SS" left) for a session log row."""
+    elapsed = (now or datetime.now()) - session_row["created_at"]
+    total_duration = timedelta(minutes=SESSION_DURATION_MINUTES)
+    remaining_seconds = max(0, int((total_duration - elapsed).total_seconds()))
+    minutes, seconds = divmod(remaining_seconds, 60)
+    # Expired sessions are closed by the background sweeper (utils/session_sweeper.py);
+    # the time check covers the interval until its next pass
+    session_valid = session_row["status"] == "active" and elapsed <= total_duration
+    return session_valid, f"{minutes:02d}:{seconds:02d}"
+
+
+def build_question_prompt(candidate, last_answer):
+    candidate_name = candidate.get('first_name')
+    skills = candidate.get('skills', '')
+    education = candidate.get('education', '')
+    experience = candidate.get('experience', '')
+
+    if last_answer == "":
+        prompt = f"""
         You are a friendly HR interviewer conducting a structured job interview.
 
         Candidate Info:
@@ -231,23 +116,17 @@ def start_assessment():
         Skills: {skills}
 
         --- INSTRUCTIONS ---
-        # 1. Greet the candidate naturally (e.g.,"Hi, I’m Subho, from your recruitment team — nice to meet you! {candidate_name}").
-        # 2. Then ask **exactly ONE question** about their education, in **1-2 short sentences only**.
-        # 3. **Do not** add explanations, comments, examples, or multiple questions.
-        # 4. **Output only the question text** — no other sentences or instructions.
-        # 5. Keep tone friendly, professional, and conversational.
         1. Greet the candidate naturally (e.g., "Hi, I’m Subho, from your recruitment team — nice to meet you, {candidate_name}!").
         2. Then ask **exactly ONE question** about their education background — such as what they studied, their college experience, or subjects they enjoyed.
         3. **Do NOT mention or refer to any grades, marks, percentages, CGPA, GPA, or scores — focus only on their learning, projects, or experiences.**
         4. **Do not** add explanations, comments, examples, or multiple questions.
         5. **Output only the question text** — nothing else.
         6. Keep the tone friendly, professional, and conversational.
-        7. **Do not** add explanations, comments, examples, or multiple questions.
-        8. **Do not** use abbreviations or expansions in parentheses.
-        9. When discussing technologies, focus on types or roles, not specific names.
+        7. **Do not** use abbreviations or expansions in parentheses.
+        8. When discussing technologies, focus on types or roles, not specific names.
         """
-        else:
-            prompt = f"""
+    else:
+        prompt = f"""
         You are a friendly HR interviewer continuing a structured job interview.
 
         Candidate Info:
@@ -259,128 +138,361 @@ def start_assessment():
         The candidate just answered: "{last_answer}"
 
         --- INSTRUCTIONS ---
-        # 1. Ask **exactly ONE short question** (1-2 sentences) based on the candidate’s previous answer.
-        # 2. Follow this sequence: Education → Experience → Skills → Technical → Hobbies/Personality.
-        # 3. **Do not** include follow-up questions, examples, or explanations.
-        # 4. **Output only the next question** — nothing else.
-        # 5. Keep tone friendly, professional, and conversational.
         1. Ask **exactly ONE short question** (1–2 sentences) based on the candidate’s previous answer.
         2. Follow this sequence: Education → Experience → Skills → Technical → Hobbies/Personality.
         3. **Do NOT mention or refer to any grades, marks, percentages, CGPA, GPA, or scores — focus on ideas, experiences, or skills.**
-        4. **Do not** include follow-up questions, examples, or explanations.
+        4. **Do not** include follow-up questions, examples, explanations, or multiple questions.
         5. **Output only the next question** — nothing else.
         6. Keep tone friendly, professional, and conversational.
-        7. **Do not** add explanations, comments, examples, or multiple questions.
-        8. **Do not** use abbreviations or expansions in parentheses.
-        9. When discussing technologies, focus on types or roles, not specific names.
-
+        7. **Do not** use abbreviations or expansions in parentheses.
+        8. When discussing technologies, focus on types or roles, not specific names.
         """
+    return prompt
+
+
+def questions_asked(session_row):
+    """How many questions the session has asked so far (turn rows plus any legacy JSON turns)."""
+    if not session_row:
+        return 0
+    legacy = json.loads(session_row.get("question_answer") or "[]")
+    return len(legacy) + (session_row.get("turn_count") or 0)
+
+
+def open_turn(candidate_id, job_id, session_id, last_answer, previous=None):
+    """
+    State for one turn: the candidate, the session and its interview plan.
+    A session held by the session store needs no database reads, and neither
+    does a turn that follows previous, the last turn on the same connection
+    (the WebSocket channel): its candidate snapshot, session row and plan are
+    reused. Otherwise the candidate and the session log row come from MySQL.
+    Returns (turn, None), or (None, (status_code, message)) when the turn
+    cannot go ahead.
+    """
+    if previous is not None and previous["stored"] is not None:
+        stored = previous["stored"]
+    else:
+        stored = session_store.get(session_id, candidate_id, job_id) if session_id else None
+    if stored is not None:
+        candidate, session_row = stored.candidate, None
+        session_valid, remaining_time_str = stored.remaining()
+        plan, asked = stored.plan, stored.questions_asked()
+    elif previous is not None and previous["session_row"] is not None:
+        candidate, session_row, plan = previous["candidate"], previous["session_row"], previous["plan"]
+        session_valid, remaining_time_str = session_time(session_row)
+        asked = questions_asked(session_row)
+    else:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM candidateprofile WHERE id = %s", (candidate_id,))
+            candidate = cursor.fetchone()
+            if not candidate:
+                return None, (404, "Candidate not found.")
+            session_row, session_valid, remaining_time_str = load_session(cursor, candidate_id, job_id, session_id)
+        finally:
+            cursor.close()
+            # Plan generation, Mistral and TTS come next; record_turn checks out a connection again
+            release_db_connection()
+        plan = interview_plan.load_plan(session_row) if interview_plan.enabled() else None
+        asked = questions_asked(session_row)
+
+    if session_id and not session_valid:
+        # Session expired
+        candidate_name = candidate.get('first_name')
+        return None, (440, f"Hi {candidate_name}, your interview has ended. Thank you for taking the time to speak with us. Wishing you all the best for your future!")
+
+    if not session_id and interview_plan.enabled():
+        plan = interview_plan.generate_plan(candidate)
+
+    return {
+        "candidate_id": candidate_id,
+        "job_id": job_id,
+        "session_id": session_id,
+        "last_answer": last_answer,
+        "candidate": candidate,
+        "session_row": session_row,
+        "session_valid": session_valid,
+        "stored": stored,
+        "plan": plan,
+        "asked": asked,
+        "remaining_time": remaining_time_str,
+    }, None
+
+
+def plan_turn(turn):
+    """
+    (question_text, prompt) for this turn under INTERVIEW_PLAN_MODE.
+    question_text is set when the plan already holds the question (no LLM
+    call); otherwise prompt is the Mistral prompt to generate it.
+    """
+    candidate, last_answer, asked = turn["candidate"], turn["last_answer"], turn["asked"]
+    planned = interview_plan.planned_question(turn["plan"], asked) if interview_plan.enabled() else None
+    if planned is None:
+        # Plan mode off, no plan (old session or failed generation) or the plan is used up
+        return None, build_question_prompt(candidate, last_answer)
+    if asked == 0 or not last_answer or interview_plan.PLAN_CONFIG['mode'] == "scripted":
+        return planned["question"], None
+    return None, interview_plan.followup_prompt(candidate, last_answer, planned)
+
+
+def record_turn(turn, question_text):
+    """
+    Store the answer and the new question; returns the session id. Sessions
+    in the session store are updated in memory and written to MySQL in the
+    background; others are written here.
+    """
+    session_id = turn["session_id"] = turn["session_id"] or str(uuid.uuid4())
+    if turn["stored"] is not None:
+        turn["stored"].add_turn(turn["last_answer"], question_text)
+        return session_id
+    if not turn["session_valid"] and session_store.enabled():
+        turn["stored"] = session_store.create(session_id, turn["candidate_id"], turn["job_id"],
+                                              turn["candidate"], turn["plan"], question_text)
+        return session_id
+
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        session_id, turn["session_row"] = save_turn(conn, cursor, turn["candidate_id"], turn["job_id"], session_id,
+                                                    turn["session_row"], turn["session_valid"], question_text,
+                                                    turn["last_answer"], turn["plan"])
+        turn["session_valid"] = True
+        return session_id
+    finally:
+        cursor.close()
+
+
+def turn_result(turn, question_text, audio_url, lipsync_url):
+    return {
+        "candidateId": turn["candidate_id"],
+        "jobId": turn["job_id"],
+        "sessionId": turn["session_id"],
+        "question": question_text,
+        "audioUrl": audio_url,
+        "lipsyncUrl": lipsync_url,
+        "remainingTime": turn["remaining_time"]
+    }
+
+
+def save_turn(conn, cursor, candidate_id, job_id, session_id, session_row, session_valid, question_text, last_answer,
+              plan=None):
+    """
+    Record the answer to the previous question and the new question as turn
+    rows (one UPDATE and one INSERT, whatever the interview length). Returns
+    the session id and the session log row as it stands after the turn, so
+    the next turn on the same connection can skip reading it back.
+    """
+    if session_valid:
+        session_log_id = session_row["id"]
+        asked = questions_asked(session_row)
+        added = 1
+        if last_answer and session_turns.record_answer(cursor, session_log_id, asked, last_answer):
+            added += 1
+        session_turns.append_question(cursor, session_log_id, asked + 1, question_text)
+        conn.commit()
+        return session_id, dict(session_row, turn_count=(session_row.get("turn_count") or 0) + added)
+
+    # New session: the log row keeps an empty question_answer, turns go to their own table
+    session_id = session_id or str(uuid.uuid4())
+    created_at = datetime.now().replace(microsecond=0)
+    if plan:
+        cursor.execute("""
+            INSERT INTO assessment_session_log (candidate_id, job_id, session_id, question_answer, status, interview_plan, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, (candidate_id, job_id, session_id, "[]", 'active', interview_plan.dump_plan(plan), created_at))
+    else:
+        cursor.execute("""
+            INSERT INTO assessment_session_log (candidate_id, job_id, session_id, question_answer, status, created_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (candidate_id, job_id, session_id, "[]", 'active', created_at))
+    session_log_id = cursor.lastrowid
+    session_turns.append_question(cursor, session_log_id, 1, question_text)
+    conn.commit()
+    return session_id, {
+        "id": session_log_id, "session_id": session_id, "status": "active", "created_at": created_at,
+        "question_answer": "[]", "turn_count": 1,
+        "interview_plan": interview_plan.dump_plan(plan) if plan else None,
+    }
+
+
+def synthesize_question_media(text, static_dir):
+    """
+    Public URLs of the TTS audio and its lip-sync JSON for text. Both are
+    content addressed, so repeated text is served from cache. A lip-sync
+    failure only drops lipsyncUrl.
+    """
+    audio_dir = os.path.join(static_dir, "audio")
+    audio_filename = tts.cached_audio(text, audio_dir)
+    audio_url = f"{BASE_URL}/static/audio/{audio_filename}"
 
+    try:
+        lipsync_filename = lipsync.cached_lipsync(text, os.path.join(audio_dir, audio_filename),
+                                                  os.path.join(static_dir, "lipsync"))
+        lipsync_url = f"{BASE_URL}/static/lipsync/{lipsync_filename}"
+    except Exception as e:
+        print(f"Lip-sync generation failed: {e}")
+        lipsync_url = None
+    return audio_url, lipsync_url
+
+
+# -----------------------------
+# Streaming: Mistral tokens -> sentences -> TTS segments
+# -----------------------------
+def text_sentences(text):
+    """Sentences of a ready-made question, merged the same way as streamed ones."""
+    pending = ""
+    for sentence in _SENTENCE_END_RE.split(text.strip()):
+        pending = f"{pending} {sentence}".strip()
+        if len(pending) >= STREAM_MIN_SEGMENT_CHARS:
+            yield pending
+            pending = ""
+    if pending:
+        yield pending
+
+
+def stream_question_sentences(prompt):
+    """Yield the model's reply sentence by sentence while it is still being generated."""
+    response = mistral_chat(prompt, temperature=0.7, stream=True)
+    response.encoding = "utf-8"
+    buffer, pending = "", ""
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            delta = (choices[0].get("delta") or {}).get("content") if choices else None
+            if not delta:
+                continue
+
+            buffer += delta
+            *complete, buffer = _SENTENCE_END_RE.split(buffer)
+            for sentence in complete:
+                pending = f"{pending} {sentence}".strip()
+                if len(pending) >= STREAM_MIN_SEGMENT_CHARS:
+                    yield pending
+                    pending = ""
+    finally:
+        response.close()
+
+    tail = f"{pending} {buffer}".strip()
+    if tail:
+        yield tail
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def turn_events(turn, prompt, question_text, static_dir):
+    """
+    (event, data) pairs for one turn, shared by the SSE and WebSocket channels:
+      session -> {sessionId, remainingTime}
+      audio   -> {index, text, audioUrl, lipsyncUrl}   one per sentence, in order
+      done    -> same result as the JSON response, plus the segment list
+      error   -> {message}
+    The first segment is synthesized as soon as its sentence is complete; later
+    segments are synthesized in parallel while the model keeps generating.
+    A question_text taken from the interview plan is segmented the same way,
+    without a model call.
+    """
+    turn["session_id"] = turn["session_id"] or str(uuid.uuid4())
+    sentences, futures, segments = [], [], []
+
+    def flush(block):
+        while len(segments) < len(futures) and (block or futures[len(segments)].done()):
+            index = len(segments)
+            audio_url, lipsync_url = futures[index].result()
+            segments.append({"index": index, "text": sentences[index], "audioUrl": audio_url, "lipsyncUrl": lipsync_url})
+            yield "audio", segments[-1]
+
+    try:
+        yield "session", {"sessionId": turn["session_id"], "remainingTime": turn["remaining_time"]}
+
+        if question_text:
+            source = text_sentences(question_text)
+        else:
+            source = stream_question_sentences(prompt)
+        for sentence in source:
+            sentences.append(sentence)
+            futures.append(_tts_pool.submit(synthesize_question_media, sentence, static_dir))
+            # Nothing is playing yet: wait for the first segment, then pipeline the rest
+            yield from flush(block=len(futures) == 1)
+        yield from flush(block=True)
+
+        text = " ".join(sentences).strip()
+        if not text:
+            yield "error", {"message": "Model did not return a valid question."}
+            return
+
+        record_turn(turn, text)
+
+        first = segments[0] if segments else {}
+        yield "done", dict(turn_result(turn, text, first.get("audioUrl"), first.get("lipsyncUrl")), segments=segments)
+    except Exception as e:
+        yield "error", {"message": str(e)}
+
+
+def stream_turn(turn, prompt, question_text, static_dir):
+    """The turn as a text/event-stream response (see turn_events)."""
+    def generate():
+        for event, data in turn_events(turn, prompt, question_text, static_dir):
+            yield _sse(event, data)
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# AI Screening
+def start_assessment():
+    try:
         # -----------------------------
-        # Call Mistral API
+        # Parse request
         # -----------------------------
-        headers = {
-            "Authorization": f"Bearer {MISTRAL_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "model": MISTRAL_MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7
-        }
-
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        question_text = None
-        if "choices" in result and len(result["choices"]) > 0:
-            question_text = result["choices"][0]["message"]["content"].strip()
-        elif "output" in result:
-            question_text = result["output"].strip()
+        candidate_id, job_id, session_id, last_answer, wants_stream = parse_turn_request()
 
-        if not question_text:
-            return jsonify({
-                "status": "failed",
-                "statusCode": 502,
-                "message": "Model did not return a valid question.",
-                "isSuccess": False
-            }), 502
+        if not candidate_id or not job_id:
+            return _failure(400, "Invalid input. Required: candidateId, jobId.")
 
         # -----------------------------
-        # Generate Neural Audio
+        # Candidate and session (from the session store when it holds them)
         # -----------------------------
-        audio_dir = os.path.join(current_app.root_path, "static", "audio")
-        os.makedirs(audio_dir, exist_ok=True)
-        audio_filename = f"question_{candidate_id}_{job_id}_{os.getpid()}.mp3"
-        audio_path = os.path.join(audio_dir, audio_filename)
-        asyncio.run(generate_neural_audio(question_text, audio_path))
-        audio_url = f"{BASE_URL}/static/audio/{audio_filename}"
+        turn, error = open_turn(candidate_id, job_id, session_id, last_answer)
+        if error:
+            return _failure(*error)
 
         # -----------------------------
-        # Generate Rhubarb JSON
+        # Next question: from the interview plan, or a prompt for Mistral
         # -----------------------------
-        # unique_id = uuid.uuid4().hex[:6]
-        # lipsync_path, rhubarb_json = generate_lipsync_json(audio_path, question_text, session_id, unique_id)
-        # lipsync_url = f"{BASE_URL}/static/lipsync/{os.path.basename(lipsync_path)}" if lipsync_path else None
+        question_text, prompt = plan_turn(turn)
 
+        static_dir = os.path.join(current_app.root_path, "static")
+        os.makedirs(os.path.join(static_dir, "audio"), exist_ok=True)
+
+        if wants_stream:
+            return stream_turn(turn, prompt, question_text, static_dir)
 
         # -----------------------------
-        # Save session log in DB
+        # Call Mistral API
         # -----------------------------
-        qa_pair = {"question": question_text, "answer": last_answer}
-
-        if session_valid:
-            existing_log = json.loads(session_row["question_answer"])
-
-            #  Step 1: Fill last unanswered question
-            if last_answer and existing_log and existing_log[-1].get("answer", "") == "":
-                existing_log[-1]["answer"] = last_answer
-            elif last_answer:
-                # If something went out of order
-                existing_log.append({"questionNo": len(existing_log) + 1, "question": "", "answer": last_answer})
-
-            #  Step 2: Append new question
-            existing_log.append({
-                "questionNo": len(existing_log) + 1,
-                "question": question_text,
-                "answer": ""
-            })
-
-            created_at = session_row["created_at"]
-            current_status = session_row["status"]
-
-            #  Step 3: Keep your old DB update logic (same as before)
-            if current_status == "active" and datetime.now() - created_at > timedelta(minutes=3):
-                cursor.execute("""
-                    UPDATE assessment_session_log
-                    SET question_answer = %s, status = %s
-                    WHERE id = %s
-                """, (json.dumps(existing_log), "completed", session_row["id"]))
-            else:
-                cursor.execute("""
-                    UPDATE assessment_session_log
-                    SET question_answer = %s
-                    WHERE id = %s
-                """, (json.dumps(existing_log), session_row["id"]))
-
-            conn.commit()
+        # Sampled at temperature 0.7 on purpose; a cached question would repeat itself
+        if not question_text:
+            question_text = mistral_chat(prompt, temperature=0.7, cache=False)
 
-        else:
-            # New session — same as before
-            session_id = str(uuid.uuid4())
-            qa_list = [{
-                "questionNo": 1,
-                "question": question_text,
-                "answer": ""
-            }]
-            cursor.execute("""
-                INSERT INTO assessment_session_log (candidate_id, job_id, session_id, question_answer, status)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (candidate_id, job_id, session_id, json.dumps(qa_list), 'active'))
-            conn.commit()
+        if not question_text:
+            return _failure(502, "Model did not return a valid question.")
 
+        # -----------------------------
+        # Generate Neural Audio + Rhubarb-format lip-sync JSON
+        # -----------------------------
+        audio_url, lipsync_url = synthesize_question_media(question_text, static_dir)
 
+        # -----------------------------
+        # Save the turn (in memory with write-behind, or in the DB)
+        # -----------------------------
+        record_turn(turn, question_text)
 
         # -----------------------------
         # Success response
@@ -390,28 +502,8 @@ def start_assessment():
             "statusCode": 200,
             "message": "Assessment question generated successfully.",
             "isSuccess": True,
-            "result": {
-                "candidateId": candidate_id,
-                "jobId": job_id,
-                "sessionId": session_id,
-                "question": question_text,
-                "audioUrl": audio_url,
-                #"lipsyncUrl": lipsync_url,
-                "remainingTime": remaining_time_str
-            }
+            "result": turn_result(turn, question_text, audio_url, lipsync_url)
         }), 200
 
     except Exception as e:
-        return jsonify({
-            "status": "failed",
-            "statusCode": 500,
-            "message": str(e),
-            "isSuccess": False
-        }), 500
-
-    finally:
-        try:
-            if cursor: cursor.close()
-            if conn and conn.is_connected(): conn.close()
-        except:
-            pass
+        return _failure(500, str(e))
@@ -6,7 +6,7 @@ from email.mime.text import MIMEText
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 from email.mime.multipart import MIMEMultipart
-from database.db_handler import get_db_connection
+from database.db_handler import transaction, mark_write
 from utils.google_meet import create_google_meet_link
 
 
@@ -38,72 +38,72 @@ def book_candidate_slot():
                 "statusCode": 400
             }), 400
 
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Step 1️: Get candidate details from candidateprofile using numeric ID
-        cursor.execute("""
-            SELECT id, first_name, last_name, email 
-            FROM candidateprofile 
-            WHERE id = %s
-        """, (candidate_id,))
-        candidate_row = cursor.fetchone()
-        if not candidate_row:
-            return jsonify({
-                "isSuccess": False,
-                "message": f"No candidate found with ID {candidate_id}",
-                "status": "error",
-                "statusCode": 404
-            }), 404
-
-        numeric_candidate_id = candidate_row["id"]
-        candidate_email = candidate_row["email"]
-        candidate_name = f"{candidate_row['first_name']} {candidate_row['last_name']}".strip()
-        candidate_first_name = candidate_row["first_name"]
-
-        # Step 2️: Get hiring manager ID from job table
-        cursor.execute("SELECT hiringManagerId, role FROM job WHERE id = %s", (job_id,))
-        job_row = cursor.fetchone()
-        if not job_row:
-            return jsonify({
-                "isSuccess": False,
-                "message": f"No hiring manager found for job ID {job_id}",
-                "status": "error",
-                "statusCode": 404
-            }), 404
-
-        hiring_manager_id = job_row["hiringManagerId"]
-        job_role = job_row["role"]
-
-        # Step 3️: Update slot as booked (store candidate email for clarity)
-        cursor.execute("""
-            UPDATE hiringmanagerselectedslots
-            SET isBooked = 1,
-                candidateId = %s,
-                jobid= %s,
-                updatedOn = NOW()
-            WHERE id = %s
-        """, (candidate_id, job_id, slot_id))
-
-        # Step 4️: Update jobassessments table
-        cursor.execute("""
-            UPDATE jobassessments
-            SET status = 'Interview Scheduled'
-            WHERE jobId = %s
-              AND candidateId = %s
-              AND assessmentName = 'Teams Interview'
-        """, (job_id, numeric_candidate_id))
-
-        # Step 5️: Update jobapplication table
-        cursor.execute("""
-            UPDATE jobapplication
-            SET LatestStatus = 'Interview Scheduled'
-            WHERE JobId = %s
-              AND CandidateId = %s
-              AND LatestStatus = 'Interview Schedule Pending'
-        """, (job_id, numeric_candidate_id))
-
-        conn.commit()
+        # Steps 1-5 share one connection and commit once; any failure rolls back the booking
+        with transaction() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            # Step 1️: Get candidate details from candidateprofile using numeric ID
+            cursor.execute("""
+                SELECT id, first_name, last_name, email 
+                FROM candidateprofile 
+                WHERE id = %s
+            """, (candidate_id,))
+            candidate_row = cursor.fetchone()
+            if not candidate_row:
+                return jsonify({
+                    "isSuccess": False,
+                    "message": f"No candidate found with ID {candidate_id}",
+                    "status": "error",
+                    "statusCode": 404
+                }), 404
+
+            numeric_candidate_id = candidate_row["id"]
+            candidate_email = candidate_row["email"]
+            candidate_name = f"{candidate_row['first_name']} {candidate_row['last_name']}".strip()
+            candidate_first_name = candidate_row["first_name"]
+
+            # Step 2️: Get hiring manager ID from job table
+            cursor.execute("SELECT hiringManagerId, role FROM job WHERE id = %s", (job_id,))
+            job_row = cursor.fetchone()
+            if not job_row:
+                return jsonify({
+                    "isSuccess": False,
+                    "message": f"No hiring manager found for job ID {job_id}",
+                    "status": "error",
+                    "statusCode": 404
+                }), 404
+
+            hiring_manager_id = job_row["hiringManagerId"]
+            job_role = job_row["role"]
+
+            # Step 3️: Update slot as booked (store candidate email for clarity)
+            cursor.execute("""
+                UPDATE hiringmanagerselectedslots
+                SET isBooked = 1,
+                    candidateId = %s,
+                    jobid= %s,
+                    updatedOn = NOW()
+                WHERE id = %s
+            """, (candidate_id, job_id, slot_id))
+
+            # Step 4️: Update jobassessments table
+            cursor.execute("""
+                UPDATE jobassessments
+                SET status = 'Interview Scheduled'
+                WHERE jobId = %s
+                  AND candidateId = %s
+                  AND assessmentName = 'Teams Interview'
+            """, (job_id, numeric_candidate_id))
+
+            # Step 5️: Update jobapplication table
+            cursor.execute("""
+                UPDATE jobapplication
+                SET LatestStatus = 'Interview Scheduled'
+                WHERE JobId = %s
+                  AND CandidateId = %s
+                  AND LatestStatus = 'Interview Schedule Pending'
+            """, (job_id, numeric_candidate_id))
+        mark_write(f"job:{job_id}", f"candidate:{candidate_id}")
 
         # Step 6️: Send emails
         send_interview_emails(
@@ -120,7 +120,6 @@ def book_candidate_slot():
         )
 
         cursor.close()
-        conn.close()
 
         return jsonify({
             "isSuccess": True,
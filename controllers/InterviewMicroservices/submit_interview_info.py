@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 from flask import request, jsonify
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from database.db_handler import get_db_connection
+from database.db_handler import transaction, mark_write
 
 load_dotenv()
 
@@ -98,57 +98,58 @@ def submit_interview_info():
             'Under Review': 50
         }
 
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Step 1: Check if interview info already exists
-        check_query = """
-            SELECT 1 FROM interviewinfo WHERE JobId = %s AND CandidateId = %s
-        """
-        cursor.execute(check_query, (job_id, candidate_id))
-        exists = cursor.fetchone()
-
-        if exists:
-            update_query = """
-                UPDATE interviewinfo
-                SET JoinStatus = %s,
-                    Feedback = %s,
-                    SelectionStatus = %s
-                WHERE JobId = %s AND CandidateId = %s
-            """
-            cursor.execute(update_query, (join_status, feedback, selection_status, job_id, candidate_id))
-        else:
-            insert_query = """
-                INSERT INTO interviewinfo 
-                (JobId, CandidateId, JoinStatus, Feedback, SelectionStatus)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (job_id, candidate_id, join_status, feedback, selection_status))
-
-        # Step 2: Update jobassessments table if status is valid
-        assessment_sqnc = 3
-        assessment_name = 'Teams Interview'
-
-        if selection_status in score_map:
-            score_value = score_map[selection_status]
-
-            update_assessment = """
-                UPDATE jobassessments
-                SET status = 'Completed', score = %s
-                WHERE jobId = %s
-                  AND candidateId = %s
-                  AND assessmentSqnc = %s
-                  AND assessmentName = %s
-            """
-            cursor.execute(update_assessment, (score_value, job_id, candidate_id, assessment_sqnc, assessment_name))
+        # Steps 1-2 run as one unit of work: one commit, rolled back together on failure
+        with transaction() as conn:
+            cursor = conn.cursor(dictionary=True)
 
-            update_application = """
-                UPDATE jobapplication
-                SET LatestStatus = %s, Score = %s
-                WHERE JobId = %s AND CandidateId = %s
+            # Step 1: Check if interview info already exists
+            check_query = """
+                SELECT 1 FROM interviewinfo WHERE JobId = %s AND CandidateId = %s
             """
-            cursor.execute(update_application, (selection_status, score_value, job_id, candidate_id))
-        conn.commit()
+            cursor.execute(check_query, (job_id, candidate_id))
+            exists = cursor.fetchone()
+
+            if exists:
+                update_query = """
+                    UPDATE interviewinfo
+                    SET JoinStatus = %s,
+                        Feedback = %s,
+                        SelectionStatus = %s
+                    WHERE JobId = %s AND CandidateId = %s
+                """
+                cursor.execute(update_query, (join_status, feedback, selection_status, job_id, candidate_id))
+            else:
+                insert_query = """
+                    INSERT INTO interviewinfo 
+                    (JobId, CandidateId, JoinStatus, Feedback, SelectionStatus)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(insert_query, (job_id, candidate_id, join_status, feedback, selection_status))
+
+            # Step 2: Update jobassessments table if status is valid
+            assessment_sqnc = 3
+            assessment_name = 'Teams Interview'
+
+            if selection_status in score_map:
+                score_value = score_map[selection_status]
+
+                update_assessment = """
+                    UPDATE jobassessments
+                    SET status = 'Completed', score = %s
+                    WHERE jobId = %s
+                      AND candidateId = %s
+                      AND assessmentSqnc = %s
+                      AND assessmentName = %s
+                """
+                cursor.execute(update_assessment, (score_value, job_id, candidate_id, assessment_sqnc, assessment_name))
+
+                update_application = """
+                    UPDATE jobapplication
+                    SET LatestStatus = %s, Score = %s
+                    WHERE JobId = %s AND CandidateId = %s
+                """
+                cursor.execute(update_application, (selection_status, score_value, job_id, candidate_id))
+        mark_write(f"job:{job_id}", f"candidate:{candidate_id}")
 
         # Step 3: Send email to candidate if Selected/Rejected
         email_message = None
@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, mark_write
 
 def applied_job_by_candidate():
     try:
@@ -66,6 +66,8 @@ def applied_job_by_candidate():
             conn.commit()
             message = f"Job application initialized successfully for CandidateId: {candidate_id}, JobId: {job_id}."
 
+        mark_write(f"job:{job_id}", f"candidate:{candidate_id}")
+
         return jsonify({
             "status": "success",
             "statusCode": 200,
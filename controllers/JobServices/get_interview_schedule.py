@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_read_connection
 
 
 def get_interview_schedule():
@@ -16,7 +16,7 @@ def get_interview_schedule():
         jobId = data["jobId"]
         candidateId = data["CandidateId"]
 
-        conn = get_db_connection()
+        conn = get_read_connection(f"job:{jobId}", f"candidate:{candidateId}")
         cursor = conn.cursor(dictionary=True)
 
         cursor.execute("""
@@ -1,17 +1,29 @@
 import os
 import re
 import json
-import requests
+import numpy as np
 from flask import jsonify
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, release_db_connection, mark_write
+from utils.skill_match import score_candidate_against_jobs
+from utils import match_cache
+from utils.llm_client import mistral_chat, MISTRAL_MODEL
 
 load_dotenv()
 
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-MISTRAL_API_URL = os.getenv("MISTRAL_API_URL")
-MISTRAL_MODEL = os.getenv("MISTRAL_MODEL")
+# local  -> skill vectors only (no LLM calls)
+# rerank -> skill vectors, then the LLM re-scores the top JOB_MATCH_RERANK_TOP_K jobs
+# llm    -> LLM scores every job (previous behaviour)
+JOB_MATCH_SCORER = os.getenv("JOB_MATCH_SCORER", "local").lower()
+JOB_MATCH_RERANK_TOP_K = int(os.getenv("JOB_MATCH_RERANK_TOP_K", 5))
 
+# LLM scoring fan-out: parallel calls and per-call (connect, read) timeout in seconds
+JOB_MATCH_LLM_CONCURRENCY = int(os.getenv("JOB_MATCH_LLM_CONCURRENCY", 8))
+JOB_MATCH_LLM_TIMEOUT = (
+    float(os.getenv("JOB_MATCH_LLM_CONNECT_TIMEOUT", 5)),
+    float(os.getenv("JOB_MATCH_LLM_TIMEOUT", 20)),
+)
 
 
 # -------------------------------
@@ -28,10 +40,32 @@ MISTRAL_MODEL = os.getenv("MISTRAL_MODEL")
 #     return round(min(percentage, 100.0), 2)
 
 
-def calculate_match_percentage(candidate_skills, job_skills):
+def _match_cache_scorer():
+    return f"mistral-skills:{MISTRAL_MODEL}"
+
+
+def calculate_match_percentage(candidate_skills, job_skills, timeout=JOB_MATCH_LLM_TIMEOUT):
+    """
+    Skill match percentage from the match cache, or from Mistral on a miss.
+    Returns a float (e.g. 78.5); 0.0 on error or timeout.
+    """
+    candidate_hash = match_cache.skills_fingerprint(candidate_skills)
+    job_hash = match_cache.skills_fingerprint(job_skills)
+    cached = match_cache.get(_match_cache_scorer(), candidate_hash, job_hash)
+    if cached is not None:
+        return cached
+
+    score = _llm_match_percentage(candidate_skills, job_skills, timeout)
+    if score is None:
+        return 0.0
+    match_cache.put(_match_cache_scorer(), candidate_hash, job_hash, score)
+    return score
+
+
+def _llm_match_percentage(candidate_skills, job_skills, timeout=JOB_MATCH_LLM_TIMEOUT):
     """
     Uses Mistral Small model API to calculate skill match percentage.
-    Returns a float (e.g. 78.5)
+    Returns a float (e.g. 78.5), or None on error, timeout or an unparsable reply.
     """
     try:
         prompt = f"""
@@ -43,33 +77,83 @@ def calculate_match_percentage(candidate_skills, job_skills):
         Job Required Skills: {job_skills}
         """
 
-        headers = {
-            "Authorization": f"Bearer {MISTRAL_API_KEY}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": MISTRAL_MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3
-        }
-
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-
-        result = response.json()
-        raw_output = result["choices"][0]["message"]["content"].strip()
+        # Scores are cached by skill fingerprint in match_cache instead
+        raw_output = mistral_chat(prompt, temperature=0.3, timeout=timeout, cache=False)
 
         # Extract only numeric part (e.g. “85%” or “85.3”)
         match = re.search(r"(\d+(\.\d+)?)", raw_output)
         if match:
             return round(float(match.group(1)), 2)
         else:
-            return 0.0
+            return None
 
     except Exception as e:
         print("⚠️ Mistral API error:", e)
-        return 0.0
+        return None
+
+# -------------------------------
+# Scoring: local skill vectors, optional LLM re-rank
+# -------------------------------
+def llm_score_jobs(candidate_skills, job_skills_list):
+    """
+    Score many jobs with the LLM; results are aligned with job_skills_list.
+    Cached pairs are looked up in one batch, the rest are scored in parallel
+    and stored back with one write.
+    """
+    if not job_skills_list:
+        return []
+
+    scorer = _match_cache_scorer()
+    candidate_hash = match_cache.skills_fingerprint(candidate_skills)
+    job_hashes = [match_cache.skills_fingerprint(job_skills) for job_skills in job_skills_list]
+    scores = match_cache.get_many(scorer, candidate_hash, job_hashes)
+
+    # Identical job skill sets are scored once
+    to_score = {}
+    for job_hash, job_skills in zip(job_hashes, job_skills_list):
+        if job_hash not in scores:
+            to_score.setdefault(job_hash, job_skills)
+
+    if to_score:
+        workers = max(1, min(JOB_MATCH_LLM_CONCURRENCY, len(to_score)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda job_skills: _llm_match_percentage(candidate_skills, job_skills), to_score.values()))
+        fresh = {job_hash: score for job_hash, score in zip(to_score, results) if score is not None}
+        match_cache.put_many(scorer, candidate_hash, fresh)
+        scores.update(fresh)
+
+    return [scores.get(job_hash, 0.0) for job_hash in job_hashes]
+
+
+def score_jobs(candidate_skills, jobs, known_scores=None):
+    """
+    Match percentage for every job, aligned with jobs.
+    known_scores maps job index -> score already stored in jobapplication;
+    those jobs are never sent to the LLM.
+    """
+    known_scores = known_scores or {}
+
+    if JOB_MATCH_SCORER == "llm":
+        scores = np.array([float(known_scores.get(i, 0.0)) for i in range(len(jobs))])
+        to_score = [i for i in range(len(jobs)) if i not in known_scores]
+    else:
+        scores = score_candidate_against_jobs(candidate_skills, [job["primarySkills"] for job in jobs])
+        to_score = []
+        if JOB_MATCH_SCORER == "rerank" and JOB_MATCH_RERANK_TOP_K > 0:
+            ranked = np.argsort(-scores, kind="stable")
+            to_score = [i for i in ranked if scores[i] > 0 and i not in known_scores][:JOB_MATCH_RERANK_TOP_K]
+
+    # A stored score stands in every mode, so an application never drops out on a rescore
+    for i, known_score in known_scores.items():
+        scores[i] = float(known_score)
+
+    llm_scores = llm_score_jobs(candidate_skills, [jobs[i]["primarySkills"] for i in to_score])
+    for i, llm_score in zip(to_score, llm_scores):
+        # In rerank mode a failed LLM call keeps the local score
+        if JOB_MATCH_SCORER == "llm" or llm_score > 0:
+            scores[i] = llm_score
+
+    return [float(score) for score in scores]
 
 # -------------------------------
 # JD Parsing Utility
@@ -126,30 +210,40 @@ def match_jobs(candidate_id):
             })
 
         matched_jobs = []
+        new_applications = []
+
+        # Step 3: Fetch the candidate's existing applications in one query
+        cursor.execute("""
+            SELECT JobId, LatestStatus, jobmatchscore FROM jobapplication
+            WHERE candidateId = %s
+        """, (candidate_id,))
+        existing_by_job = {row["JobId"]: row for row in cursor.fetchall()}
+
+        known_scores = {
+            i: existing_by_job[job["id"]]["jobmatchscore"]
+            for i, job in enumerate(jobs)
+            if job["id"] in existing_by_job and existing_by_job[job["id"]]["jobmatchscore"] is not None
+        }
 
-        # Step 3: Process each job
-        for job in jobs:
-            match_percentage = calculate_match_percentage(candidate_skills, job["primarySkills"]
-            )
+        # Done reading; in llm/rerank mode scoring waits on the LLM, so give the connection back
+        cursor.close()
+        release_db_connection()
+
+        # Step 4: Score the candidate against every job at once
+        match_scores = score_jobs(candidate_skills, jobs, known_scores)
+
+        # Step 5: Process each job
+        for job, match_percentage in zip(jobs, match_scores):
             # print("candidate",candidate_skills)
             # print("job",job["primarySkills"])
-            if match_percentage > 0:
+            existing = existing_by_job.get(job["id"])
+            # Jobs the candidate already has an application for are always listed
+            if match_percentage > 0 or existing:
                 job_title, job_location = parse_jd(job["jd"])
 
-                # Check if already exists in jobapplication
-                cursor.execute("""
-                    SELECT LatestStatus, jobmatchscore  FROM jobapplication 
-                    WHERE candidateId = %s AND jobId = %s
-                """, (candidate_id, job["id"]))
-                existing = cursor.fetchone()
-
                 if not existing:
-                    # Insert only once (score included)
-                    cursor.execute("""
-                        INSERT INTO jobapplication (candidateId, jobId, LatestStatus, jobmatchscore)
-                        VALUES (%s, %s, 'Inactive',%s)
-                    """, (candidate_id, job["id"], match_percentage))
-                    conn.commit()
+                    # Insert only once (score included), batched below
+                    new_applications.append((candidate_id, job["id"], match_percentage))
                     latest_status = "Inactive"
                 else:
                     latest_status = existing["LatestStatus"]
@@ -163,7 +257,19 @@ def match_jobs(candidate_id):
                     "status": latest_status
                 })
 
-        # Step 4: Return response
+        # Step 6: Write all new applications in one insert and one commit
+        if new_applications:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            row_placeholders = ", ".join(["(%s, %s, 'Inactive', %s)"] * len(new_applications))
+            cursor.execute(f"""
+                INSERT INTO jobapplication (candidateId, jobId, LatestStatus, jobmatchscore)
+                VALUES {row_placeholders}
+            """, [value for row in new_applications for value in row])
+            conn.commit()
+            mark_write(f"candidate:{candidate_id}")
+
+        # Step 7: Return response
         if matched_jobs:
             return jsonify({
                 "isSuccess": True,
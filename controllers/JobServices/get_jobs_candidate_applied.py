@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_read_connection
 
 def get_jobs_candidate_applied(candidateID):
     try:
@@ -11,7 +11,7 @@ def get_jobs_candidate_applied(candidateID):
                 "isSuccess": False
             }), 400
 
-        conn = get_db_connection()
+        conn = get_read_connection(f"candidate:{candidateID}")
         cursor = conn.cursor(dictionary=True)
 
         # Fetch jobs applied by the candidate
@@ -1,5 +1,5 @@
 from flask import request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_read_connection
 
 def get_latest_statuses_by_job_id(jobId):
     try:
@@ -11,7 +11,7 @@ def get_latest_statuses_by_job_id(jobId):
                 "isSuccess": False
             }), 400
 
-        conn = get_db_connection()
+        conn = get_read_connection(f"job:{jobId}")
         cursor = conn.cursor(dictionary=True)
 
         # Fetch latest statuses for the given JobId
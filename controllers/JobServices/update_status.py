@@ -1,42 +1,40 @@
 from flask import Flask, request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import transaction, mark_write
 
 
 # ==========================================
 # 🗃 Repository Layer
 # ==========================================
 class AssessmentRepository:
+    """
+    Both methods run inside transaction(), so when called from an open unit of
+    work they share its connection and commit together with it.
+    """
 
     @staticmethod
     def update_job_assessment(candidate_id: int, job_id: int):
         """Call stored procedure to update job assessment."""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            # Call stored procedure (must exist in DB)
-            cursor.callproc('sp_update_job_assessment', [candidate_id, job_id])
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise Exception(f"Failed to update job assessment: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                # Call stored procedure (must exist in DB)
+                cursor.callproc('sp_update_job_assessment', [candidate_id, job_id])
+            except Exception as e:
+                raise Exception(f"Failed to update job assessment: {e}")
+            finally:
+                cursor.close()
 
     @staticmethod
     def upsert_job_application(candidate_id: int, job_id: int):
         """Call stored procedure to insert or update job application."""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.callproc('sp_upsert_job_application', [candidate_id, job_id])
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise Exception(f"Failed to upsert job application: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.callproc('sp_upsert_job_application', [candidate_id, job_id])
+            except Exception as e:
+                raise Exception(f"Failed to upsert job application: {e}")
+            finally:
+                cursor.close()
 
 # ==========================================
 # API Endpoint
@@ -44,11 +42,6 @@ class AssessmentRepository:
 def update_assessment_status():
     """POST endpoint to update assessment and job application status."""
     try:
-
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-
         payload = request.get_json(force=True)
 
         candidate_id = payload.get('CandidateId')
@@ -62,11 +55,14 @@ def update_assessment_status():
                 "message": "CandidateId and JobId are required."
             }), 400
 
-        # Step 1: Update Job Assessment
-        AssessmentRepository.update_job_assessment(candidate_id, job_id)
+        # One connection and one commit for both steps; rolled back together on failure
+        with transaction():
+            # Step 1: Update Job Assessment
+            AssessmentRepository.update_job_assessment(candidate_id, job_id)
 
-        # Step 2: Insert or Update Job Application
-        AssessmentRepository.upsert_job_application(candidate_id, job_id)
+            # Step 2: Insert or Update Job Application
+            AssessmentRepository.upsert_job_application(candidate_id, job_id)
+        mark_write(f"job:{job_id}", f"candidate:{candidate_id}")
 
         # Success Response
         return jsonify({
@@ -1,6 +1,6 @@
 from flask import request, jsonify
 from database.db_handler import get_db_connection
-import json
+from utils import session_turns
 def candidate_details():
     conn = None
     cursor = None
@@ -65,21 +65,21 @@ def candidate_details():
             
         #  Fetch AI Screening Score & Details
             cursor.execute("""
-                SELECT score, question_answer
+                SELECT id, score, score_status, question_answer
                 FROM assessment_session_log
                 WHERE candidate_id = %s AND job_id = %s
             """, (candidate_id, jobId))
             aiscreening = cursor.fetchone()
-            raw_details =  None
             if aiscreening:
-                candidate["aiscreening_score"] = f"{aiscreening['score']}%"
-                raw_details = aiscreening.get("question_answer")
-                # Safely parse the JSON string from DB
-            if raw_details:
-                try:
-                    candidate["screening_details"] = json.loads(raw_details)
-                except json.JSONDecodeError:
-                    candidate["screening_details"] = []
+                # The score is computed in the background after end_interview
+                if aiscreening["score_status"] in ("pending", "scoring"):
+                    candidate["aiscreening_status"] = "scoring"
+                    candidate["aiscreening_score"] = None
+                else:
+                    candidate["aiscreening_status"] = "ready"
+                    candidate["aiscreening_score"] = f"{aiscreening['score']}%"
+                # Turn rows, plus the question_answer JSON of sessions stored before them
+                candidate["screening_details"] = session_turns.load_turns(cursor, aiscreening)
             else:
                 candidate["screening_details"] = []
         else:
@@ -6,17 +6,14 @@ import json
 import smtplib
 from dotenv import load_dotenv
 from flask import request, jsonify
-import google.generativeai as genai
 from email.mime.text import MIMEText
 from werkzeug.utils import secure_filename
 from email.mime.multipart import MIMEMultipart
 from database.db_handler import get_db_connection
+from utils.llm_client import gemini_generate
 
 load_dotenv()
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=API_KEY)
-
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
@@ -140,7 +137,6 @@ def upload_cv():
         if not text_content.strip() or "Error reading" in text_content or "requires" in text_content:
             return jsonify({"message": "Failed to extract data from CV"}), 400
 
-        model = genai.GenerativeModel("gemini-2.5-flash")  
         prompt = f"""
         You are a CV parsing assistant. 
         Analyze the following resume text and extract the information in a **clean JSON format**,
@@ -184,8 +180,7 @@ def upload_cv():
         {text_content}
         """
 
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip() if response else "{}"
+        raw_text = gemini_generate(prompt) or "{}"
 
         try:
             extracted_data = json.loads(raw_text)
@@ -1,5 +1,5 @@
 from flask import Flask, request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_read_connection
 import json
  
 
@@ -46,7 +46,7 @@ def extract_job_title_recursively(data):
 
 def get_job_details():
     try:
-        conn = get_db_connection()
+        conn = get_read_connection("jobs")
         cursor = conn.cursor(dictionary=True)
 
         query = "SELECT * FROM v_recruiter_job_details"
@@ -196,7 +196,7 @@ def get_job_search():
         job_id = data['id']
 
         # Connect to the database
-        conn = get_db_connection()
+        conn = get_read_connection("jobs")
         cursor = conn.cursor(dictionary=True)
 
         # Query the MySQL view using the id
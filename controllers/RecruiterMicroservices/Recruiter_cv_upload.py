@@ -6,17 +6,15 @@ import fitz
 import smtplib
 from dotenv import load_dotenv
 from flask import request, jsonify
-import google.generativeai as genai
 from email.mime.text import MIMEText
 from werkzeug.utils import secure_filename
 from email.mime.multipart import MIMEMultipart
 from database.db_handler import get_db_connection
+from utils.llm_client import gemini_generate, GEMINI_MODEL
+from utils import match_cache
 
 load_dotenv()
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=API_KEY)
-
 UPLOAD_FOLDER = 'uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
@@ -27,6 +25,8 @@ SMTP_PORT = 587
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 
+MATCH_CACHE_SCORER = f"gemini-cv-jd:{GEMINI_MODEL}"
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -142,7 +142,6 @@ def recruiter_upload_cv():
                 })
                 continue
 
-            model = genai.GenerativeModel("gemini-2.5-flash")  
             prompt = f"""
             You are a CV parsing assistant. 
             Analyze the following resume text and extract the information in a **clean JSON format** with the following exact keys:
@@ -177,8 +176,7 @@ def recruiter_upload_cv():
             {text_content}
             """
 
-            response = model.generate_content(prompt)
-            raw_text = response.text.strip() if response else "{}"
+            raw_text = gemini_generate(prompt) or "{}"
 
             try:
                 extracted_data = json.loads(raw_text)
@@ -212,24 +210,39 @@ def recruiter_upload_cv():
                 except json.JSONDecodeError:
                     jd_text_combined = jd_text
 
-                match_prompt = f"""
-                You are a job matching engine.
-                Compare the following job description and candidate profile and give a single **numeric percentage** (0–100)
-                representing how well the candidate matches the job requirements.
-
-                Job Description (JD):
-                {jd_text_combined}
-
-                Candidate Profile (Extracted Data):
-                {json.dumps(extracted_data)}
-
-                Consider skills, experience, designation, education, and role relevance.
-                Return only a number (e.g., 78.5) — no extra text.
-                """
-
-                match_response = model.generate_content(match_prompt)
-                match_text = match_response.text.strip()
-                match_percentage = float(re.findall(r"[\d.]+", match_text)[0]) if re.findall(r"[\d.]+", match_text) else 0
+                # The prompt also weighs experience, designation, education and role,
+                # so those are part of the candidate fingerprint alongside the skills
+                candidate_hash = match_cache.text_fingerprint(
+                    match_cache.skills_fingerprint(extracted_data["skills"]),
+                    extracted_data["experience"], extracted_data["designation"],
+                    extracted_data["education"], extracted_data["latestrole"]
+                )
+                job_hash = match_cache.text_fingerprint(jd_text_combined)
+                cached_match = match_cache.get(MATCH_CACHE_SCORER, candidate_hash, job_hash)
+
+                if cached_match is not None:
+                    match_percentage = cached_match
+                else:
+                    match_prompt = f"""
+                    You are a job matching engine.
+                    Compare the following job description and candidate profile and give a single **numeric percentage** (0–100)
+                    representing how well the candidate matches the job requirements.
+
+                    Job Description (JD):
+                    {jd_text_combined}
+
+                    Candidate Profile (Extracted Data):
+                    {json.dumps(extracted_data)}
+
+                    Consider skills, experience, designation, education, and role relevance.
+                    Return only a number (e.g., 78.5) — no extra text.
+                    """
+
+                    match_text = gemini_generate(match_prompt)
+                    match_numbers = re.findall(r"[\d.]+", match_text)
+                    if match_numbers:
+                        match_percentage = float(match_numbers[0])
+                        match_cache.put(MATCH_CACHE_SCORER, candidate_hash, job_hash, match_percentage)
 
             # --- Insert candidate record ---
             sql = """
@@ -1,16 +1,12 @@
-import os
 import uuid
 import json
 import datetime
 from dotenv import load_dotenv
-import google.generativeai as genai
 from flask import Flask, request, jsonify
-from database.db_handler import get_db_connection
+from database.db_handler import get_db_connection, mark_write
+from utils.llm_client import gemini_generate
 
 load_dotenv()
-# ---------- Configure Gemini API Key ----------
-Api_key=os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=Api_key)
 
 # ---------- Utility: Clean Gemini JSON ----------
 def fix_gemini_result(raw_response):
@@ -79,9 +75,7 @@ def generate_job_description():
         }}
         """
 
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = model.generate_content(prompt)
-        job_description_text = response.text.strip()
+        job_description_text = gemini_generate(prompt)
 
         # ---------- Remove any code block markers ----------
         if job_description_text.startswith("```json"):
@@ -223,9 +217,7 @@ def create_job():
         }}
         """
 
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        mcq_response = model.generate_content(prompt_mcq)
-        mcq_text = mcq_response.text.strip()
+        mcq_text = gemini_generate(prompt_mcq)
 
         # Clean response
         if mcq_text.startswith("```json"):
@@ -272,6 +264,7 @@ def create_job():
 
         cursor.close()
         conn.close()
+        mark_write("jobs")
 
 
         # ---------- Response ----------
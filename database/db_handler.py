@@ -1,10 +1,414 @@
+import time
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
 import mysql.connector
-from config import MYSQL_CONFIG
+from flask import g, has_app_context, has_request_context
+from config import MYSQL_CONFIG, MYSQL_REPLICA_CONFIGS, DB_POOL_CONFIG, DB_READ_YOUR_WRITES_SECONDS
+from database.query_stats import InstrumentedCursor, attach_request_stats
+
+
+# ==========================================
+# Connection Pool
+# ==========================================
+class ConnectionPool:
+    """
+    Thread-safe MySQL connection pool.
+    Keeps between min_size and max_size connections open, closes idle
+    connections above min_size and pings stale ones before reuse.
+    """
+
+    def __init__(self, db_config, min_size=2, max_size=10, idle_timeout=300,
+                 health_check_interval=30, checkout_timeout=10):
+        # consume_results lets a connection be reused even if a caller
+        # left rows unread on an unbuffered cursor
+        self._db_config = dict(db_config, consume_results=True)
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw_conn, last_used)
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        # Stats
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _connect(self):
+        return mysql.connector.connect(**self._db_config)
+
+    def warm_up(self):
+        """Open min_size connections up front (best effort)."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except mysql.connector.Error:
+                with self._cond:
+                    self._size -= 1
+                return
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def _evict_idle_locked(self, now):
+        """Pop idle connections past idle_timeout while keeping min_size open."""
+        expired = []
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            expired.append(conn)
+        return expired
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        conn, last_used, expired = None, None, []
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    expired.extend(self._evict_idle_locked(now))
+                    if self._idle:
+                        # LIFO keeps the most recently used connections warm
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise Exception(
+                            f"Database connection error: no pooled connection available "
+                            f"after {self.checkout_timeout}s (max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        for stale in expired:
+            self._close_quietly(stale)
+
+        try:
+            if conn is None:
+                conn = self._connect()
+            elif time.monotonic() - last_used > self.health_check_interval:
+                conn.ping(reconnect=True, attempts=1, delay=0)
+        except Exception as err:
+            if conn is not None:
+                self._close_quietly(conn)
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise Exception(f"Database connection error: {err}")
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a raw connection to the pool, discarding it if it is broken."""
+        reusable = True
+        try:
+            # Drop anything the caller left uncommitted
+            conn.rollback()
+        except Exception:
+            reusable = False
+
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not reusable:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "inUse": self._in_use,
+                "waiting": self._waiting,
+                "minSize": self.min_size,
+                "maxSize": self.max_size,
+                "checkouts": self._checkouts,
+                "checkoutTimeouts": self._timeouts,
+                "avgCheckoutWaitMs": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "maxCheckoutWaitMs": round(self._max_wait * 1000, 3),
+            }
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled MySQL connection.
+    close() hands the connection back to the pool instead of closing the socket.
+    Request-scoped connections ignore close(); they are released in teardown.
+    Inside transaction() commit() is deferred to the end of the unit of work.
+    Cursors are wrapped so every statement is timed and counted.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._request_scoped = False
+        self._released = False
+        self._tx_depth = 0
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def is_connected(self):
+        return not self._released and self._conn.is_connected()
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        if self._tx_depth == 0:
+            self._conn.commit()
+
+    def close(self):
+        if not self._request_scoped and self._tx_depth == 0:
+            self.release()
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Connection owned by the open transaction() on this thread, if any
+_local = threading.local()
+
+_replica_pools = None
+_replica_rotation = itertools.count()
+_replica_fallbacks = 0
+
+# Read-your-writes pins: key -> monotonic time until which reads go to the primary
+_recent_writes = {}
+_recent_writes_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = ConnectionPool(MYSQL_CONFIG, **DB_POOL_CONFIG)
+                pool.warm_up()
+                _pool = pool
+    return _pool
+
+
+def _get_replica_pools():
+    global _replica_pools
+    if _replica_pools is None:
+        with _pool_lock:
+            if _replica_pools is None:
+                pools = []
+                for replica_config in MYSQL_REPLICA_CONFIGS:
+                    pool = ConnectionPool(replica_config, **DB_POOL_CONFIG)
+                    pool.warm_up()
+                    pools.append(pool)
+                _replica_pools = pools
+    return _replica_pools
+
 
 def get_db_connection():
+    """
+    Returns a pooled connection.
+    Inside a Flask request every call returns the same connection,
+    which is released back to the pool when the request ends.
+    """
+    tx_conn = getattr(_local, "tx_conn", None)
+    if tx_conn is not None:
+        return tx_conn
+    if has_request_context():
+        conn = g.get("_db_conn")
+        if conn is None:
+            conn = _get_pool().acquire()
+            conn._request_scoped = True
+            g._db_conn = conn
+        return conn
+    return _get_pool().acquire()
+
+
+def get_pooled_connection():
+    """
+    A pooled connection of its own, never the request's or an open
+    transaction's. For helpers that commit or roll back their own work
+    (caches, write-behind) without touching the caller's transaction;
+    close() returns it to the pool.
+    """
+    return _get_pool().acquire()
+
+
+@contextmanager
+def transaction():
+    """
+    Unit of work: every get_db_connection() call inside the block shares one
+    connection, and the work is committed once at the end or rolled back if
+    the block raises. Nested blocks join the outermost one.
+
+        with transaction() as conn:
+            cursor = conn.cursor()
+            ...
+    """
+    conn = get_db_connection()
+    outermost = conn._tx_depth == 0
+    if outermost:
+        _local.tx_conn = conn
+    conn._tx_depth += 1
     try:
-        conn = mysql.connector.connect(**MYSQL_CONFIG)
+        yield conn
+        if outermost:
+            conn._conn.commit()
+    except Exception:
+        if outermost:
+            conn._conn.rollback()
+        raise
+    finally:
+        conn._tx_depth -= 1
+        if outermost:
+            _local.tx_conn = None
+            if not conn._request_scoped:
+                conn.release()
+
+
+def mark_write(*keys):
+    """
+    Record that the caller just wrote data for these keys (e.g. "candidate:12",
+    "job:7"), so get_read_connection() with the same keys reads from the primary
+    until replicas have had time to catch up. Pins are per process.
+    """
+    if not MYSQL_REPLICA_CONFIGS or DB_READ_YOUR_WRITES_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    until = now + DB_READ_YOUR_WRITES_SECONDS
+    with _recent_writes_lock:
+        for key in keys:
+            _recent_writes[key] = until
+        if len(_recent_writes) > 10000:
+            for key in [k for k, t in _recent_writes.items() if t <= now]:
+                del _recent_writes[key]
+
+
+def _is_pinned(keys):
+    if not keys:
+        return False
+    now = time.monotonic()
+    with _recent_writes_lock:
+        return any(_recent_writes.get(key, 0) > now for key in keys)
+
+
+def _acquire_replica():
+    """Round-robin over replicas, skipping ones that fail; None if all fail."""
+    global _replica_fallbacks
+    pools = _get_replica_pools()
+    start = next(_replica_rotation)
+    for i in range(len(pools)):
+        try:
+            return pools[(start + i) % len(pools)].acquire()
+        except Exception as e:
+            print(f"[DB] replica unavailable, trying next: {e}")
+    _replica_fallbacks += 1
+    return None
+
+
+def get_read_connection(*pin_keys):
+    """
+    Connection for read-only reporting queries (the v_* views).
+    Served by a read replica when MYSQL_REPLICA_HOSTS is configured, falling back
+    to the primary when no replica is reachable. The primary is also used inside
+    an open transaction() and when any of pin_keys was written recently by
+    mark_write() (read your writes).
+    """
+    if not MYSQL_REPLICA_CONFIGS or getattr(_local, "tx_conn", None) is not None or _is_pinned(pin_keys):
+        return get_db_connection()
+
+    if has_request_context():
+        conn = g.get("_db_read_conn")
+        if conn is None:
+            conn = _acquire_replica()
+            if conn is None:
+                return get_db_connection()
+            conn._request_scoped = True
+            g._db_read_conn = conn
         return conn
-    except mysql.connector.Error as err:
-        raise Exception(f"Database connection error: {err}")
 
+    return _acquire_replica() or get_db_connection()
+
+
+def release_db_connection(exception=None):
+    """
+    Teardown hook: give the request's connections back to their pools.
+    Handlers also call it once their database work is done and only slow
+    LLM/TTS work is left; a later get_db_connection() checks out a new one.
+    """
+    if not has_app_context():
+        return
+    for key in ("_db_conn", "_db_read_conn"):
+        conn = g.pop(key, None)
+        if conn is not None:
+            conn.release()
+
+
+def get_pool_stats():
+    if _pool is None:
+        return {"size": 0, "idle": 0, "inUse": 0, "waiting": 0}
+    return _pool.stats()
+
+
+def get_replica_pool_stats():
+    if not _replica_pools:
+        return {"replicas": [], "fallbacksToPrimary": _replica_fallbacks}
+    return {
+        "replicas": [
+            dict(pool.stats(), host=f"{config['host']}:{config['port']}")
+            for pool, config in zip(_replica_pools, MYSQL_REPLICA_CONFIGS)
+        ],
+        "fallbacksToPrimary": _replica_fallbacks,
+    }
+
+
+def init_app(app):
+    """Register request-scoped connection handling and query stats on the Flask app."""
+    app.after_request(attach_request_stats)
+    app.teardown_request(release_db_connection)
@@ -0,0 +1,107 @@
+"""
+EXPLAIN every SQL string in controllers/ and flag full table scans.
+
+Query strings are collected statically (string literals passed around the
+controllers, comments and f-strings are ignored), %s placeholders are replaced
+with a literal, and each SELECT / UPDATE / DELETE is run through EXPLAIN on
+the configured database. Nothing is executed for real.
+
+    python -m database.explain_queries            # report, exit 1 if any full scan
+    python -m database.explain_queries --all      # also print clean plans
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+from database.db_handler import get_db_connection
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTROLLERS_DIR = os.path.join(PROJECT_ROOT, "controllers")
+
+SQL_START_RE = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.I)
+PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+PLACEHOLDER_VALUE = "'1'"
+
+
+def collect_queries(root=CONTROLLERS_DIR):
+    """Return [(relative_path, line, sql)] for every SQL string literal under root."""
+    queries = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    tree = ast.parse(f.read(), filename=path)
+                except SyntaxError:
+                    continue
+            # Literal parts of f-strings are fragments of dynamic SQL, not queries
+            fragments = {
+                id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr) for part in node.values
+            }
+            for node in ast.walk(tree):
+                if id(node) in fragments:
+                    continue
+                if isinstance(node, ast.Constant) and isinstance(node.value, str) and SQL_START_RE.match(node.value):
+                    queries.append((os.path.relpath(path, PROJECT_ROOT), node.lineno, node.value.strip()))
+    queries.sort()
+    return queries
+
+
+def explain(cursor, sql):
+    cursor.execute("EXPLAIN " + PLACEHOLDER_RE.sub(PLACEHOLDER_VALUE, sql))
+    return cursor.fetchall()
+
+
+def find_full_scans(plan):
+    """Plan rows whose access type is ALL (full table scan)."""
+    return [row for row in plan if str(row.get("type") or "").upper() == "ALL"]
+
+
+def format_plan_row(row):
+    return (f"table={row.get('table')} type={row.get('type')} key={row.get('key')} "
+            f"rows={row.get('rows')} extra={row.get('Extra') or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN controller queries and flag full scans.")
+    parser.add_argument("--all", action="store_true", help="print plans for queries without full scans too")
+    args = parser.parse_args(argv)
+
+    queries = collect_queries()
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    flagged, failed = 0, 0
+
+    try:
+        for path, line, sql in queries:
+            one_line = " ".join(sql.split())
+            try:
+                plan = explain(cursor, sql)
+            except Exception as e:
+                failed += 1
+                print(f"ERROR   {path}:{line}  {one_line}\n        {e}")
+                continue
+
+            scans = find_full_scans(plan)
+            if scans:
+                flagged += 1
+                print(f"SCAN    {path}:{line}  {one_line}")
+                for row in scans:
+                    print(f"        {format_plan_row(row)}")
+            elif args.all:
+                print(f"OK      {path}:{line}  {one_line}")
+                for row in plan:
+                    print(f"        {format_plan_row(row)}")
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"\n{len(queries)} queries checked, {flagged} with full scans, {failed} could not be explained.")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
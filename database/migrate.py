@@ -0,0 +1,113 @@
+"""
+Versioned schema migrations.
+
+Each file in database/migrations/ named NNN_description.sql is applied once,
+in order, and recorded in the schema_migrations table.
+
+    python -m database.migrate            # apply pending migrations
+    python -m database.migrate --status   # list applied / pending
+    python -m database.migrate --dry-run  # print pending statements only
+"""
+import os
+import re
+import sys
+import argparse
+import mysql.connector
+from database.db_handler import get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Re-running a partially applied file must not fail on objects that already exist
+ER_DUP_KEYNAME = 1061
+ER_DUP_FIELDNAME = 1060
+ER_TABLE_EXISTS = 1050
+IGNORABLE_ERRORS = {ER_DUP_KEYNAME, ER_DUP_FIELDNAME, ER_TABLE_EXISTS}
+
+
+def list_migrations():
+    """Return [(version, path)] sorted by version."""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.match(r"^(\d+)_.+\.sql$", filename)
+        if match:
+            migrations.append((filename[:-4], os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def split_statements(sql_text):
+    """Split a migration file into statements, dropping '--' comment lines."""
+    lines = [line for line in sql_text.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(128) NOT NULL PRIMARY KEY,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migration(conn, cursor, version, path):
+    with open(path, "r", encoding="utf-8") as f:
+        statements = split_statements(f.read())
+
+    for statement in statements:
+        try:
+            cursor.execute(statement)
+        except mysql.connector.Error as err:
+            if err.errno in IGNORABLE_ERRORS:
+                print(f"  skipped (already present): {err.msg}")
+                continue
+            raise
+
+    cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+    conn.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations.")
+    parser.add_argument("--status", action="store_true", help="show applied and pending migrations")
+    parser.add_argument("--dry-run", action="store_true", help="print pending statements without running them")
+    args = parser.parse_args(argv)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        ensure_migrations_table(cursor)
+        conn.commit()
+        done = applied_versions(cursor)
+        pending = [(v, p) for v, p in list_migrations() if v not in done]
+
+        if args.status:
+            for version, _ in list_migrations():
+                print(f"{'applied' if version in done else 'pending'}  {version}")
+            return 0
+
+        if not pending:
+            print("No pending migrations.")
+            return 0
+
+        for version, path in pending:
+            print(f"Applying {version}")
+            if args.dry_run:
+                with open(path, "r", encoding="utf-8") as f:
+                    for statement in split_statements(f.read()):
+                        print(f"  {statement};")
+                continue
+            apply_migration(conn, cursor, version, path)
+        return 0
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+-- 001: composite indexes for the hot lookups
+-- Applied with: python -m database.migrate
+
+-- match_jobs, applied_job_by_candidate, candidate_details (candidateId + JobId)
+CREATE INDEX ix_jobapplication_candidate_job ON jobapplication (candidateId, JobId);
+
+-- candidate_details and the hiring-manager views filter on JobId alone
+CREATE INDEX ix_jobapplication_job ON jobapplication (JobId);
+
+-- start_assessment / end_interview: latest row for a session, ORDER BY created_at DESC LIMIT 1
+CREATE INDEX ix_session_log_session_candidate_job_created
+    ON assessment_session_log (session_id, candidate_id, job_id, created_at);
+
+-- candidate_get_slots: hiringManagerId = ? AND isBooked = 0 AND date >= ? ORDER BY date, startTime
+CREATE INDEX ix_hm_slots_manager_booked_date
+    ON hiringmanagerselectedslots (hiringManagerId, isBooked, date, startTime);
+
+-- GetAIMCQByJob, evaluate_mcq
+CREATE INDEX ix_jdbasedaimcq_job ON jdbasedaimcq (JobId);
+
+-- evaluate_mcq re-submission and candidate_details answer lookup
+CREATE INDEX ix_assessmentinfo_job_candidate_assessment_q
+    ON assessmentinfo (jobId, candidateId, assessmentId, questionNo);
+
+-- GetByJobAndCandidate, book_candidate_slot, submit_interview_info, candidate_details
+CREATE INDEX ix_jobassessments_job_candidate ON jobassessments (jobId, candidateId);
+
+-- login_candidate, login_hiring_manager, login_recruiter, cv_upload duplicate check
+CREATE INDEX ix_applicationuser_email ON applicationuser (email);
+
+-- candidate_details looks candidates up by email
+CREATE INDEX ix_candidateprofile_email ON candidateprofile (email);
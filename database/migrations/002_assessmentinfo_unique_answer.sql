@@ -0,0 +1,17 @@
+-- 002: one assessmentinfo row per answered question
+-- evaluate_mcq writes all answers with a single INSERT ... ON DUPLICATE KEY UPDATE,
+-- which needs a unique key on (jobId, candidateId, assessmentId, questionNo).
+
+-- Drop duplicate answer rows left by earlier re-submissions, keeping the newest
+DELETE older FROM assessmentinfo older
+JOIN assessmentinfo newer
+  ON older.jobId = newer.jobId
+ AND older.candidateId = newer.candidateId
+ AND older.assessmentId = newer.assessmentId
+ AND older.questionNo = newer.questionNo
+ AND older.id < newer.id;
+
+-- Replace the plain lookup index from 001 with a unique one on the same columns
+ALTER TABLE assessmentinfo
+    DROP INDEX ix_assessmentinfo_job_candidate_assessment_q,
+    ADD UNIQUE KEY uq_assessmentinfo_job_candidate_assessment_q (jobId, candidateId, assessmentId, questionNo);
@@ -0,0 +1,13 @@
+-- 003: persistent cache of LLM match scores (utils/match_cache.py)
+-- One row per (scorer, candidate fingerprint, job fingerprint); fingerprints are
+-- SHA-256 hex digests of the normalized skill lists, so identical skill sets
+-- written differently share a row.
+
+CREATE TABLE IF NOT EXISTS skill_match_cache (
+    scorer VARCHAR(100) NOT NULL,
+    candidate_hash CHAR(64) NOT NULL,
+    job_hash CHAR(64) NOT NULL,
+    score DECIMAL(5,2) NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scorer, candidate_hash, job_hash)
+);
@@ -0,0 +1,6 @@
+-- 004: interview plan stored with the session (INTERVIEW_PLAN_MODE, utils/interview_plan.py)
+-- JSON list of {"stage", "question"} written once when the session is created;
+-- NULL for sessions started without a plan.
+
+ALTER TABLE assessment_session_log
+    ADD COLUMN interview_plan TEXT NULL;
@@ -0,0 +1,17 @@
+-- 005: one row per interview turn (utils/session_turns.py)
+-- start_assessment inserts a row per question and updates it with the answer,
+-- instead of rewriting the whole assessment_session_log.question_answer JSON.
+-- answer is NULL until the candidate has answered. Older sessions keep their
+-- turns in question_answer and are read from there.
+
+CREATE TABLE IF NOT EXISTS assessment_session_turn (
+    id BIGINT NOT NULL AUTO_INCREMENT,
+    session_log_id INT NOT NULL,
+    turn_no INT NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NULL,
+    asked_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    answered_at DATETIME NULL,
+    PRIMARY KEY (id),
+    KEY ix_assessment_session_turn_log (session_log_id, id)
+);
@@ -0,0 +1,6 @@
+-- 006: index for the session expiry sweeper (utils/session_sweeper.py)
+-- Every sweep looks for status = 'active' AND created_at < cutoff; with this
+-- index it reads only the active sessions instead of the whole log.
+
+CREATE INDEX ix_session_log_status_created
+    ON assessment_session_log (status, created_at);
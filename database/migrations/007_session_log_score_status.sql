@@ -0,0 +1,6 @@
+-- 007: background interview scoring (end_interview.score_session)
+-- pending: queued after the interview ended; scoring: a worker has it;
+-- done: score is stored. NULL for sessions scored before this change.
+
+ALTER TABLE assessment_session_log
+    ADD COLUMN score_status VARCHAR(20) NULL;
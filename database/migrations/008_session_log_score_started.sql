@@ -0,0 +1,8 @@
+-- 008: ownership of background scoring claims (end_interview.score_session)
+-- Set when a worker moves score_status to 'scoring'. A claim older than
+-- SCORE_RECOVER_AFTER_SECONDS belongs to a worker that died (restart or
+-- crash) and may be taken over; a worker only stores its score while the
+-- claim is still its own.
+
+ALTER TABLE assessment_session_log
+    ADD COLUMN score_started_at DATETIME NULL;
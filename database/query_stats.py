@@ -0,0 +1,158 @@
+import re
+import time
+import logging
+import threading
+from flask import g, request, has_request_context
+from config import DB_INSTRUMENTATION_CONFIG
+
+slow_query_logger = logging.getLogger("sql.slow")
+query_logger = logging.getLogger("sql.stats")
+
+if DB_INSTRUMENTATION_CONFIG["slow_query_log"]:
+    _handler = logging.FileHandler(DB_INSTRUMENTATION_CONFIG["slow_query_log"], encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(_handler)
+    slow_query_logger.setLevel(logging.INFO)
+
+SLOW_QUERY_MS = DB_INSTRUMENTATION_CONFIG["slow_query_ms"]
+REPEATED_QUERY_WARN = DB_INSTRUMENTATION_CONFIG["repeated_query_warn"]
+MAX_TRACKED_STATEMENTS = 500
+
+
+# -------------------------------
+# Statement normalization
+# -------------------------------
+_COMMENT_RE = re.compile(r"(--[^\n]*|/\*.*?\*/)", re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST_RE = re.compile(r"\(\s*\?(\s*,\s*\?)+\s*\)")
+_MULTI_ROW_RE = re.compile(r"\(\?\+\)(\s*,\s*\(\?\+\))+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(statement):
+    """Collapse a statement to its shape: literals and placeholders become '?'."""
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode("utf-8", "replace")
+    text = _COMMENT_RE.sub(" ", str(statement))
+    text = _STRING_RE.sub("?", text)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(?+)", text)
+    # Multi-row VALUES lists normalize to the same shape regardless of row count
+    text = _MULTI_ROW_RE.sub("(?+)", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+# -------------------------------
+# Process-wide statement totals
+# -------------------------------
+_totals_lock = threading.Lock()
+_statement_totals = {}
+
+
+def _record_total(statement, elapsed_ms):
+    with _totals_lock:
+        entry = _statement_totals.get(statement)
+        if entry is None:
+            if len(_statement_totals) >= MAX_TRACKED_STATEMENTS:
+                return
+            entry = _statement_totals[statement] = {"count": 0, "totalMs": 0.0, "maxMs": 0.0}
+        entry["count"] += 1
+        entry["totalMs"] += elapsed_ms
+        entry["maxMs"] = max(entry["maxMs"], elapsed_ms)
+
+
+def get_statement_stats(limit=10):
+    """Top statements by total time spent, across all requests."""
+    with _totals_lock:
+        items = [dict(v, statement=k) for k, v in _statement_totals.items()]
+    items.sort(key=lambda e: e["totalMs"], reverse=True)
+    for e in items:
+        e["totalMs"] = round(e["totalMs"], 3)
+        e["maxMs"] = round(e["maxMs"], 3)
+        e["avgMs"] = round(e["totalMs"] / e["count"], 3)
+    return items[:limit]
+
+
+# -------------------------------
+# Per-request counters
+# -------------------------------
+def _request_stats():
+    if not has_request_context():
+        return None
+    stats = g.get("_db_query_stats")
+    if stats is None:
+        stats = g._db_query_stats = {"count": 0, "timeMs": 0.0, "statements": {}}
+    return stats
+
+
+def record_query(statement, elapsed, rows):
+    """Account one statement: per-request counters, totals and the slow-query log."""
+    elapsed_ms = elapsed * 1000
+    normalized = normalize_sql(statement)
+
+    stats = _request_stats()
+    if stats is not None:
+        stats["count"] += 1
+        stats["timeMs"] += elapsed_ms
+        stats["statements"][normalized] = stats["statements"].get(normalized, 0) + 1
+
+    _record_total(normalized, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "slow query %.1f ms rows=%s: %s", elapsed_ms, rows if rows is not None and rows >= 0 else "?", normalized
+        )
+
+
+def attach_request_stats(response):
+    """after_request hook: expose query count and DB time, flag N+1 patterns."""
+    stats = g.get("_db_query_stats")
+    if not stats:
+        return response
+
+    response.headers["X-DB-Query-Count"] = str(stats["count"])
+    response.headers["X-DB-Time-Ms"] = f"{stats['timeMs']:.1f}"
+
+    for statement, count in stats["statements"].items():
+        if count >= REPEATED_QUERY_WARN:
+            query_logger.warning(
+                "%s %s ran the same statement %d times (possible N+1): %s",
+                request.method, request.path, count, statement
+            )
+    return response
+
+
+# -------------------------------
+# Cursor wrapper
+# -------------------------------
+class InstrumentedCursor:
+    """Times execute/executemany/callproc on the wrapped cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _timed(self, statement, call):
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            elapsed = time.perf_counter() - start
+            record_query(statement, elapsed, getattr(self._cursor, "rowcount", None))
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._timed(operation, lambda: self._cursor.execute(operation, params, *args, **kwargs))
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._timed(operation, lambda: self._cursor.executemany(operation, seq_params, *args, **kwargs))
+
+    def callproc(self, procname, args=(), *more, **kwargs):
+        return self._timed(f"CALL {procname}()", lambda: self._cursor.callproc(procname, args, *more, **kwargs))
@@ -0,0 +1,51 @@
+import os
+import sys
+
+# Tests import the app packages (database, utils, controllers) from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeCursor:
+    """Records statements; SELECTs from candidateprofile return the test candidate."""
+
+    def __init__(self, db):
+        self.db = db
+        self.lastrowid = None
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.db.statements.append((" ".join(sql.split()), params))
+        self.lastrowid = len(self.db.statements)
+        self.rowcount = 1
+
+    def fetchone(self):
+        sql = self.db.statements[-1][0]
+        return dict(self.db.candidate) if "FROM candidateprofile" in sql else None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
@@ -0,0 +1,52 @@
+import pytest
+from utils import answer_scorer
+from controllers.AssessmentMicroservices import end_interview
+
+ANSWER = ("I studied computer science at Pune University and worked for two years as a backend "
+          "developer, where I built REST APIs in Python and tuned slow SQL queries for our reporting team.")
+
+
+def _session(n):
+    return [{"questionNo": i + 1, "question": "Tell me about your education and experience.", "answer": ANSWER}
+            for i in range(n)]
+
+
+def test_one_answer_is_not_confident():
+    score, confidence = answer_scorer.local_score(_session(1), "Python, SQL")
+    assert 1 <= score <= 100
+    assert confidence < answer_scorer.ANSWER_SCORER_CONFIG["min_confidence"]
+
+
+def test_consistent_answers_are_confident():
+    _, confidence = answer_scorer.local_score(_session(4), "Python, SQL")
+    assert confidence >= answer_scorer.ANSWER_SCORER_CONFIG["min_confidence"]
+
+
+def test_near_empty_session_is_confidently_low():
+    score, confidence = answer_scorer.local_score([{"question": "Why this role?", "answer": "no"}])
+    assert score < 30
+    assert confidence == 1.0
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def fake_mistral_chat(messages, **kwargs):
+        calls.append(messages)
+        return "72"
+
+    monkeypatch.setattr(end_interview, "mistral_chat", fake_mistral_chat)
+    monkeypatch.setitem(answer_scorer.ANSWER_SCORER_CONFIG, "mode", "tiered")
+    return calls
+
+
+def test_tiered_sends_one_answer_session_to_llm(llm_calls):
+    assert end_interview.get_ai_score(_session(1), "Python, SQL") == 72
+    assert len(llm_calls) == 1
+
+
+def test_tiered_scores_consistent_session_locally(llm_calls):
+    score = end_interview.get_ai_score(_session(4), "Python, SQL")
+    assert llm_calls == []
+    assert score == answer_scorer.local_score(_session(4), "Python, SQL")[0]
@@ -0,0 +1,58 @@
+import numpy as np
+from utils import audio_preprocess
+
+RATE = 16000
+
+
+def _tone(freq, seconds, rate=RATE, amplitude=8000):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _rms(samples):
+    return float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+def test_resample_filters_content_above_the_new_nyquist():
+    # 12 kHz at 48 kHz has no place at 16 kHz; without a low-pass it folds to 4 kHz
+    aliased = audio_preprocess.resample(_tone(12000, 1, rate=48000), 48000, 16000)
+    assert len(aliased) == 16000
+    assert _rms(aliased) < 0.01 * _rms(_tone(12000, 1, rate=48000))
+
+
+def test_resample_keeps_speech_band():
+    voice = _tone(440, 1, rate=44100)
+    resampled = audio_preprocess.resample(voice, 44100, 16000)
+    assert len(resampled) == 16000
+    assert abs(_rms(resampled) - _rms(voice)) < 0.05 * _rms(voice)
+
+
+def test_resample_clips_to_int16():
+    loud = np.full(4800, 32767, dtype=np.int16)
+    resampled = audio_preprocess.resample(loud, 48000, 16000)
+    assert resampled.dtype == np.int16
+    assert resampled.max() <= 32767
+
+
+def test_trim_silence_cuts_leading_and_trailing_silence():
+    silence = np.zeros(RATE, dtype=np.int16)
+    trimmed = audio_preprocess.trim_silence(np.concatenate([silence, _tone(300, 1), silence]), RATE)
+    pad = int(RATE * audio_preprocess.AUDIO_CONFIG["padding_ms"] / 1000)
+    assert RATE <= len(trimmed) <= RATE + 2 * pad + 1000
+
+
+def test_trim_silence_keeps_a_steady_level_answer():
+    # Already trimmed by the browser: no silence to take a noise floor from
+    answer = _tone(300, 2, amplitude=1500)
+    assert len(audio_preprocess.trim_silence(answer, RATE)) == len(answer)
+
+
+def test_trim_silence_keeps_speech_with_short_pauses():
+    pause = np.zeros(RATE // 20, dtype=np.int16)
+    answer = np.concatenate([_tone(300, 0.5, amplitude=20000), pause, _tone(300, 1, amplitude=2000)] * 3)
+    assert len(audio_preprocess.trim_silence(answer, RATE)) > 0.9 * len(answer)
+
+
+def test_trim_silence_is_empty_without_speech():
+    noise = (np.random.default_rng(0).normal(0, 20, RATE)).astype(np.int16)
+    assert len(audio_preprocess.trim_silence(noise, RATE)) == 0
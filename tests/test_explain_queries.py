@@ -0,0 +1,29 @@
+from database.explain_queries import collect_queries
+
+
+def _write(tmp_path, source):
+    (tmp_path / "controller.py").write_text(source, encoding="utf-8")
+    return [sql for _, _, sql in collect_queries(str(tmp_path))]
+
+
+def test_collects_plain_sql_literals(tmp_path):
+    queries = _write(tmp_path, '''
+cursor.execute("""
+    SELECT id FROM job WHERE id = %s
+""", (job_id,))
+cursor.execute("UPDATE job SET status = %s WHERE id = %s", (status, job_id))
+''')
+    assert queries == ["SELECT id FROM job WHERE id = %s", "UPDATE job SET status = %s WHERE id = %s"]
+
+
+def test_skips_f_string_fragments(tmp_path):
+    queries = _write(tmp_path, '''
+cursor.execute(f"""
+    UPDATE assessment_session_log
+    SET status = 'completed'
+    WHERE status = %s AND id IN ({placeholders})
+""", ids)
+cursor.execute(f"SELECT id FROM job WHERE id IN ({placeholders})", ids)
+cursor.execute("SELECT id FROM job")
+''')
+    assert queries == ["SELECT id FROM job"]
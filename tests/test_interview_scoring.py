@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from controllers.AssessmentMicroservices import end_interview
+
+
+class ScoringDB:
+    """One assessment_session_log row behind the statements the scoring worker runs."""
+
+    def __init__(self, **row):
+        self.row = dict(dict(id=1, status="ended", score=None, score_status="pending",
+                             ended_at=datetime.now(), score_started_at=None), **row)
+
+    def cursor(self, *args, **kwargs):
+        return ScoringCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ScoringCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self.result = None
+
+    def execute(self, sql, params=()):
+        sql, row = " ".join(sql.split()), self.db.row
+        self.rowcount, self.result = 0, None
+        if sql.startswith("SELECT id, status, score, score_status"):
+            self.result = dict(row)
+        elif sql.startswith("UPDATE assessment_session_log SET score_status = %s, score_started_at = %s"):
+            scoring, claimed_at, _, pending, _, stale_before = params
+            stale = row["score_status"] == "scoring" and (
+                row["score_started_at"] is None or row["score_started_at"] < stale_before)
+            if row["score_status"] == pending or stale:
+                # Like mysql-connector: changed rows, not matched rows
+                self.rowcount = int((row["score_status"], row["score_started_at"]) != (scoring, claimed_at))
+                row.update(score_status=scoring, score_started_at=claimed_at)
+        elif sql.startswith("SELECT l.id, l.question_answer"):
+            self.result = {"id": row["id"], "question_answer": "[]", "skills": "Python"}
+        elif sql.startswith("SELECT question, answer FROM assessment_session_turn"):
+            self.result = [("Tell me about yourself.", "I build data pipelines in Python.")]
+        elif sql.startswith("UPDATE assessment_session_log SET score = %s"):
+            score, done, _, scoring, claimed_at = params
+            if row["score_status"] == scoring and row["score_started_at"] == claimed_at:
+                row.update(score=score, score_status=done)
+                self.rowcount = 1
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def fetchone(self):
+        return self.result
+
+    def fetchall(self):
+        return self.result or []
+
+    def close(self):
+        pass
+
+
+class InlinePool:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+@pytest.fixture
+def scoring(monkeypatch):
+    def setup(**row):
+        db = ScoringDB(**row)
+        monkeypatch.setattr(end_interview, "get_db_connection", lambda: db)
+        monkeypatch.setattr(end_interview, "get_ai_score", lambda question_answer, skills="": 64)
+        monkeypatch.setattr(end_interview, "_score_pool", InlinePool())
+        monkeypatch.setattr(end_interview, "_queued", set())
+        return db
+    return setup
+
+
+def _poll():
+    with Flask(__name__).app_context():
+        response, status = end_interview.get_interview_score(3, 7, "s-1")
+        return response.get_json()["result"]
+
+
+def test_stuck_scoring_row_is_requeued_and_scored(scoring):
+    long_ago = datetime.now() - timedelta(seconds=end_interview.SCORE_RECOVER_AFTER_SECONDS + 60)
+    db = scoring(score_status="scoring", score_started_at=long_ago, ended_at=long_ago)
+
+    assert _poll()["scoreStatus"] == "scoring"
+    assert db.row["score_status"] == "done"
+    assert db.row["score"] == 64
+    result = _poll()
+    assert (result["scoreStatus"], result["score"]) == ("ready", 64)
+
+
+def test_fresh_scoring_claim_is_left_to_its_worker(scoring):
+    started = datetime.now().replace(microsecond=0)
+    db = scoring(score_status="scoring", score_started_at=started)
+
+    end_interview.score_session(1)
+    assert db.row["score_status"] == "scoring"
+    assert db.row["score_started_at"] == started
+
+
+def test_worker_whose_claim_was_taken_over_does_not_store(scoring, monkeypatch):
+    db = scoring()
+
+    def slow_score(question_answer, skills=""):
+        # Meanwhile another worker takes the claim over
+        db.row["score_started_at"] = datetime.now().replace(microsecond=0) + timedelta(seconds=5)
+        return 10
+
+    monkeypatch.setattr(end_interview, "get_ai_score", slow_score)
+    end_interview.score_session(1)
+    assert db.row["score_status"] == "scoring"
+    assert db.row["score"] is None
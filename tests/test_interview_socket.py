@@ -0,0 +1,139 @@
+import json
+import numpy as np
+import pytest
+from flask import Flask
+from controllers.AssessmentMicroservices import interview_socket
+
+
+class FakeSocket:
+    """Hands out the queued client frames, then behaves like a closed connection."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent = []
+
+    def receive(self, timeout=None):
+        if not self.frames:
+            raise interview_socket.ConnectionClosed()
+        return self.frames.pop(0)
+
+    def send(self, data):
+        self.sent.append(json.loads(data) if isinstance(data, str) else data)
+
+
+@pytest.fixture
+def channel(monkeypatch, tmp_path):
+    turns = []
+
+    def fake_run_turn(ws, state, last_answer):
+        turns.append(last_answer)
+        ws.send(json.dumps({"type": "done", "question": f"Question {len(turns)}"}))
+        return True
+
+    monkeypatch.setattr(interview_socket, "run_turn", fake_run_turn)
+    app = Flask(__name__, root_path=str(tmp_path))
+
+    def run(*frames):
+        ws = FakeSocket(frames)
+        with app.test_request_context():
+            interview_socket.interview_channel(ws)
+        return ws.sent, turns
+
+    return run
+
+
+START = json.dumps({"type": "start", "candidateId": 7, "jobId": 3})
+
+
+@pytest.mark.parametrize("frame", ["[]", '"x"', "42", "null", "not json"])
+def test_non_object_messages_get_an_error_and_keep_the_socket(channel, frame):
+    sent, turns = channel(frame, START)
+    assert sent[0]["type"] == "error" and sent[0]["statusCode"] == 400
+    assert sent[1]["type"] == "done"
+    assert turns == [""]
+
+
+@pytest.mark.parametrize("rate", ["abc", 0, -16000, 1000000, 44100.5, True, [16000], "Infinity"])
+def test_bad_sample_rates_are_rejected(channel, rate):
+    bad = json.dumps({"type": "audio_start", "sampleRate": rate})
+    sent, turns = channel(START, bad, json.dumps({"type": "answer", "text": "typed"}))
+    errors = [m for m in sent if m["type"] == "error"]
+    assert len(errors) == 1 and errors[0]["statusCode"] == 400
+    assert "sampleRate" in errors[0]["message"]
+    assert turns == ["", "typed"]
+
+
+def test_infinite_sample_rate_literal_is_rejected(channel):
+    sent, _ = channel(START, '{"type": "audio_start", "sampleRate": Infinity}')
+    assert sent[-1]["type"] == "error" and sent[-1]["statusCode"] == 400
+
+
+def test_valid_sample_rate_accepts_audio(channel):
+    sent, _ = channel(START, json.dumps({"type": "audio_start", "sampleRate": "48000"}), b"\0\0" * 480)
+    assert [m["type"] for m in sent] == ["done"]
+
+
+def test_unexpected_failure_is_reported_and_socket_stays_open(channel, monkeypatch):
+    def broken_feed(self, pcm):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(interview_socket.AnswerStream, "feed", broken_feed)
+    sent, turns = channel(START, json.dumps({"type": "audio_start"}), b"\0\0", json.dumps({"type": "answer", "text": "ok"}))
+    assert [m["type"] for m in sent] == ["done", "error", "done"]
+    assert sent[1]["statusCode"] == 500
+    assert turns == ["", "ok"]
+
+
+def test_answer_stream_transcribes_pieces_cut_at_pauses(monkeypatch):
+    monkeypatch.setattr(interview_socket.stt, "transcribe_samples",
+                        lambda samples, rate, backend=None: f"{len(samples) // rate}s")
+    rate = 48000
+    t = np.arange(2 * rate) / rate
+    speech = (8000 * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+    pause = np.zeros(rate // 2, dtype=np.int16)
+    audio = np.concatenate([speech, pause, speech, pause]).tobytes()
+
+    stream = interview_socket.AnswerStream(rate)
+    # Odd-sized frames: samples split across frames must still line up
+    for i in range(0, len(audio), 4801):
+        stream.feed(audio[i:i + 4801])
+    assert stream.finish() == "2s 2s"
+
+
+def test_socket_turns_read_the_candidate_once(monkeypatch, tmp_path):
+    from conftest import FakeConnection
+    from utils import session_store
+    from controllers.AssessmentMicroservices import start_assessment as sa
+
+    db = FakeConnection({"id": 7, "first_name": "Asha", "skills": "Python", "education": "", "experience": ""})
+    questions = iter(["Tell me about your degree.", "What did you build at work?", "What do you do for fun?"])
+    monkeypatch.setattr(sa, "get_db_connection", lambda: db)
+    monkeypatch.setitem(session_store.SESSION_STORE_CONFIG, "enabled", False)
+    monkeypatch.setattr(sa, "stream_question_sentences", lambda prompt: iter([next(questions)]))
+    monkeypatch.setattr(sa, "synthesize_question_media", lambda text, static_dir: ("/a.mp3", None))
+    monkeypatch.setattr(interview_socket, "WS_SEND_AUDIO", False)
+
+    ws = FakeSocket([START, json.dumps({"type": "answer", "text": "B.Tech in CS."}),
+                     json.dumps({"type": "answer", "text": "A billing service."})])
+    with Flask(__name__, root_path=str(tmp_path)).test_request_context():
+        interview_socket.interview_channel(ws)
+
+    done = [m for m in ws.sent if isinstance(m, dict) and m["type"] == "done"]
+    assert [m["question"] for m in done] == ["Tell me about your degree.", "What did you build at work?",
+                                             "What do you do for fun?"]
+    assert len({m["sessionId"] for m in done}) == 1
+
+    reads = [sql for sql, _ in db.statements if sql.startswith("SELECT")]
+    assert len([sql for sql in reads if "FROM candidateprofile" in sql]) == 1
+    assert not [sql for sql in reads if "FROM assessment_session_log" in sql]
+
+    # Answers land on the open question and new questions get the next turn number
+    writes = [(sql.split()[0], params) for sql, params in db.statements if not sql.startswith("SELECT")]
+    log_id = next(i for i, (sql, _) in enumerate(db.statements, start=1) if "INTO assessment_session_log" in sql)
+    assert writes[1:] == [
+        ("INSERT", (log_id, 1, "Tell me about your degree.")),
+        ("UPDATE", ("B.Tech in CS.", log_id)),
+        ("INSERT", (log_id, 2, "What did you build at work?")),
+        ("UPDATE", ("A billing service.", log_id)),
+        ("INSERT", (log_id, 3, "What do you do for fun?")),
+    ]
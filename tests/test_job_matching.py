@@ -0,0 +1,79 @@
+import pytest
+from flask import Flask
+from controllers.JobServices import get_jobs
+
+JOBS = [
+    {"id": 1, "primarySkills": "Python, Django, SQL", "jd": "Title: Backend Developer\nLocation: Pune"},
+    {"id": 2, "primarySkills": "Photoshop, Illustrator", "jd": "Title: Graphic Designer\nLocation: Mumbai"},
+    {"id": 3, "primarySkills": "Kubernetes, Terraform", "jd": "Title: Platform Engineer\nLocation: Remote"},
+]
+
+
+class MatchingDB:
+    def __init__(self, applications):
+        self.applications = applications
+        self.inserts = []
+
+    def cursor(self, *args, **kwargs):
+        return MatchingCursor(self)
+
+    def commit(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class MatchingCursor:
+    def __init__(self, db):
+        self.db = db
+        self.sql = ""
+
+    def execute(self, sql, params=None):
+        self.sql = " ".join(sql.split())
+        if self.sql.startswith("INSERT INTO jobapplication"):
+            self.db.inserts.append(params)
+
+    def fetchone(self):
+        return {"skills": "Python, SQL, Django"} if "FROM candidateprofile" in self.sql else None
+
+    def fetchall(self):
+        if self.sql.startswith("SELECT id, primarySkills, jd FROM job"):
+            return [dict(job) for job in JOBS]
+        if "FROM jobapplication" in self.sql:
+            return [dict(row) for row in self.db.applications]
+        return []
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("scorer", ["local", "rerank"])
+def test_existing_application_is_listed_when_its_local_score_is_zero(monkeypatch, scorer):
+    # The candidate applied to the design job earlier; their skills share nothing with it now
+    db = MatchingDB([{"JobId": 2, "LatestStatus": "Applied", "jobmatchscore": 35.0}])
+    monkeypatch.setattr(get_jobs, "get_db_connection", lambda: db)
+    monkeypatch.setattr(get_jobs, "JOB_MATCH_SCORER", scorer)
+    monkeypatch.setattr(get_jobs, "llm_score_jobs", lambda candidate_skills, job_skills_list: [0.0] * len(job_skills_list))
+
+    with Flask(__name__).test_request_context():
+        result = get_jobs.match_jobs(7).get_json()["result"]
+
+    by_id = {job["Id"]: job for job in result}
+    assert by_id[2]["status"] == "Applied"
+    assert by_id[2]["match_percentage"] == "35.0%"
+    assert 1 in by_id and 3 not in by_id
+    # Only the new match is inserted; the existing application is left alone
+    assert [params[1] for params in db.inserts] == [1]
+
+
+def test_stored_score_is_used_in_every_mode(monkeypatch):
+    monkeypatch.setattr(get_jobs, "JOB_MATCH_SCORER", "local")
+    # known_scores is keyed by job index: the design job (index 1) was stored at 35
+    scores = get_jobs.score_jobs("Python, SQL, Django", JOBS, known_scores={1: 35.0})
+    assert scores[0] > 0
+    assert scores[1] == 35.0
+    assert scores[2] == 0.0
@@ -0,0 +1,69 @@
+import json
+import pytest
+from flask import Flask
+from conftest import FakeConnection
+from utils import session_store
+from controllers.AssessmentMicroservices import start_assessment as sa
+
+CANDIDATE = {"id": 7, "first_name": "Asha", "skills": "Python, SQL", "education": "B.Tech", "experience": "2 years"}
+
+
+class FakeStreamResponse:
+    """Mistral's streamed chat completion, one SSE line per token chunk."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.encoding = None
+
+    def iter_lines(self, decode_unicode=False):
+        for chunk in self.chunks:
+            yield "data: " + json.dumps({"choices": [{"delta": {"content": chunk}}]})
+        yield "data: [DONE]"
+
+    def close(self):
+        pass
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    db = FakeConnection(CANDIDATE)
+    monkeypatch.setattr(sa, "get_db_connection", lambda: db)
+    monkeypatch.setitem(session_store.SESSION_STORE_CONFIG, "enabled", False)
+    monkeypatch.setattr(sa, "synthesize_question_media",
+                        lambda text, static_dir: (f"/static/audio/{len(text)}.mp3", f"/static/lipsync/{len(text)}.json"))
+    monkeypatch.setattr(sa, "mistral_chat", lambda prompt, **kwargs: FakeStreamResponse(
+        ["Hi Asha, welcome. ", "Could you tell me ", "about your degree?"]))
+
+    app = Flask(__name__, root_path=str(tmp_path))
+    app.add_url_rule("/assessment/start", view_func=sa.start_assessment, methods=["POST"])
+    client = app.test_client()
+    client.db = db
+    return client
+
+
+def test_streamed_turn_sends_question_end_to_end(client):
+    response = client.post("/assessment/start", json={"candidateId": 7, "jobId": 3, "stream": True})
+    assert response.mimetype == "text/event-stream"
+    events = _events(response.get_data(as_text=True))
+
+    assert [name for name, _ in events] == ["session", "audio", "audio", "done"]
+    session_id = events[0][1]["sessionId"]
+    done = events[-1][1]
+    assert done["question"] == "Hi Asha, welcome. Could you tell me about your degree?"
+    assert done["sessionId"] == session_id
+    assert [s["text"] for s in done["segments"]] == ["Hi Asha, welcome.", "Could you tell me about your degree?"]
+    assert done["audioUrl"] == events[1][1]["audioUrl"]
+
+    # The new session and its first question were saved
+    inserts = [params for sql, params in client.db.statements if sql.startswith("INSERT")]
+    assert inserts[0][2] == session_id
+    assert inserts[-1][-1] == done["question"]
+    assert client.db.commits == 1
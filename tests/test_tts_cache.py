@@ -0,0 +1,50 @@
+import os
+import pytest
+from utils import tts, lipsync
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    audio_dir, lipsync_dir = tmp_path / "audio", tmp_path / "lipsync"
+    audio_dir.mkdir()
+
+    def fake_synthesize(text, output_path, voice=None, timeout=None):
+        with open(output_path, "wb") as f:
+            f.write(b"\0" * 1000)
+
+    monkeypatch.setattr(tts, "synthesize", fake_synthesize)
+    monkeypatch.setattr(lipsync, "lipsync_json", lambda text, audio_path, audio_name: {"text": "x" * 500})
+    monkeypatch.setitem(tts.TTS_CONFIG, "cache_max_bytes", 4000)
+    monkeypatch.setattr(tts, "_cache_indexes", {})
+    return str(audio_dir), str(lipsync_dir)
+
+
+def _turn(audio_dir, lipsync_dir, text):
+    name = tts.cached_audio(text, audio_dir)
+    return name, lipsync.cached_lipsync(text, os.path.join(audio_dir, name), lipsync_dir)
+
+
+def test_lipsync_json_is_evicted_with_its_audio(cache):
+    audio_dir, lipsync_dir = cache
+    first_audio, first_json = _turn(audio_dir, lipsync_dir, "First question.")
+    for i in range(5):
+        _turn(audio_dir, lipsync_dir, f"Question number {i}.")
+
+    assert not os.path.exists(os.path.join(audio_dir, first_audio))
+    assert not os.path.exists(os.path.join(lipsync_dir, first_json))
+
+    audio_bytes = sum(os.path.getsize(os.path.join(audio_dir, n)) for n in os.listdir(audio_dir))
+    json_bytes = sum(os.path.getsize(os.path.join(lipsync_dir, n)) for n in os.listdir(lipsync_dir))
+    assert audio_bytes + json_bytes <= tts.TTS_CONFIG["cache_max_bytes"]
+    assert len(os.listdir(lipsync_dir)) == len(os.listdir(audio_dir))
+
+
+def test_orphaned_lipsync_json_is_removed_on_first_use(cache):
+    audio_dir, lipsync_dir = cache
+    os.makedirs(lipsync_dir)
+    orphan = os.path.join(lipsync_dir, tts.CACHE_PREFIX + "gone.json")
+    with open(orphan, "w") as f:
+        f.write("{}")
+
+    _turn(audio_dir, lipsync_dir, "Hello there.")
+    assert not os.path.exists(orphan)
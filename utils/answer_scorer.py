@@ -0,0 +1,177 @@
+import os
+import re
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from utils.skill_match import parse_skills, normalize_skill
+
+load_dotenv()
+
+ANSWER_SCORER_CONFIG = {
+    # local:  score every session from the answer features, never call the LLM
+    # tiered: use the local score when its confidence is high enough, else the LLM
+    # llm:    always ask the LLM (the local score is only the fallback)
+    'mode': os.getenv('ANSWER_SCORER_MODE', 'tiered').lower(),
+    # Below this confidence (0-1) a tiered score goes to the LLM
+    'min_confidence': float(os.getenv('ANSWER_SCORER_MIN_CONFIDENCE', 0.6)),
+}
+
+STAGES = ("Education", "Experience", "Skills", "Technical", "Hobbies/Personality")
+
+# Words that mark a turn as belonging to a stage (question or answer)
+STAGE_KEYWORDS = {
+    "Education": {"study", "studied", "studies", "degree", "college", "university", "school", "course",
+                  "courses", "subject", "subjects", "graduate", "graduated", "graduation", "education",
+                  "bachelor", "master", "semester", "campus", "professor", "academic"},
+    "Experience": {"experience", "worked", "work", "working", "job", "role", "company", "team", "internship",
+                   "intern", "project", "projects", "responsible", "responsibilities", "client", "clients",
+                   "manager", "organization", "years"},
+    "Skills": {"skill", "skills", "proficient", "learned", "learn", "strength", "strengths", "tools",
+               "expertise", "good", "comfortable", "familiar", "improve", "communication", "leadership"},
+    "Technical": {"design", "architecture", "database", "api", "code", "coding", "debug", "debugging",
+                  "performance", "algorithm", "system", "systems", "framework", "deploy", "deployment",
+                  "testing", "scalable", "data", "model", "server", "cloud", "security", "technical"},
+    "Hobbies/Personality": {"hobby", "hobbies", "free", "weekend", "enjoy", "enjoyed", "passion", "fun",
+                            "reading", "music", "sports", "travel", "personality", "motivates", "motivation",
+                            "relax", "interests", "spare"},
+}
+
+FILLER_WORDS = {"um", "uh", "umm", "uhh", "hmm", "er", "ah", "like", "basically", "actually", "literally",
+                "okay", "ok", "so", "yeah", "know", "mean", "kind", "sort", "just", "stuff", "things"}
+
+STOP_WORDS = {"a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "for", "with", "about",
+              "is", "are", "was", "were", "be", "been", "do", "did", "does", "you", "your", "yours", "me",
+              "my", "i", "we", "our", "it", "its", "this", "that", "these", "those", "what", "which", "how",
+              "why", "when", "where", "who", "can", "could", "would", "will", "tell", "share", "any", "some",
+              "there", "their", "they", "them", "have", "has", "had", "from", "as", "by", "if", "more"}
+
+# Per-answer feature weights (columns of answer_features); they sum to 1
+FEATURE_WEIGHTS = np.array([
+    0.35,  # length, saturating at LENGTH_TARGET_WORDS
+    0.20,  # share of the question's content words picked up in the answer
+    0.15,  # candidate skills mentioned
+    0.15,  # lexical diversity (distinct / total words)
+    0.15,  # 1 - filler ratio
+])
+LENGTH_TARGET_WORDS = 40
+# Diversity and filler ratio only count fully from this many words on ("no" is not a diverse answer)
+SUBSTANCE_WORDS = 10
+# Question overlap is full once this many of its content words come back
+QUESTION_TARGET_HITS = 3
+SKILL_TARGET_MENTIONS = 2
+
+# Maps the 0-1 session quality onto the LLM prompt's bands (41-60 average, 61-80 good, ...)
+SCORE_FLOOR, SCORE_CEILING = 10, 95
+
+_WORD_RE = re.compile(r"[a-z0-9+#.']+")
+
+_stats_lock = threading.Lock()
+_stats = {"local": 0, "llm": 0, "fallback": 0}
+
+
+def tokenize(text):
+    return [w.strip(".'") for w in _WORD_RE.findall((text or "").lower()) if w.strip(".'")]
+
+
+def stem(word):
+    """Crude suffix stripping so 'studied' matches 'study' and 'projects' matches 'project'."""
+    for suffix, replacement in (("ies", "y"), ("ied", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def _answered_turns(question_answer):
+    """[(question, answer)] with a non-empty answer, from the list or legacy dict shape."""
+    if isinstance(question_answer, dict):
+        pairs = [("", str(v)) for v in question_answer.values()]
+    else:
+        pairs = []
+        for qa in question_answer or []:
+            if isinstance(qa, dict):
+                pairs.append((qa.get("question") or "", qa.get("answer") or ""))
+            elif isinstance(qa, str):
+                pairs.append(("", qa))
+    return [(q, a.strip()) for q, a in pairs if a and a.strip()]
+
+
+def answer_features(turns, skills_text=""):
+    """
+    (n_answers, 5) feature matrix in [0, 1]: length, question overlap, skill
+    mentions, lexical diversity, 1 - filler ratio. See FEATURE_WEIGHTS.
+    """
+    skills = set(parse_skills(skills_text or ""))
+    counts = np.zeros((len(turns), 6))  # words, distinct, fillers, q_content, q_hits, skill_hits
+    for i, (question, answer) in enumerate(turns):
+        words = tokenize(answer)
+        answer_set = {stem(w) for w in words}
+        q_content = {stem(w) for w in tokenize(question) if w not in STOP_WORDS}
+        # Skills are matched on normalized single words and joined word pairs ("machine learning")
+        candidates = {normalize_skill(w) for w in words}
+        candidates |= {normalize_skill(a + b) for a, b in zip(words, words[1:])}
+        counts[i] = (
+            len(words),
+            len(set(words)),
+            sum(1 for w in words if w in FILLER_WORDS),
+            len(q_content),
+            len(q_content & answer_set),
+            len(skills & candidates),
+        )
+
+    words, distinct, fillers, q_content, q_hits, skill_hits = counts.T
+    safe_words = np.maximum(words, 1)
+    substance = np.minimum(words / SUBSTANCE_WORDS, 1.0)
+    return np.column_stack([
+        np.minimum(words / LENGTH_TARGET_WORDS, 1.0),
+        np.where(q_content > 0, np.minimum(q_hits / np.minimum(np.maximum(q_content, 1), QUESTION_TARGET_HITS), 1.0), 0.5),
+        np.minimum(skill_hits / SKILL_TARGET_MENTIONS, 1.0) if skills else np.full(len(turns), 0.5),
+        substance * distinct / safe_words,
+        substance * (1.0 - fillers / safe_words),
+    ])
+
+
+def stage_coverage(question_answer):
+    """Share of the five interview stages touched by any question or answer."""
+    text = " ".join(f"{q} {a}" for q, a in _answered_turns(question_answer))
+    words = set(tokenize(text))
+    return sum(1 for stage in STAGES if words & STAGE_KEYWORDS[stage]) / len(STAGES)
+
+
+def local_score(question_answer, skills_text=""):
+    """
+    (score 1-100, confidence 0-1) from the answers alone, deterministic.
+    Confidence grows with the number of answers and with how consistent
+    their quality is; consistency only counts in proportion to the number of
+    answers (one answer is trivially consistent). Near-empty sessions are
+    confidently low.
+    """
+    turns = _answered_turns(question_answer)
+    if not turns:
+        return 0, 1.0
+
+    features = answer_features(turns, skills_text)
+    quality = features @ FEATURE_WEIGHTS
+    coverage = stage_coverage(question_answer)
+    session_quality = float(quality.mean()) * (0.8 + 0.2 * coverage)
+    score = int(round(SCORE_FLOOR + (SCORE_CEILING - SCORE_FLOOR) * min(max(session_quality, 0.0), 1.0)))
+
+    mean_words = float(features[:, 0].mean()) * LENGTH_TARGET_WORDS
+    if mean_words < 5:
+        return score, 1.0
+    evidence = min(len(turns) / 4, 1.0)
+    consistency = max(0.0, 1.0 - 2 * float(quality.std()))
+    confidence = 0.5 * evidence + 0.5 * evidence * consistency
+    return score, round(confidence, 3)
+
+
+def record(tier):
+    with _stats_lock:
+        _stats[tier] += 1
+
+
+def get_answer_scorer_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["mode"] = ANSWER_SCORER_CONFIG['mode']
+    stats["minConfidence"] = ANSWER_SCORER_CONFIG['min_confidence']
+    return stats
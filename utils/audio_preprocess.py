@@ -0,0 +1,178 @@
+import io
+import os
+import math
+import numpy as np
+from scipy import signal
+import speech_recognition as sr
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AUDIO_CONFIG = {
+    # Rate the recognizers get; 16 kHz is what Sphinx models and Google's speech models expect
+    'target_rate': int(os.getenv('STT_TARGET_RATE', 16000)),
+    # Energy VAD: 30 ms frames, speech when RMS is this many times the noise floor
+    'frame_ms': int(os.getenv('STT_VAD_FRAME_MS', 30)),
+    'energy_ratio': float(os.getenv('STT_VAD_ENERGY_RATIO', 3.0)),
+    # RMS (int16 scale) below which a frame is always silence...
+    'min_energy': float(os.getenv('STT_VAD_MIN_ENERGY', 150)),
+    # ...and above which it is always speech, however loud the "noise floor" is
+    'max_energy': float(os.getenv('STT_VAD_MAX_ENERGY', 600)),
+    # Silence kept before the first and after the last speech frame
+    'padding_ms': int(os.getenv('STT_VAD_PADDING_MS', 200)),
+    # Segmenting long answers: cut in pauses at least this long...
+    'split_min_silence_ms': int(os.getenv('STT_SPLIT_MIN_SILENCE_MS', 400)),
+    # ...aiming for segments no longer than this, and never shorter than the minimum
+    'split_max_segment_s': float(os.getenv('STT_SPLIT_MAX_SEGMENT_S', 15)),
+    'split_min_segment_s': float(os.getenv('STT_SPLIT_MIN_SEGMENT_S', 2)),
+}
+
+SAMPLE_WIDTH = 2  # int16
+
+
+def decode_upload(upload):
+    """
+    Decode an uploaded WAV/AIFF/FLAC answer from memory.
+    upload is a werkzeug FileStorage, a file-like object or bytes.
+    Returns (mono int16 samples, sample_rate).
+    """
+    data = upload if isinstance(upload, (bytes, bytearray)) else upload.read()
+    with sr.AudioFile(io.BytesIO(data)) as source:
+        # AudioFile already downmixes to mono
+        audio = sr.Recognizer().record(source)
+    raw = audio.get_raw_data(convert_width=SAMPLE_WIDTH)
+    return np.frombuffer(raw, dtype=np.int16), audio.sample_rate
+
+
+def resample(samples, src_rate, dst_rate):
+    """
+    Polyphase resample of int16 samples. The FIR low-pass removes everything
+    above the new Nyquist frequency first, so 44.1/48 kHz browser audio does
+    not fold its upper band back into the speech band.
+    """
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    g = math.gcd(int(src_rate), int(dst_rate))
+    resampled = signal.resample_poly(samples.astype(np.float32), int(dst_rate) // g, int(src_rate) // g)
+    return np.clip(np.round(resampled), -32768, 32767).astype(np.int16)
+
+
+def frame_energies(samples, rate, frame_ms=None):
+    """RMS energy of consecutive frame_ms frames (the last partial frame is dropped)."""
+    frame_len = max(1, int(rate * (frame_ms or AUDIO_CONFIG['frame_ms']) / 1000))
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.zeros(0), frame_len
+    frames = samples[:n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames ** 2, axis=1)), frame_len
+
+
+def speech_mask(energies):
+    """
+    Boolean per frame: True where the frame is louder than the adaptive threshold.
+    The noise floor is the 10th percentile frame, which is only silence if the
+    clip has some. When nothing is energy_ratio times louder than it (a steady
+    level, or audio the browser already trimmed) only min_energy applies.
+    """
+    if len(energies) == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = np.percentile(energies, 10)
+    if np.percentile(energies, 90) < noise_floor * AUDIO_CONFIG['energy_ratio']:
+        return energies > AUDIO_CONFIG['min_energy']
+    threshold = min(noise_floor * AUDIO_CONFIG['energy_ratio'], AUDIO_CONFIG['max_energy'])
+    return energies > max(AUDIO_CONFIG['min_energy'], threshold)
+
+
+def trim_silence(samples, rate):
+    """Cut leading and trailing silence, keeping padding_ms around speech; empty if no speech."""
+    energies, frame_len = frame_energies(samples, rate)
+    speech = np.flatnonzero(speech_mask(energies))
+    if len(speech) == 0:
+        return samples[:0]
+    pad = int(rate * AUDIO_CONFIG['padding_ms'] / 1000)
+    start = max(0, speech[0] * frame_len - pad)
+    end = min(len(samples), (speech[-1] + 1) * frame_len + pad)
+    return samples[start:end]
+
+
+def split_on_silence(samples, rate):
+    """
+    Sample ranges [(start, end)] covering samples, cut in the middle of pauses.
+    Segments over split_max_segment_s are cut at their quietest frame; pieces
+    under split_min_segment_s are merged into the previous segment.
+    """
+    max_len = int(AUDIO_CONFIG['split_max_segment_s'] * rate)
+    if len(samples) <= max_len:
+        return [(0, len(samples))]
+
+    energies, frame_len = frame_energies(samples, rate)
+    speech = speech_mask(energies)
+    min_silence = max(1, AUDIO_CONFIG['split_min_silence_ms'] // AUDIO_CONFIG['frame_ms'])
+
+    # Candidate cut points: middle of every long enough run of silent frames
+    cuts, run_start = [], None
+    for i, is_speech in enumerate(np.append(speech, True)):
+        if not is_speech and run_start is None:
+            run_start = i
+        elif is_speech and run_start is not None:
+            if i - run_start >= min_silence:
+                cuts.append(((run_start + i) // 2) * frame_len)
+            run_start = None
+
+    bounds = [0] + [c for c in cuts if 0 < c < len(samples)] + [len(samples)]
+
+    # Force cuts inside segments that are still too long
+    forced = [0]
+    for start, end in zip(bounds, bounds[1:]):
+        while end - start > max_len:
+            first, last = (start + max_len // 2) // frame_len, (start + max_len) // frame_len
+            quietest = first + int(np.argmin(energies[first:last])) if last > first else last
+            cut = quietest * frame_len
+            forced.append(cut)
+            start = cut
+        forced.append(end)
+
+    min_len = int(AUDIO_CONFIG['split_min_segment_s'] * rate)
+    segments = []
+    for start, end in zip(forced, forced[1:]):
+        if segments and (end - start < min_len or segments[-1][1] - segments[-1][0] < min_len):
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return segments
+
+
+def last_pause(samples, rate):
+    """
+    Sample index in the middle of the last pause of at least
+    split_min_silence_ms that follows some speech, or None. Used to cut
+    live microphone audio between words.
+    """
+    energies, frame_len = frame_energies(samples, rate)
+    speech = speech_mask(energies)
+    min_silence = max(1, AUDIO_CONFIG['split_min_silence_ms'] // AUDIO_CONFIG['frame_ms'])
+
+    end = len(speech)
+    while end > 0:
+        # Walk back over one run of silence, then check it is long enough and has speech before it
+        start = end
+        while start > 0 and not speech[start - 1]:
+            start -= 1
+        if end - start >= min_silence and start > 0:
+            return ((start + end) // 2) * frame_len
+        while start > 0 and speech[start - 1]:
+            start -= 1
+        end = start
+    return None
+
+
+def to_audio_data(samples, rate):
+    return sr.AudioData(np.ascontiguousarray(samples, dtype=np.int16).tobytes(), rate, SAMPLE_WIDTH)
+
+
+def preprocess_samples(upload):
+    """Decoded, resampled and trimmed int16 samples plus their rate."""
+    samples, rate = decode_upload(upload)
+    target_rate = AUDIO_CONFIG['target_rate']
+    samples = resample(samples, rate, target_rate)
+    return trim_silence(samples, target_rate), target_rate
@@ -0,0 +1,111 @@
+import os
+import re
+import json
+from dotenv import load_dotenv
+from utils.llm_client import mistral_chat, LLMError
+
+load_dotenv()
+
+PLAN_CONFIG = {
+    # off:      every turn asks Mistral for the next question (full prompt)
+    # followup: the plan is made once per session; later turns send a short
+    #           prompt that adapts the next planned question to the last answer
+    # scripted: the plan is made once per session; later turns ask the planned
+    #           questions as they are, without any LLM call
+    'mode': os.getenv('INTERVIEW_PLAN_MODE', 'off').lower(),
+    'questions_per_stage': int(os.getenv('INTERVIEW_PLAN_QUESTIONS_PER_STAGE', 2)),
+}
+
+STAGES = ("Education", "Experience", "Skills", "Technical", "Hobbies/Personality")
+
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def enabled():
+    return PLAN_CONFIG['mode'] in ("followup", "scripted")
+
+
+def plan_prompt(candidate):
+    per_stage = max(1, PLAN_CONFIG['questions_per_stage'])
+    return f"""
+You are a friendly HR interviewer preparing a short structured job interview.
+
+Candidate Info:
+Name: {candidate.get('first_name')}
+Education: {candidate.get('education', '')}
+Experience: {candidate.get('experience', '')}
+Skills: {candidate.get('skills', '')}
+
+Write {per_stage} questions for each stage, in this order: {" → ".join(STAGES)}.
+- The first question greets the candidate by name (e.g., "Hi, I’m Subho, from your recruitment team — nice to meet you, {candidate.get('first_name')}!") and then asks about their education.
+- Each question is 1–2 short sentences, friendly, professional and conversational, and asks exactly ONE thing.
+- **Do NOT mention grades, marks, percentages, CGPA, GPA, or scores.**
+- Do not use abbreviations or expansions in parentheses; when discussing technologies, focus on types or roles, not specific names.
+
+Reply with JSON only, no other text:
+{{"questions": [{{"stage": "Education", "question": "..."}}]}}
+""".strip()
+
+
+def parse_plan(text):
+    """[{"stage", "question"}] from the model's reply, or None if it holds no usable plan."""
+    match = _JSON_OBJECT_RE.search(text or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    questions = data.get("questions") if isinstance(data, dict) else None
+    if not isinstance(questions, list):
+        return None
+    plan = [
+        {"stage": str(q.get("stage") or ""), "question": q["question"].strip()}
+        for q in questions
+        if isinstance(q, dict) and isinstance(q.get("question"), str) and q["question"].strip()
+    ]
+    return plan or None
+
+
+def generate_plan(candidate):
+    """Ask Mistral once for the whole interview; None when the call or its JSON fails."""
+    try:
+        reply = mistral_chat(plan_prompt(candidate), temperature=0.7, cache=False)
+    except LLMError as e:
+        print(f"[PLAN] Interview plan generation failed: {e}")
+        return None
+    plan = parse_plan(reply)
+    if plan is None:
+        print("[PLAN] Model did not return a valid interview plan.")
+    return plan
+
+
+def dump_plan(plan):
+    """Column value for a plan; load_plan() reads it back."""
+    return json.dumps({"questions": plan})
+
+
+def load_plan(session_row):
+    """The plan stored with a session log row, or None."""
+    raw = (session_row or {}).get("interview_plan")
+    if not raw:
+        return None
+    return parse_plan(raw if isinstance(raw, str) else json.dumps(raw))
+
+
+def planned_question(plan, asked):
+    """The plan entry for the next question, given how many were already asked; None past the end."""
+    if plan and 0 <= asked < len(plan):
+        return plan[asked]
+    return None
+
+
+def followup_prompt(candidate, last_answer, planned):
+    return f"""
+You are a friendly HR interviewer. Candidate: {candidate.get('first_name')}.
+They just answered: "{last_answer}"
+Next planned question ({planned['stage']}): "{planned['question']}"
+
+Ask the planned question in 1–2 short sentences, briefly acknowledging their answer if it fits.
+Ask exactly ONE question, do not mention grades or scores, and output only the question text.
+""".strip()
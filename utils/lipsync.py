@@ -0,0 +1,159 @@
+import os
+import re
+import json
+import uuid
+import threading
+from dotenv import load_dotenv
+from utils import tts
+
+load_dotenv()
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CMUDICT_PATH = os.getenv('LIPSYNC_CMUDICT', os.path.join(PROJECT_ROOT, 'apps', 'res', 'sphinx', 'cmudict-en-us.dict'))
+
+# edge_tts writes audio-24khz-48kbitrate-mono-mp3, so duration = bytes * 8 / bitrate
+TTS_MP3_BITRATE = int(os.getenv('TTS_MP3_BITRATE', 48000))
+
+# Rhubarb mouth shapes (https://github.com/DanielSWolf/rhubarb-lip-sync#mouth-shapes)
+#   A closed (P B M)          B slightly open, clenched   C open (EH AE)
+#   D wide open (AA)          E rounded (AO ER)           F puckered (UW OW W)
+#   G teeth on lip (F V)      H tongue up (L)             X idle / rest
+PHONEME_SHAPES = {
+    "P": "A", "B": "A", "M": "A",
+    "F": "G", "V": "G",
+    "L": "H",
+    "UW": "F", "OW": "F", "W": "F", "OY": "F",
+    "AO": "E", "ER": "E", "UH": "E",
+    "AA": "D", "AW": "D", "AY": "D",
+    "AE": "C", "EH": "C", "EY": "C", "AH": "C",
+    "IY": "B", "IH": "B", "Y": "B",
+}
+DEFAULT_SHAPE = "B"  # remaining consonants: K G T D N S Z SH ZH CH JH TH DH NG HH R
+
+VOWELS = {"AA", "AE", "AH", "AO", "AW", "AY", "EH", "ER", "EY", "IH", "IY", "OW", "OY", "UH", "UW"}
+
+# Relative durations: vowels are held longer than consonants, punctuation is a rest
+PHONEME_WEIGHT = {"vowel": 1.6, "consonant": 1.0}
+PAUSE_WEIGHT = {",": 2.0, ";": 2.5, ":": 2.5, ".": 3.5, "!": 3.5, "?": 3.5}
+EDGE_SILENCE_SECONDS = 0.05
+
+# Rough spelling fallback for words missing from the dictionary
+LETTER_PHONEMES = {
+    "a": ["AE"], "b": ["B"], "c": ["K"], "d": ["D"], "e": ["EH"], "f": ["F"], "g": ["G"],
+    "h": ["HH"], "i": ["IH"], "j": ["JH"], "k": ["K"], "l": ["L"], "m": ["M"], "n": ["N"],
+    "o": ["OW"], "p": ["P"], "q": ["K"], "r": ["R"], "s": ["S"], "t": ["T"], "u": ["AH"],
+    "v": ["V"], "w": ["W"], "x": ["K", "S"], "y": ["Y"], "z": ["Z"],
+}
+DIGIT_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+_TOKEN_RE = re.compile(r"[A-Za-z']+|\d|[,;:.!?]")
+
+_dictionary = None
+_dictionary_lock = threading.Lock()
+
+
+def _load_dictionary():
+    """word -> phonemes (first pronunciation, stress markers dropped), loaded once."""
+    global _dictionary
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                entries = {}
+                with open(CMUDICT_PATH, "r", encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.split()
+                        # Alternate pronunciations look like "hello(2)"; keep the first
+                        if len(parts) < 2 or "(" in parts[0]:
+                            continue
+                        entries[parts[0]] = [re.sub(r"\d", "", p) for p in parts[1:]]
+                _dictionary = entries
+    return _dictionary
+
+
+def word_phonemes(word):
+    word = word.lower().strip("'")
+    if not word:
+        return []
+    phonemes = _load_dictionary().get(word)
+    if phonemes is not None:
+        return phonemes
+    return [p for letter in word for p in LETTER_PHONEMES.get(letter, [])]
+
+
+def text_units(text):
+    """[(shape, weight)] for the text: one unit per phoneme and one rest per punctuation mark."""
+    units = []
+    for token in _TOKEN_RE.findall(text):
+        if token in PAUSE_WEIGHT:
+            units.append(("X", PAUSE_WEIGHT[token]))
+            continue
+        words = [DIGIT_WORDS[int(token)]] if token.isdigit() else [token]
+        for word in words:
+            for phoneme in word_phonemes(word):
+                kind = "vowel" if phoneme in VOWELS else "consonant"
+                units.append((PHONEME_SHAPES.get(phoneme, DEFAULT_SHAPE), PHONEME_WEIGHT[kind]))
+    return units
+
+
+def mp3_duration(audio_path):
+    """Duration in seconds of a constant-bitrate TTS MP3."""
+    return os.path.getsize(audio_path) * 8 / TTS_MP3_BITRATE
+
+
+def build_mouth_cues(text, duration):
+    """Rhubarb-style mouthCues spread over duration seconds, identical consecutive shapes merged."""
+    units = text_units(text)
+    edge = min(EDGE_SILENCE_SECONDS, duration / 4)
+    speech_time = max(0.0, duration - 2 * edge)
+    total_weight = sum(weight for _, weight in units)
+
+    cues = []
+
+    def add(shape, start, end):
+        if end - start <= 0:
+            return
+        if cues and cues[-1]["value"] == shape:
+            cues[-1]["end"] = end
+        else:
+            cues.append({"start": start, "end": end, "value": shape})
+
+    add("X", 0.0, edge)
+    t = edge
+    for shape, weight in units:
+        step = speech_time * weight / total_weight if total_weight else 0.0
+        add(shape, t, t + step)
+        t += step
+    add("X", t, duration)
+
+    for cue in cues:
+        cue["start"] = round(cue["start"], 2)
+        cue["end"] = round(cue["end"], 2)
+    return [c for c in cues if c["end"] > c["start"]]
+
+
+def lipsync_json(text, audio_path, sound_file=None):
+    duration = mp3_duration(audio_path)
+    return {
+        "metadata": {"soundFile": sound_file or audio_path, "duration": round(duration, 2)},
+        "mouthCues": build_mouth_cues(text, duration),
+    }
+
+
+def cached_lipsync(text, audio_path, lipsync_dir):
+    """
+    File name of the lip-sync JSON for text spoken in audio_path, written to
+    lipsync_dir on first use. Named after the content-addressed audio file,
+    so identical text reuses the same JSON. The file belongs to the audio's
+    cache entry: it counts toward the TTS byte cap and is evicted with it.
+    """
+    audio_name = os.path.basename(audio_path)
+    name = os.path.splitext(audio_name)[0] + ".json"
+    path = os.path.join(lipsync_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(lipsync_dir, exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(lipsync_json(text, audio_path, audio_name), f)
+        os.replace(tmp_path, path)
+    tts.track_companion(audio_path, path)
+    return name
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_CONFIG = {
+    # Set LLM_CACHE_ENABLED=false to send every prompt to the provider
+    'enabled': os.getenv('LLM_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no'),
+    # Seconds a cached reply stays valid
+    'ttl': float(os.getenv('LLM_CACHE_TTL', 24 * 3600)),
+    # Least recently used replies are dropped beyond either limit
+    'max_entries': int(os.getenv('LLM_CACHE_MAX_ENTRIES', 2000)),
+    'max_bytes': int(os.getenv('LLM_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+}
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (expires_at, value, size)
+_bytes = 0
+_in_flight = {}  # key -> _Flight
+_stats = {"hits": 0, "misses": 0, "sharedInFlight": 0, "evictions": 0, "expired": 0}
+
+
+class _Flight:
+    """One in-progress call that concurrent identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def make_key(provider, model, temperature, prompt, **params):
+    """Content address of a request: provider, model, temperature, prompt and any extra params."""
+    material = json.dumps(
+        {"provider": provider, "model": model, "temperature": temperature, "prompt": prompt, "params": params},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _lookup_locked(key, now):
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, value, _ = entry
+    if expires_at <= now:
+        _drop_locked(key)
+        _stats["expired"] += 1
+        return None
+    _entries.move_to_end(key)
+    return value
+
+
+def _drop_locked(key):
+    global _bytes
+    _, _, size = _entries.pop(key)
+    _bytes -= size
+
+
+def _store_locked(key, value, now):
+    global _bytes
+    size = len(value.encode("utf-8"))
+    if size > LLM_CACHE_CONFIG['max_bytes']:
+        return
+    if key in _entries:
+        _drop_locked(key)
+    _entries[key] = (now + LLM_CACHE_CONFIG['ttl'], value, size)
+    _bytes += size
+    while len(_entries) > LLM_CACHE_CONFIG['max_entries'] or _bytes > LLM_CACHE_CONFIG['max_bytes']:
+        oldest = next(iter(_entries))
+        _drop_locked(oldest)
+        _stats["evictions"] += 1
+
+
+def cached_call(key, call):
+    """
+    Return the cached reply for key, or run call() once and cache a non-empty result.
+    Concurrent callers with the same key wait for the first one instead of calling
+    the provider again (single-flight); if that call fails they all get its error.
+    """
+    if not LLM_CACHE_CONFIG['enabled']:
+        return call()
+
+    with _lock:
+        value = _lookup_locked(key, time.monotonic())
+        if value is not None:
+            _stats["hits"] += 1
+            return value
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _in_flight[key] = _Flight()
+            _stats["misses"] += 1
+        else:
+            _stats["sharedInFlight"] += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        flight.value = call()
+        if flight.value:
+            with _lock:
+                _store_locked(key, flight.value, time.monotonic())
+        return flight.value
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+        flight.done.set()
+
+
+def clear():
+    global _bytes
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+
+
+def get_llm_cache_stats():
+    with _lock:
+        stats = dict(_stats, size=len(_entries), bytes=_bytes, inFlight=len(_in_flight),
+                     maxEntries=LLM_CACHE_CONFIG['max_entries'], maxBytes=LLM_CACHE_CONFIG['max_bytes'],
+                     enabled=LLM_CACHE_CONFIG['enabled'])
+    lookups = stats["hits"] + stats["misses"] + stats["sharedInFlight"]
+    stats["hitRatio"] = round((stats["hits"] + stats["sharedInFlight"]) / lookups, 3) if lookups else 0.0
+    return stats
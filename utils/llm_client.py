@@ -0,0 +1,260 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from utils import llm_cache
+
+load_dotenv()
+
+MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
+MISTRAL_API_URL = os.getenv("MISTRAL_API_URL")
+MISTRAL_MODEL = os.getenv("MISTRAL_MODEL")
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+LLM_CONFIG = {
+    # Seconds to open the TLS connection / wait for the reply
+    'connect_timeout': float(os.getenv('LLM_CONNECT_TIMEOUT', 5)),
+    'read_timeout': float(os.getenv('LLM_READ_TIMEOUT', 60)),
+    # Extra attempts after the first one on timeouts, 429 and 5xx
+    'max_retries': int(os.getenv('LLM_MAX_RETRIES', 2)),
+    # Full-jitter exponential backoff: sleep uniform(0, min(max, base * 2**attempt))
+    'backoff_base': float(os.getenv('LLM_BACKOFF_BASE', 0.5)),
+    'backoff_max': float(os.getenv('LLM_BACKOFF_MAX', 8)),
+    # Keep-alive connections per provider host
+    'pool_size': int(os.getenv('LLM_POOL_SIZE', 20)),
+}
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """An LLM call failed after all retries."""
+
+
+# -------------------------------
+# Latency metrics
+# -------------------------------
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _record(provider, elapsed, ok, retries):
+    with _stats_lock:
+        entry = _stats.get(provider)
+        if entry is None:
+            entry = _stats[provider] = {
+                "calls": 0, "errors": 0, "retries": 0, "totalMs": 0.0, "maxMs": 0.0,
+                "recent": deque(maxlen=500),
+            }
+        elapsed_ms = elapsed * 1000
+        entry["calls"] += 1
+        entry["errors"] += 0 if ok else 1
+        entry["retries"] += retries
+        entry["totalMs"] += elapsed_ms
+        entry["maxMs"] = max(entry["maxMs"], elapsed_ms)
+        entry["recent"].append(elapsed_ms)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def get_llm_stats():
+    """Per-provider call counts, retries and latency (avg/max overall, p50/p95 over recent calls)."""
+    with _stats_lock:
+        snapshot = {p: dict(e, recent=sorted(e["recent"])) for p, e in _stats.items()}
+    result = {}
+    for provider, e in snapshot.items():
+        result[provider] = {
+            "calls": e["calls"],
+            "errors": e["errors"],
+            "retries": e["retries"],
+            "avgMs": round(e["totalMs"] / e["calls"], 1) if e["calls"] else 0.0,
+            "maxMs": round(e["maxMs"], 1),
+            "p50Ms": round(_percentile(e["recent"], 0.5), 1),
+            "p95Ms": round(_percentile(e["recent"], 0.95), 1),
+        }
+    return result
+
+
+# -------------------------------
+# Retry loop
+# -------------------------------
+def _backoff(attempt, retry_after=None):
+    if retry_after is not None:
+        return min(retry_after, LLM_CONFIG['backoff_max'])
+    return random.uniform(0, min(LLM_CONFIG['backoff_max'], LLM_CONFIG['backoff_base'] * (2 ** attempt)))
+
+
+def _call_with_retries(provider, call, is_retryable, retries=None):
+    """Run call() until it succeeds or retries run out; records latency for the whole call."""
+    retries = LLM_CONFIG['max_retries'] if retries is None else retries
+    start = time.perf_counter()
+    attempt = 0
+    try:
+        while True:
+            try:
+                result = call()
+                _record(provider, time.perf_counter() - start, True, attempt)
+                return result
+            except Exception as e:
+                retryable, retry_after = is_retryable(e)
+                if not retryable or attempt >= retries:
+                    raise
+                delay = _backoff(attempt, retry_after)
+                print(f"[LLM] {provider} attempt {attempt + 1} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+    except Exception as e:
+        _record(provider, time.perf_counter() - start, False, attempt)
+        if isinstance(e, LLMError):
+            raise
+        raise LLMError(f"{provider} call failed: {e}") from e
+
+
+# -------------------------------
+# Mistral (HTTP, pooled keep-alive session)
+# -------------------------------
+class _RetryableStatus(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}: {response.text[:200]}")
+        self.response = response
+
+
+_mistral_session = None
+_session_lock = threading.Lock()
+
+
+def _get_mistral_session():
+    global _mistral_session
+    if _mistral_session is None:
+        with _session_lock:
+            if _mistral_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_CONFIG['pool_size'])
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {MISTRAL_API_KEY}",
+                    "Content-Type": "application/json",
+                })
+                _mistral_session = session
+    return _mistral_session
+
+
+def _mistral_retryable(error):
+    if isinstance(error, _RetryableStatus):
+        retry_after = error.response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        return True, retry_after
+    return isinstance(error, (requests.ConnectionError, requests.Timeout)), None
+
+
+def mistral_chat(messages, temperature=0.7, max_tokens=None, model=None, timeout=None, retries=None,
+                 stream=False, cache=True):
+    """
+    Chat completion against MISTRAL_API_URL over the shared keep-alive session.
+    messages is a list of {"role", "content"} dicts or a single prompt string.
+    Returns the reply text, or with stream=True the open streaming response
+    (server-sent events; the caller must close it).
+    Identical requests are answered from the response cache unless cache=False;
+    streamed calls are never cached.
+    Raises LLMError when the call fails after retries.
+    """
+    if not MISTRAL_API_URL or not MISTRAL_API_KEY or not (model or MISTRAL_MODEL):
+        raise LLMError("Mistral API configuration missing in environment variables.")
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+
+    payload = {"model": model or MISTRAL_MODEL, "messages": messages, "temperature": temperature}
+    if max_tokens is not None:
+        payload["max_tokens"] = max_tokens
+    if stream:
+        payload["stream"] = True
+    timeout = timeout or (LLM_CONFIG['connect_timeout'], LLM_CONFIG['read_timeout'])
+
+    def call():
+        response = _get_mistral_session().post(MISTRAL_API_URL, json=payload, timeout=timeout, stream=stream)
+        if response.status_code != 200:
+            error = _RetryableStatus(response) if response.status_code in RETRYABLE_STATUS else \
+                LLMError(f"Mistral API error: {response.status_code} - {response.text}")
+            response.close()
+            raise error
+        if stream:
+            return response
+
+        result = response.json()
+        if result.get("choices"):
+            return (result["choices"][0].get("message", {}).get("content") or "").strip()
+        return (result.get("output") or "").strip()
+
+    if stream or not cache:
+        return _call_with_retries("mistral", call, _mistral_retryable, retries)
+    key = llm_cache.make_key("mistral", payload["model"], temperature, messages, max_tokens=max_tokens)
+    return llm_cache.cached_call(key, lambda: _call_with_retries("mistral", call, _mistral_retryable, retries))
+
+
+# -------------------------------
+# Gemini (one GenerativeModel per model name)
+# -------------------------------
+_gemini_models = {}
+_gemini_configured = False
+
+
+def _get_gemini_model(model_name):
+    global _gemini_configured
+    model = _gemini_models.get(model_name)
+    if model is None:
+        import google.generativeai as genai
+        with _session_lock:
+            if not _gemini_configured:
+                genai.configure(api_key=GEMINI_API_KEY)
+                _gemini_configured = True
+            model = _gemini_models.get(model_name)
+            if model is None:
+                model = _gemini_models[model_name] = genai.GenerativeModel(model_name)
+    return model
+
+
+def _gemini_retryable(error):
+    try:
+        from google.api_core import exceptions as gexc
+    except ImportError:
+        return False, None
+    retryable = (
+        gexc.TooManyRequests, gexc.ServiceUnavailable, gexc.InternalServerError,
+        gexc.DeadlineExceeded, gexc.BadGateway, gexc.GatewayTimeout,
+    )
+    return isinstance(error, retryable) or isinstance(error, (ConnectionError, TimeoutError)), None
+
+
+def gemini_generate(prompt, model_name=None, timeout=None, retries=None, cache=True):
+    """
+    generate_content() on a reused GenerativeModel; returns the reply text ("" if empty).
+    Identical prompts are answered from the response cache unless cache=False.
+    Raises LLMError when the call fails after retries.
+    """
+    model_name = model_name or GEMINI_MODEL
+    model = _get_gemini_model(model_name)
+    timeout = timeout or LLM_CONFIG['read_timeout']
+
+    def call():
+        response = model.generate_content(prompt, request_options={"timeout": timeout})
+        return response.text.strip() if response else ""
+
+    if not cache:
+        return _call_with_retries("gemini", call, _gemini_retryable, retries)
+    # generate_content() runs at the model's default temperature
+    key = llm_cache.make_key("gemini", model_name, None, prompt)
+    return llm_cache.cached_call(key, lambda: _call_with_retries("gemini", call, _gemini_retryable, retries))
@@ -0,0 +1,152 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from database.db_handler import get_pooled_connection
+from utils.skill_match import parse_skills
+
+load_dotenv()
+
+# Entries kept in the in-process LRU in front of the skill_match_cache table
+MATCH_CACHE_SIZE = int(os.getenv("MATCH_CACHE_SIZE", 10000))
+# Set MATCH_CACHE_ENABLED=false to always call the scorer
+MATCH_CACHE_ENABLED = os.getenv("MATCH_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+_lock = threading.Lock()
+_lru = OrderedDict()  # (scorer, candidate_hash, job_hash) -> score
+_stats = {"hits": 0, "dbHits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+# -------------------------------
+# Fingerprints
+# -------------------------------
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def skills_fingerprint(skills_text):
+    """Hash of the normalized, order-independent skill set ('React.js, Python' == 'python,react')."""
+    return _digest("\n".join(sorted(parse_skills(skills_text))))
+
+
+def text_fingerprint(*parts):
+    """Hash of free text (e.g. a JD) with case and whitespace differences ignored."""
+    return _digest("\x1f".join(" ".join(str(p or "").lower().split()) for p in parts))
+
+
+# -------------------------------
+# In-process LRU
+# -------------------------------
+def _remember(key, score):
+    with _lock:
+        _lru[key] = score
+        _lru.move_to_end(key)
+        while len(_lru) > MATCH_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def _count(name, n=1):
+    with _lock:
+        _stats[name] += n
+
+
+# -------------------------------
+# Lookups
+# -------------------------------
+def get_many(scorer, candidate_hash, job_hashes):
+    """
+    Cached scores for one candidate against many jobs: {job_hash: score}.
+    Checks the LRU first and fetches everything else with one query.
+    """
+    if not MATCH_CACHE_ENABLED or not job_hashes:
+        return {}
+
+    found, missing = {}, []
+    with _lock:
+        for job_hash in dict.fromkeys(job_hashes):
+            key = (scorer, candidate_hash, job_hash)
+            if key in _lru:
+                _lru.move_to_end(key)
+                found[job_hash] = _lru[key]
+            else:
+                missing.append(job_hash)
+    _count("hits", len(found))
+
+    if missing:
+        conn = None
+        try:
+            conn = get_pooled_connection()
+            cursor = conn.cursor()
+            placeholders = ", ".join(["%s"] * len(missing))
+            cursor.execute(f"""
+                SELECT job_hash, score FROM skill_match_cache
+                WHERE scorer = %s AND candidate_hash = %s AND job_hash IN ({placeholders})
+            """, (scorer, candidate_hash, *missing))
+            rows = cursor.fetchall()
+            cursor.close()
+        except Exception as e:
+            print("⚠️ Match cache lookup error:", e)
+            _count("errors")
+            rows = []
+        finally:
+            if conn:
+                conn.close()
+
+        for job_hash, score in rows:
+            score = float(score)
+            found[job_hash] = score
+            _remember((scorer, candidate_hash, job_hash), score)
+        _count("dbHits", len(rows))
+        _count("misses", len(missing) - len(rows))
+
+    return found
+
+
+def get(scorer, candidate_hash, job_hash):
+    """Cached score or None."""
+    return get_many(scorer, candidate_hash, [job_hash]).get(job_hash)
+
+
+def put_many(scorer, candidate_hash, scores):
+    """Store freshly computed {job_hash: score} in the LRU and, with one upsert, in skill_match_cache."""
+    if not MATCH_CACHE_ENABLED or not scores:
+        return
+    rows = []
+    for job_hash, score in scores.items():
+        score = round(float(score), 2)
+        _remember((scorer, candidate_hash, job_hash), score)
+        rows.append((scorer, candidate_hash, job_hash, score))
+
+    conn = None
+    try:
+        conn = get_pooled_connection()
+        cursor = conn.cursor()
+        placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        cursor.execute(f"""
+            INSERT INTO skill_match_cache (scorer, candidate_hash, job_hash, score)
+            VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE score = VALUES(score)
+        """, [value for row in rows for value in row])
+        conn.commit()
+        cursor.close()
+        _count("stores", len(rows))
+    except Exception as e:
+        print("⚠️ Match cache store error:", e)
+        _count("errors")
+    finally:
+        if conn:
+            conn.close()
+
+
+def put(scorer, candidate_hash, job_hash, score):
+    """Store one freshly computed score."""
+    put_many(scorer, candidate_hash, {job_hash: score})
+
+
+def get_match_cache_stats():
+    with _lock:
+        stats = dict(_stats, size=len(_lru), maxSize=MATCH_CACHE_SIZE, enabled=MATCH_CACHE_ENABLED)
+    lookups = stats["hits"] + stats["dbHits"] + stats["misses"]
+    stats["hitRatio"] = round((stats["hits"] + stats["dbHits"]) / lookups, 3) if lookups else 0.0
+    return stats
@@ -0,0 +1,283 @@
+import os
+import sys
+import time
+import atexit
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from config import SESSION_DURATION_MINUTES
+from database.db_handler import get_pooled_connection
+from utils import interview_plan
+
+load_dotenv()
+
+SESSION_STORE_CONFIG = {
+    # Keep active interview sessions in memory and write them to MySQL in the
+    # background; false sends every turn straight to the database. The store
+    # is per process, so only turn it on for a single worker (or sticky routing
+    # by session): turns landing in another worker's memory would be lost to
+    # the one that ends the interview
+    'enabled': os.getenv('SESSION_STORE_ENABLED', 'false').lower() in ("1", "true", "yes"),
+    # Seconds between background flushes of changed sessions
+    'flush_interval': float(os.getenv('SESSION_STORE_FLUSH_INTERVAL', 1.0)),
+    # Sessions stay in memory this long after they expire, so end_interview
+    # still finds them, then are flushed one last time and dropped
+    'grace_seconds': int(os.getenv('SESSION_STORE_GRACE_SECONDS', 300)),
+}
+
+
+def _worker_count():
+    """Worker processes configured for gunicorn (-w / --workers, or WEB_CONCURRENCY)."""
+    args = os.getenv('GUNICORN_CMD_ARGS', '').split()
+    if "gunicorn" in os.path.basename(sys.argv[0] if sys.argv else ""):
+        # Workers are forked from the master, so they keep its command line
+        args = sys.argv[1:] + args
+    for i, arg in enumerate(args):
+        if arg in ("-w", "--workers") and i + 1 < len(args):
+            return int(args[i + 1]) if args[i + 1].isdigit() else 1
+        if arg.startswith("--workers="):
+            value = arg.split("=", 1)[1]
+            return int(value) if value.isdigit() else 1
+    value = os.getenv('WEB_CONCURRENCY', '1')
+    return int(value) if value.isdigit() else 1
+
+
+if SESSION_STORE_CONFIG['enabled'] and _worker_count() > 1 \
+        and os.getenv('SESSION_STORE_STICKY', 'false').lower() not in ("1", "true", "yes"):
+    print(f"[SESSION] {_worker_count()} workers configured; the in-memory session store is per process, "
+          f"so it stays off (set SESSION_STORE_STICKY=true if sessions are routed to one worker)")
+    SESSION_STORE_CONFIG['enabled'] = False
+
+
+def enabled():
+    return SESSION_STORE_CONFIG['enabled']
+
+
+class InterviewSession:
+    """
+    One active interview held in memory: the candidate profile snapshot taken
+    when it started, session metadata and the turns. Every change bumps a
+    version; flush() writes the unsaved ones to assessment_session_log and
+    assessment_session_turn.
+    """
+
+    def __init__(self, session_id, candidate_id, job_id, candidate, plan=None):
+        self.session_id = session_id
+        self.candidate_id = candidate_id
+        self.job_id = job_id
+        self.candidate = candidate
+        self.plan = plan
+        self.created_at = datetime.now()
+        self.status = "active"
+        self.log_id = None  # assessment_session_log.id once the first flush has run
+        # {"question", "answer", "asked_at", "answered_at", "row_id", "version", "saved_version"}
+        self.turns = []
+        self._status_saved = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def expires_at(self):
+        return self.created_at + timedelta(minutes=SESSION_DURATION_MINUTES)
+
+    def remaining(self):
+        """(still running, "MM:SS" left)."""
+        remaining_seconds = max(0, int((self.expires_at - datetime.now()).total_seconds()))
+        minutes, seconds = divmod(remaining_seconds, 60)
+        return datetime.now() <= self.expires_at, f"{minutes:02d}:{seconds:02d}"
+
+    def questions_asked(self):
+        with self._lock:
+            return len(self.turns)
+
+    def add_turn(self, last_answer, question):
+        """Answer the latest question (or keep a stray answer on its own) and ask the next one."""
+        now = datetime.now()
+        with self._lock:
+            if last_answer:
+                if self.turns and not self.turns[-1]["answer"]:
+                    turn = self.turns[-1]
+                    turn["answer"], turn["answered_at"] = last_answer, now
+                    turn["version"] += 1
+                else:
+                    self.turns.append(_new_turn("", now, last_answer))
+            self.turns.append(_new_turn(question, now))
+
+    def set_status(self, status):
+        with self._lock:
+            self.status = status
+
+    def turn_list(self):
+        """Turns in the question_answer JSON shape."""
+        with self._lock:
+            return [
+                {"questionNo": i, "question": t["question"], "answer": t["answer"]}
+                for i, t in enumerate(self.turns, start=1)
+            ]
+
+    def flush(self):
+        """Write everything changed since the last flush in one transaction."""
+        with self._flush_lock:
+            with self._lock:
+                log_id = self.log_id
+                status = self.status if self.status != self._status_saved else None
+                pending = [
+                    (turn_no, dict(t)) for turn_no, t in enumerate(self.turns, start=1)
+                    if t["version"] != t["saved_version"]
+                ]
+            if log_id is not None and status is None and not pending:
+                return False
+
+            # Its own connection: end_interview flushes from inside a request
+            conn = get_pooled_connection()
+            cursor = conn.cursor()
+            try:
+                if log_id is None:
+                    columns = "candidate_id, job_id, session_id, question_answer, status, created_at"
+                    values = [self.candidate_id, self.job_id, self.session_id, "[]", status, self.created_at]
+                    if self.plan:
+                        columns += ", interview_plan"
+                        values.append(interview_plan.dump_plan(self.plan))
+                    cursor.execute(f"""
+                        INSERT INTO assessment_session_log ({columns})
+                        VALUES ({", ".join(["%s"] * len(values))})
+                    """, values)
+                    log_id = cursor.lastrowid
+                elif status is not None:
+                    cursor.execute("""
+                        UPDATE assessment_session_log SET status = %s WHERE id = %s
+                    """, (status, log_id))
+
+                row_ids = {}
+                for turn_no, t in pending:
+                    if t["row_id"] is None:
+                        cursor.execute("""
+                            INSERT INTO assessment_session_turn
+                                (session_log_id, turn_no, question, answer, asked_at, answered_at)
+                            VALUES (%s, %s, %s, %s, %s, %s)
+                        """, (log_id, turn_no, t["question"], t["answer"] or None, t["asked_at"], t["answered_at"]))
+                        row_ids[turn_no] = cursor.lastrowid
+                    else:
+                        cursor.execute("""
+                            UPDATE assessment_session_turn SET answer = %s, answered_at = %s WHERE id = %s
+                        """, (t["answer"] or None, t["answered_at"], t["row_id"]))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                conn.close()
+
+            with self._lock:
+                self.log_id = log_id
+                if status is not None:
+                    self._status_saved = status
+                for turn_no, t in pending:
+                    saved = self.turns[turn_no - 1]
+                    saved["row_id"] = row_ids.get(turn_no, saved["row_id"])
+                    saved["saved_version"] = t["version"]
+            return True
+
+
+def _new_turn(question, asked_at, answer=""):
+    return {
+        "question": question, "answer": answer, "asked_at": asked_at,
+        "answered_at": asked_at if answer else None,
+        "row_id": None, "version": 1, "saved_version": 0,
+    }
+
+
+# -------------------------------
+# Registry and write-behind thread
+# -------------------------------
+_lock = threading.Lock()
+_sessions = {}  # session_id -> InterviewSession
+_flusher = None
+_stats = {"created": 0, "hits": 0, "misses": 0, "flushes": 0, "flushErrors": 0, "evicted": 0}
+
+
+def create(session_id, candidate_id, job_id, candidate, plan, question):
+    """Start a session in memory with its first question; it reaches MySQL on the next flush."""
+    session = InterviewSession(session_id, candidate_id, job_id, candidate, plan)
+    session.add_turn("", question)
+    with _lock:
+        _sessions[session_id] = session
+        _stats["created"] += 1
+    _ensure_flusher()
+    return session
+
+
+def get(session_id, candidate_id, job_id):
+    """The in-memory session if this process holds it for that candidate and job, else None."""
+    with _lock:
+        session = _sessions.get(session_id)
+        found = session is not None and str(session.candidate_id) == str(candidate_id) \
+            and str(session.job_id) == str(job_id)
+        _stats["hits" if found else "misses"] += 1
+    return session if found else None
+
+
+def close(session_id):
+    """Flush a session one last time and drop it from memory (interview ended)."""
+    with _lock:
+        session = _sessions.get(session_id)
+    if session is None:
+        return None
+    # Flushed before it is dropped, so a failed write keeps it for the flusher to retry
+    session.flush()
+    with _lock:
+        if _sessions.get(session_id) is session:
+            del _sessions[session_id]
+    return session
+
+
+def flush_all():
+    """Flush every session with unsaved changes and drop the ones past their grace period."""
+    with _lock:
+        sessions = list(_sessions.values())
+    cutoff = datetime.now() - timedelta(seconds=SESSION_STORE_CONFIG['grace_seconds'])
+
+    for session in sessions:
+        try:
+            if session.flush():
+                with _lock:
+                    _stats["flushes"] += 1
+        except Exception as e:
+            # Versions are unchanged, so the next pass retries
+            with _lock:
+                _stats["flushErrors"] += 1
+            print(f"[SESSION] Flush of session {session.session_id} failed: {e}")
+            continue
+        if session.expires_at < cutoff:
+            with _lock:
+                if _sessions.get(session.session_id) is session:
+                    del _sessions[session.session_id]
+                    _stats["evicted"] += 1
+
+
+def _run_flusher():
+    while True:
+        time.sleep(SESSION_STORE_CONFIG['flush_interval'])
+        flush_all()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is None:
+        with _lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_run_flusher, name="session-flush", daemon=True)
+                _flusher.start()
+
+
+# Durability on shutdown: write whatever the last interval did not
+atexit.register(flush_all)
+
+
+def get_session_store_stats():
+    with _lock:
+        stats = dict(_stats, sessions=len(_sessions))
+    stats["enabled"] = SESSION_STORE_CONFIG['enabled']
+    stats["flushInterval"] = SESSION_STORE_CONFIG['flush_interval']
+    return stats
@@ -0,0 +1,112 @@
+import os
+import time
+import threading
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from config import SESSION_DURATION_MINUTES
+from database.db_handler import get_db_connection
+
+load_dotenv()
+
+SWEEPER_CONFIG = {
+    'enabled': os.getenv('SESSION_SWEEP_ENABLED', 'true').lower() not in ("0", "false", "no"),
+    # Seconds between sweeps
+    'interval': float(os.getenv('SESSION_SWEEP_INTERVAL', 30)),
+    # Sessions are closed this long after they expire, so a candidate who is
+    # still finishing the last answer can end the interview normally
+    'grace_seconds': int(os.getenv('SESSION_SWEEP_GRACE_SECONDS', 60)),
+    # Most sessions closed by one sweep; the rest wait for the next one
+    'batch_size': int(os.getenv('SESSION_SWEEP_BATCH_SIZE', 500)),
+    # Score the closed sessions as well (the callback passed to start())
+    'score': os.getenv('SESSION_SWEEP_SCORE', 'false').lower() in ("1", "true", "yes"),
+}
+
+_lock = threading.Lock()
+_thread = None
+_stats = {"sweeps": 0, "closed": 0, "errors": 0, "lastSweepMs": 0.0}
+
+
+def sweep(on_expired=None):
+    """
+    Mark active sessions past their duration (plus grace) as "completed"
+    with one UPDATE. With on_expired, the closed session log ids are looked
+    up first and handed to it afterwards. Returns the number closed.
+    """
+    cutoff = datetime.now() - timedelta(minutes=SESSION_DURATION_MINUTES, seconds=SWEEPER_CONFIG['grace_seconds'])
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    ids = []
+    try:
+        if on_expired is None:
+            cursor.execute("""
+                UPDATE assessment_session_log
+                SET status = 'completed'
+                WHERE status = 'active' AND created_at < %s
+                LIMIT %s
+            """, (cutoff, SWEEPER_CONFIG['batch_size']))
+            closed = cursor.rowcount
+        else:
+            cursor.execute("""
+                SELECT id FROM assessment_session_log
+                WHERE status = 'active' AND created_at < %s
+                LIMIT %s
+            """, (cutoff, SWEEPER_CONFIG['batch_size']))
+            ids = [row[0] for row in cursor.fetchall()]
+            closed = 0
+            if ids:
+                cursor.execute(f"""
+                    UPDATE assessment_session_log
+                    SET status = 'completed'
+                    WHERE status = 'active' AND id IN ({", ".join(["%s"] * len(ids))})
+                """, ids)
+                closed = cursor.rowcount
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    if ids:
+        on_expired(ids)
+    return closed
+
+
+def _run(on_expired):
+    while True:
+        time.sleep(SWEEPER_CONFIG['interval'])
+        start = time.perf_counter()
+        try:
+            closed = sweep(on_expired)
+            with _lock:
+                _stats["sweeps"] += 1
+                _stats["closed"] += closed
+                _stats["lastSweepMs"] = round((time.perf_counter() - start) * 1000, 1)
+            if closed:
+                print(f"[SWEEP] Closed {closed} expired interview session(s)")
+        except Exception as e:
+            with _lock:
+                _stats["errors"] += 1
+            print(f"[SWEEP] Session sweep failed: {e}")
+
+
+def start(on_expired=None):
+    """
+    Run sweep() every SESSION_SWEEP_INTERVAL seconds on a daemon thread.
+    on_expired(session_log_ids) is only used when SESSION_SWEEP_SCORE is on.
+    """
+    global _thread
+    if not SWEEPER_CONFIG['enabled']:
+        return
+    with _lock:
+        if _thread is None:
+            callback = on_expired if SWEEPER_CONFIG['score'] else None
+            _thread = threading.Thread(target=_run, args=(callback,), name="session-sweeper", daemon=True)
+            _thread.start()
+
+
+def get_sweeper_stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["enabled"] = SWEEPER_CONFIG['enabled']
+    stats["score"] = SWEEPER_CONFIG['score']
+    stats["running"] = _thread is not None
+    return stats
@@ -0,0 +1,67 @@
+import json
+
+# Interview turns live one row per question in assessment_session_turn
+# (migration 005). Sessions written before that keep their turns in the
+# assessment_session_log.question_answer JSON; load_turns() reads both.
+
+
+def append_question(cursor, session_log_id, turn_no, question):
+    """Add the next question as an unanswered turn (one INSERT)."""
+    cursor.execute("""
+        INSERT INTO assessment_session_turn (session_log_id, turn_no, question)
+        VALUES (%s, %s, %s)
+    """, (session_log_id, turn_no, question))
+
+
+def record_answer(cursor, session_log_id, turn_no, answer):
+    """
+    Store the answer on the latest unanswered turn. If there is none (turns
+    out of order), the answer is kept as a turn of its own with no question;
+    returns True when it added that row.
+    """
+    cursor.execute("""
+        UPDATE assessment_session_turn
+        SET answer = %s, answered_at = NOW()
+        WHERE session_log_id = %s AND answer IS NULL
+        ORDER BY id DESC LIMIT 1
+    """, (answer, session_log_id))
+    if cursor.rowcount == 0:
+        cursor.execute("""
+            INSERT INTO assessment_session_turn (session_log_id, turn_no, question, answer, answered_at)
+            VALUES (%s, %s, %s, %s, NOW())
+        """, (session_log_id, turn_no, "", answer))
+        return True
+    return False
+
+
+def _legacy_turns(session_row):
+    raw = session_row.get("question_answer")
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return []
+    return raw if isinstance(raw, list) else []
+
+
+def load_turns(cursor, session_row):
+    """
+    [{"questionNo", "question", "answer"}] for a session log row, in the
+    shape the question_answer JSON always had.
+    """
+    turns = [
+        {"question": t.get("question", ""), "answer": t.get("answer", "")}
+        for t in _legacy_turns(session_row) if isinstance(t, dict)
+    ]
+    cursor.execute("""
+        SELECT question, answer FROM assessment_session_turn
+        WHERE session_log_id = %s
+        ORDER BY id
+    """, (session_row["id"],))
+    for row in cursor.fetchall():
+        if isinstance(row, dict):
+            question, answer = row["question"], row["answer"]
+        else:
+            question, answer = row
+        turns.append({"question": question or "", "answer": answer or ""})
+    return [{"questionNo": i, **t} for i, t in enumerate(turns, start=1)]
@@ -0,0 +1,123 @@
+import os
+import re
+import numpy as np
+from scipy import sparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# coverage | jaccard | cosine | dice
+SKILL_MATCH_MEASURE = os.getenv("SKILL_MATCH_MEASURE", "coverage").lower()
+
+# Common spellings that should count as the same skill (keys are already normalized)
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "mssql": "sqlserver",
+    "mssqlserver": "sqlserver",
+    "microsoftsqlserver": "sqlserver",
+    "csharp": "c#",
+    "cplusplus": "c++",
+    "dotnet": ".net",
+    "net": ".net",
+    "aspnet": "asp.net",
+    "ml": "machinelearning",
+    "ai": "artificialintelligence",
+    "gcp": "googlecloud",
+    "googlecloudplatform": "googlecloud",
+    "amazonwebservices": "aws",
+    "reactjs": "react",
+    "nodejs": "node",
+}
+
+_SPLIT_RE = re.compile(r"[,;|\n•]+")
+_PARENS_RE = re.compile(r"\(.*?\)")
+_KEEP_RE = re.compile(r"[^a-z0-9+#.]")
+_TRAILING_VERSION_RE = re.compile(r"^(?P<name>[a-z+#.]{3,}?)\.?\d+(\.\d+)*$")
+
+
+def normalize_skill(skill):
+    """Canonical form of one skill: 'Node.js' -> 'node', 'HTML5' -> 'html', 'React JS' -> 'react'."""
+    s = _PARENS_RE.sub("", skill.lower())
+    s = _KEEP_RE.sub("", s).strip(".")
+    if not s:
+        return ""
+    version = _TRAILING_VERSION_RE.match(s)
+    if version:
+        s = version.group("name")
+    if s.endswith(".js") or (s.endswith("js") and len(s) > 4 and s not in SKILL_ALIASES):
+        s = s[:-3] if s.endswith(".js") else s[:-2]
+    if s not in (".net", "asp.net"):
+        s = s.replace(".", "")
+    return SKILL_ALIASES.get(s, s)
+
+
+def parse_skills(skills_text):
+    """Split a comma-separated skills string into unique normalized skills (order kept)."""
+    if not skills_text:
+        return []
+    if isinstance(skills_text, (list, tuple)):
+        skills_text = ",".join(str(s) for s in skills_text)
+    seen = []
+    # Drop parentheticals first so "AWS (EC2, S3)" stays one skill
+    for raw in _SPLIT_RE.split(_PARENS_RE.sub("", str(skills_text))):
+        # "Python/Django" lists two skills; "CI/CD" is one
+        parts = raw.split("/") if raw.count("/") == 1 and len(raw.replace("/", "").strip()) > 5 else [raw]
+        for part in parts:
+            skill = normalize_skill(part)
+            if skill and skill not in seen:
+                seen.append(skill)
+    return seen
+
+
+def _similarity(intersection, candidate_size, job_sizes, measure):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if measure == "jaccard":
+            scores = intersection / (candidate_size + job_sizes - intersection)
+        elif measure == "cosine":
+            scores = intersection / np.sqrt(candidate_size * job_sizes)
+        elif measure == "dice":
+            scores = 2 * intersection / (candidate_size + job_sizes)
+        else:
+            # coverage: share of the job's required skills the candidate has
+            scores = intersection / job_sizes
+    return np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def score_candidate_against_jobs(candidate_skills, jobs_skills, measure=None):
+    """
+    Score one candidate against many jobs in a single sparse matrix product.
+
+    candidate_skills: skills string (or list) of the candidate
+    jobs_skills:      list of skills strings, one per job
+    Returns a NumPy array of match percentages (0-100, 2 decimals) aligned with jobs_skills.
+    """
+    measure = (measure or SKILL_MATCH_MEASURE).lower()
+    candidate = parse_skills(candidate_skills)
+    if not candidate or not jobs_skills:
+        return np.zeros(len(jobs_skills))
+
+    vocabulary = {skill: i for i, skill in enumerate(candidate)}
+    rows, cols = [], []
+    for row, job_text in enumerate(jobs_skills):
+        for skill in parse_skills(job_text):
+            col = vocabulary.setdefault(skill, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+
+    # Binary job x skill matrix; the candidate only has the first len(candidate) columns set
+    job_matrix = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(jobs_skills), len(vocabulary))
+    )
+    candidate_vector = np.zeros(len(vocabulary))
+    candidate_vector[:len(candidate)] = 1.0
+
+    intersection = job_matrix @ candidate_vector
+    job_sizes = np.asarray(job_matrix.sum(axis=1)).ravel()
+    scores = _similarity(intersection, float(len(candidate)), job_sizes, measure)
+    return np.round(np.clip(scores, 0.0, 1.0) * 100, 2)
@@ -0,0 +1,253 @@
+import os
+import time
+import threading
+import speech_recognition as sr
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from utils import audio_preprocess
+
+load_dotenv()
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPHINX_DIR = os.getenv('STT_SPHINX_DIR', os.path.join(PROJECT_ROOT, 'apps', 'res', 'sphinx'))
+
+STT_CONFIG = {
+    # google | sphinx; a request may override it with sttBackend
+    'backend': os.getenv('STT_BACKEND', 'google').lower(),
+    # Tried when the chosen backend is unavailable or fails; empty disables fallback
+    'fallback': os.getenv('STT_FALLBACK', 'google').lower(),
+    'language': os.getenv('STT_LANGUAGE', 'en-US'),
+    'sphinx_acoustic_model': os.getenv('STT_SPHINX_ACOUSTIC_MODEL', os.path.join(SPHINX_DIR, 'acoustic-model')),
+    # Must be a word language model; en-us-phone.lm.bin only decodes phonemes
+    'sphinx_lm': os.getenv('STT_SPHINX_LM', os.path.join(SPHINX_DIR, 'en-us.lm.bin')),
+    'sphinx_dict': os.getenv('STT_SPHINX_DICT', os.path.join(SPHINX_DIR, 'cmudict-en-us.dict')),
+    # Long answers: segments transcribed at once, and extra attempts per segment
+    'segment_workers': int(os.getenv('STT_SEGMENT_WORKERS', 4)),
+    'segment_retries': int(os.getenv('STT_SEGMENT_RETRIES', 2)),
+}
+
+# Files PocketSphinx needs from a continuous acoustic model directory
+SPHINX_MODEL_FILES = ('mdef', 'means', 'variances', 'transition_matrices', 'feat.params', 'noisedict')
+SPHINX_WEIGHT_FILES = ('mixture_weights', 'sendump')
+
+
+class STTUnavailable(Exception):
+    """The backend cannot run on this node (missing module or model files)."""
+
+
+# -------------------------------
+# Backends
+# -------------------------------
+class GoogleSTT:
+    """Google Web Speech API (network)."""
+
+    name = "google"
+
+    def unavailable_reason(self):
+        return None
+
+    def transcribe(self, recognizer, audio_data):
+        return recognizer.recognize_google(audio_data, language=STT_CONFIG['language'])
+
+
+class SphinxSTT:
+    """Offline CMU PocketSphinx using the models under apps/res/sphinx (or STT_SPHINX_*)."""
+
+    name = "sphinx"
+
+    def __init__(self):
+        self._reason = None
+        self._checked = False
+
+    def unavailable_reason(self):
+        if not self._checked:
+            self._reason = self._check()
+            self._checked = True
+        return self._reason
+
+    @staticmethod
+    def _check():
+        try:
+            import pocketsphinx  # noqa: F401
+        except ImportError:
+            return "pocketsphinx is not installed"
+
+        model_dir = STT_CONFIG['sphinx_acoustic_model']
+        if not os.path.isdir(model_dir):
+            return f"acoustic model directory not found: {model_dir}"
+        missing = [f for f in SPHINX_MODEL_FILES if not os.path.exists(os.path.join(model_dir, f))]
+        if not any(os.path.exists(os.path.join(model_dir, f)) for f in SPHINX_WEIGHT_FILES):
+            missing.append("mixture_weights or sendump")
+        if missing:
+            return f"acoustic model is incomplete, missing: {', '.join(missing)}"
+
+        lm = STT_CONFIG['sphinx_lm']
+        if not os.path.exists(lm):
+            return f"word language model not found: {lm}"
+        if "phone" in os.path.basename(lm).lower():
+            return f"{os.path.basename(lm)} is a phoneme language model and cannot produce words"
+        if not os.path.exists(STT_CONFIG['sphinx_dict']):
+            return f"pronunciation dictionary not found: {STT_CONFIG['sphinx_dict']}"
+        return None
+
+    def transcribe(self, recognizer, audio_data):
+        reason = self.unavailable_reason()
+        if reason:
+            raise STTUnavailable(reason)
+        return recognizer.recognize_sphinx(audio_data, language=(
+            STT_CONFIG['sphinx_acoustic_model'], STT_CONFIG['sphinx_lm'], STT_CONFIG['sphinx_dict']
+        ))
+
+
+BACKENDS = {"google": GoogleSTT(), "sphinx": SphinxSTT()}
+
+
+def register_backend(backend):
+    """Add or replace a backend; it needs name, unavailable_reason() and transcribe(recognizer, audio_data)."""
+    BACKENDS[backend.name] = backend
+
+
+# -------------------------------
+# Stats
+# -------------------------------
+_stats_lock = threading.Lock()
+_stats = {}
+_fallbacks = 0
+_segments = {"answers": 0, "segments": 0, "retries": 0, "lost": 0}
+
+
+def _record(name, elapsed, ok):
+    with _stats_lock:
+        entry = _stats.setdefault(name, {"calls": 0, "failures": 0, "totalMs": 0.0, "maxMs": 0.0})
+        entry["calls"] += 1
+        entry["failures"] += 0 if ok else 1
+        entry["totalMs"] += elapsed * 1000
+        entry["maxMs"] = max(entry["maxMs"], elapsed * 1000)
+
+
+def get_stt_stats():
+    with _stats_lock:
+        backends = {
+            name: {
+                "calls": e["calls"],
+                "failures": e["failures"],
+                "avgMs": round(e["totalMs"] / e["calls"], 1) if e["calls"] else 0.0,
+                "maxMs": round(e["maxMs"], 1),
+            }
+            for name, e in _stats.items()
+        }
+        fallbacks = _fallbacks
+        segments = dict(_segments)
+    return {
+        "backend": STT_CONFIG['backend'],
+        "fallback": STT_CONFIG['fallback'],
+        "unavailable": {n: b.unavailable_reason() for n, b in BACKENDS.items() if b.unavailable_reason()},
+        "fallbacks": fallbacks,
+        "backends": backends,
+        "segmented": segments,
+    }
+
+
+# -------------------------------
+# Entry point
+# -------------------------------
+def _chain(backend):
+    names = [(backend or STT_CONFIG['backend']).lower()]
+    if STT_CONFIG['fallback'] and STT_CONFIG['fallback'] not in names:
+        names.append(STT_CONFIG['fallback'])
+    return [BACKENDS[n] for n in names if n in BACKENDS]
+
+
+def transcribe(audio_data, backend=None, recognizer=None):
+    """
+    Transcribe an sr.AudioData with the chosen backend (deployment default or
+    per-request override), falling back to STT_FALLBACK when the backend is
+    unavailable or fails. Raises the last backend's error if none succeeds.
+    """
+    global _fallbacks
+    recognizer = recognizer or sr.Recognizer()
+    chain = _chain(backend)
+    if not chain:
+        raise STTUnavailable(f"unknown STT backend: {backend}")
+
+    last_error = None
+    for position, stt in enumerate(chain):
+        reason = stt.unavailable_reason()
+        if reason:
+            last_error = STTUnavailable(f"{stt.name}: {reason}")
+        else:
+            start = time.perf_counter()
+            try:
+                text = stt.transcribe(recognizer, audio_data)
+                _record(stt.name, time.perf_counter() - start, True)
+                return text
+            except (sr.UnknownValueError, sr.RequestError, STTUnavailable) as e:
+                _record(stt.name, time.perf_counter() - start, False)
+                last_error = e
+
+        if position + 1 < len(chain):
+            with _stats_lock:
+                _fallbacks += 1
+            print(f"[STT] {stt.name} failed ({last_error or 'no result'}); falling back to {chain[position + 1].name}")
+
+    raise last_error
+
+
+# -------------------------------
+# Long answers: split on silence, transcribe segments in parallel
+# -------------------------------
+_segment_pool = ThreadPoolExecutor(max_workers=max(1, STT_CONFIG['segment_workers']), thread_name_prefix="stt-segment")
+
+
+def _transcribe_segment(audio_data, backend):
+    """One segment with retries; '' for a segment with no recognizable speech."""
+    for attempt in range(STT_CONFIG['segment_retries'] + 1):
+        try:
+            return transcribe(audio_data, backend)
+        except sr.UnknownValueError:
+            return ""
+        except (sr.RequestError, STTUnavailable):
+            if attempt >= STT_CONFIG['segment_retries']:
+                raise
+            with _stats_lock:
+                _segments["retries"] += 1
+            time.sleep(0.2 * (attempt + 1))
+
+
+def transcribe_samples(samples, rate, backend=None):
+    """
+    Transcribe int16 mono samples. Audio longer than one segment is split on
+    pauses, the segments are recognized concurrently and the texts are joined
+    in order. A segment that still fails after its retries is left out; the
+    call only fails when every segment failed.
+    """
+    bounds = audio_preprocess.split_on_silence(samples, rate)
+    if len(bounds) == 1:
+        return transcribe(audio_preprocess.to_audio_data(samples, rate), backend)
+
+    futures = [
+        _segment_pool.submit(_transcribe_segment, audio_preprocess.to_audio_data(samples[start:end], rate), backend)
+        for start, end in bounds
+    ]
+    texts, errors = [], []
+    for future in futures:
+        try:
+            texts.append(future.result())
+        except Exception as e:
+            errors.append(e)
+            texts.append("")
+
+    with _stats_lock:
+        _segments["answers"] += 1
+        _segments["segments"] += len(bounds)
+        _segments["lost"] += len(errors)
+
+    if errors and len(errors) == len(bounds):
+        raise errors[-1]
+    if errors:
+        print(f"[STT] {len(errors)} of {len(bounds)} segments could not be transcribed: {errors[-1]}")
+
+    text = " ".join(t.strip() for t in texts if t and t.strip())
+    if not text:
+        raise sr.UnknownValueError("No speech recognized in the audio answer.")
+    return text
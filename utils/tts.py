@@ -0,0 +1,292 @@
+import os
+import time
+import uuid
+import asyncio
+import hashlib
+import threading
+import edge_tts
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeout
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TTS_CONFIG = {
+    'voice': os.getenv('TTS_VOICE', 'en-IN-PrabhatNeural'),
+    # edge_tts syntheses running at once across all request threads
+    'concurrency': int(os.getenv('TTS_CONCURRENCY', 4)),
+    # Seconds a request thread waits for its audio (queueing included)
+    'timeout': float(os.getenv('TTS_TIMEOUT', 30)),
+    # Disk budget for cached audio per directory, files derived from it (lip-sync
+    # JSON) included; least recently used entries go first
+    'cache_max_bytes': int(os.getenv('TTS_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+}
+
+CACHE_PREFIX = "tts_"
+
+
+# -------------------------------
+# Background event loop
+# -------------------------------
+class _TTSLoop:
+    """
+    One long-lived asyncio loop on a daemon thread that runs every edge_tts
+    synthesis in the process. Request threads submit coroutines and block on
+    the returned future; a semaphore caps how many run at once.
+    """
+
+    def __init__(self, concurrency):
+        self._concurrency = max(1, concurrency)
+        self._loop = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self._concurrency)
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="tts-loop", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    async def _limited(self, coro):
+        async with self._semaphore:
+            return await coro
+
+    def run(self, coro, timeout):
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro), self._ensure_started())
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+
+_tts_loop = _TTSLoop(TTS_CONFIG['concurrency'])
+
+_stats_lock = threading.Lock()
+_stats = {"syntheses": 0, "failures": 0, "timeouts": 0, "inFlight": 0, "totalMs": 0.0, "maxMs": 0.0}
+
+
+async def _save(text, output_path, voice):
+    # Write to a temp name first so a half-written file is never served
+    tmp_path = f"{output_path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        await edge_tts.Communicate(text, voice).save(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def synthesize(text, output_path, voice=None, timeout=None):
+    """Write neural TTS audio for text to output_path (MP3) on the shared TTS loop."""
+    voice = voice or TTS_CONFIG['voice']
+    timeout = TTS_CONFIG['timeout'] if timeout is None else timeout
+
+    with _stats_lock:
+        _stats["inFlight"] += 1
+    start = time.perf_counter()
+    ok = False
+    try:
+        _tts_loop.run(_save(text, output_path, voice), timeout)
+        ok = True
+    except FutureTimeout:
+        with _stats_lock:
+            _stats["timeouts"] += 1
+        raise TimeoutError(f"TTS did not finish within {timeout}s")
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            _stats["inFlight"] -= 1
+            if ok:
+                _stats["syntheses"] += 1
+                _stats["totalMs"] += elapsed_ms
+                _stats["maxMs"] = max(_stats["maxMs"], elapsed_ms)
+            else:
+                _stats["failures"] += 1
+
+
+# -------------------------------
+# Content-addressed audio cache
+# -------------------------------
+class _AudioCacheIndex:
+    """
+    LRU index (filename -> bytes) of cached audio in one directory, seeded from
+    disk by mtime. Companion files derived from an entry (named after it, in
+    another directory) count toward its size and are deleted with it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = OrderedDict()
+        self.total_bytes = 0
+        self.companions = {}  # audio name -> {companion path: bytes}
+        self.companion_dirs = set()
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.startswith(CACHE_PREFIX) and entry.name.endswith(".mp3") and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self.files[name] = size
+            self.total_bytes += size
+
+    def touch(self, name):
+        if name in self.files:
+            self.files.move_to_end(name)
+
+    def add(self, name, size):
+        self.total_bytes += size - self.files.pop(name, 0)
+        self.files[name] = size
+
+    def _set_companion(self, name, path, size):
+        entry = self.companions.setdefault(name, {})
+        self.total_bytes += size - entry.get(path, 0)
+        entry[path] = size
+
+    def add_companion_dir(self, companion_dir, extension):
+        """Count the companions already in companion_dir; delete those whose audio is gone."""
+        if (companion_dir, extension) in self.companion_dirs:
+            return
+        self.companion_dirs.add((companion_dir, extension))
+        if not os.path.isdir(companion_dir):
+            return
+        for entry in os.scandir(companion_dir):
+            if entry.name.startswith(CACHE_PREFIX) and entry.name.endswith(extension) and entry.is_file():
+                name = entry.name[:-len(extension)] + ".mp3"
+                if name in self.files:
+                    self._set_companion(name, entry.path, entry.stat().st_size)
+                else:
+                    _remove_quietly(entry.path)
+
+    def add_companion(self, name, path, size):
+        if name in self.files:
+            self._set_companion(name, path, size)
+
+    def evict(self, max_bytes, keep):
+        """Drop least recently used files until the directory fits max_bytes; returns the count."""
+        evicted = 0
+        for name in list(self.files):
+            if self.total_bytes <= max_bytes:
+                break
+            if name == keep:
+                continue
+            size = self.files.pop(name)
+            self.total_bytes -= size
+            _remove_quietly(os.path.join(self.directory, name))
+            for path, companion_size in self.companions.pop(name, {}).items():
+                self.total_bytes -= companion_size
+                _remove_quietly(path)
+            evicted += 1
+        return evicted
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+_cache_lock = threading.Lock()
+_cache_indexes = {}
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _cache_index(directory):
+    index = _cache_indexes.get(directory)
+    if index is None:
+        index = _cache_indexes[directory] = _AudioCacheIndex(directory)
+    return index
+
+
+def cache_filename(text, voice=None):
+    """File name of the cached audio for (voice, text)."""
+    digest = hashlib.sha256(f"{voice or TTS_CONFIG['voice']}\n{text.strip()}".encode("utf-8")).hexdigest()
+    return f"{CACHE_PREFIX}{digest[:40]}.mp3"
+
+
+def cached_audio(text, directory, voice=None, timeout=None):
+    """
+    Audio file name for text in directory, synthesizing it only if it is not
+    cached yet. Identical (voice, text) pairs always map to the same file.
+    """
+    voice = voice or TTS_CONFIG['voice']
+    name = cache_filename(text, voice)
+    path = os.path.join(directory, name)
+
+    with _cache_lock:
+        index = _cache_index(directory)
+        if os.path.exists(path):
+            index.touch(name)
+            _cache_stats["hits"] += 1
+            hit = True
+        else:
+            _cache_stats["misses"] += 1
+            hit = False
+    if hit:
+        try:
+            # mtime is the LRU order used to seed the index after a restart
+            os.utime(path)
+        except OSError:
+            pass
+        return name
+
+    synthesize(text.strip(), path, voice, timeout)
+
+    with _cache_lock:
+        index = _cache_index(directory)
+        index.add(name, os.path.getsize(path))
+        _cache_stats["evictions"] += index.evict(TTS_CONFIG['cache_max_bytes'], keep=name)
+    return name
+
+
+def track_companion(audio_path, companion_path):
+    """
+    Tie a file derived from cached audio (its lip-sync JSON, named after the
+    audio file) to that cache entry, so it counts toward TTS_CACHE_MAX_BYTES
+    and is deleted when the audio is evicted. Safe to call on every use.
+    """
+    directory, name = os.path.split(audio_path)
+    companion_dir = os.path.dirname(companion_path)
+    extension = os.path.splitext(companion_path)[1]
+    with _cache_lock:
+        index = _cache_index(directory)
+        index.add_companion_dir(companion_dir, extension)
+        try:
+            size = os.path.getsize(companion_path)
+        except OSError:
+            return
+        index.add_companion(name, companion_path, size)
+        _cache_stats["evictions"] += index.evict(TTS_CONFIG['cache_max_bytes'], keep=name)
+
+
+def get_tts_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    with _cache_lock:
+        lookups = _cache_stats["hits"] + _cache_stats["misses"]
+        stats["cache"] = dict(
+            _cache_stats,
+            hitRatio=round(_cache_stats["hits"] / lookups, 3) if lookups else 0.0,
+            files=sum(len(i.files) for i in _cache_indexes.values()),
+            bytes=sum(i.total_bytes for i in _cache_indexes.values()),
+            maxBytes=TTS_CONFIG['cache_max_bytes'],
+        )
+    stats["avgMs"] = round(stats["totalMs"] / stats["syntheses"], 1) if stats["syntheses"] else 0.0
+    stats["totalMs"] = round(stats["totalMs"], 1)
+    stats["maxMs"] = round(stats["maxMs"], 1)
+    stats["concurrency"] = TTS_CONFIG['concurrency']
+    return stats